@@ -0,0 +1,171 @@
+"""Persistent cache of Wifi Driver detection results"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import logging
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from shutil import which
+from typing import Any
+
+from pywificli.domain.metadata import DriverType, SystemLanguage
+
+logger = logging.getLogger(__name__)
+
+# Binaries whose presence / version drives detection
+_SYSTEM_BUS_SOCKET = "/run/dbus/system_bus_socket"
+_PROBED_BINARIES: list[tuple[str, str | None]] = [
+    ("netsh", None),
+    ("networksetup", None),
+    ("nmcli", None),
+    ("nmcli", "/snap/bin/"),
+    ("wpa_supplicant", None),
+]
+
+
+@dataclass
+class DetectionResult:
+    """Everything learned while detecting the Wifi Driver to use"""
+
+    driver_type: DriverType
+    system_language: SystemLanguage
+    nmcli_version: str | None = None
+    needs_sudo: bool = False
+
+    def to_json(self) -> dict[str, Any]:
+        """Serialize to a JSON-compatible dict
+
+        Returns:
+            dict[str, Any]: serialized result
+        """
+        return {
+            "driver_type": self.driver_type.name,
+            "system_language": self.system_language.name,
+            "nmcli_version": self.nmcli_version,
+            "needs_sudo": self.needs_sudo,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> DetectionResult:
+        """Deserialize from a dict created by to_json
+
+        Args:
+            data (dict[str, Any]): serialized result
+
+        Returns:
+            DetectionResult: deserialized result
+        """
+        return cls(
+            driver_type=DriverType[data["driver_type"]],
+            system_language=SystemLanguage[data["system_language"]],
+            nmcli_version=data["nmcli_version"],
+            needs_sudo=data["needs_sudo"],
+        )
+
+
+def default_cache_path() -> Path:
+    """Get the platform's user cache location for the detection cache
+
+    Returns:
+        Path: path of the cache file
+    """
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return base / "pywificli" / "detection.json"
+
+
+class DetectionCache:
+    """Store detection results on disk, keyed by the system tooling they were detected from
+
+    The key contains the resolved path and modification time of every probed binary (as well as the platform and
+    language environment) so that installing, removing, or upgrading tooling invalidates the cache.
+
+    Args:
+        path (Path | None): cache file location. Defaults to None (see default_cache_path).
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or default_cache_path()
+
+    @staticmethod
+    def fingerprint() -> dict[str, Any]:
+        """Describe the current system tooling
+
+        Returns:
+            dict[str, Any]: JSON-compatible description
+        """
+        binaries: dict[str, Any] = {}
+        for name, path in _PROBED_BINARIES:
+            key = name if path is None else f"{path}{name}"
+            if found := which(name, path=path):
+                resolved = os.path.realpath(found)
+                try:
+                    binaries[key] = [resolved, os.stat(resolved).st_mtime_ns]
+                except OSError:
+                    binaries[key] = [resolved, None]
+            else:
+                binaries[key] = None
+        # Whether NetworkManager could be reached over D-Bus
+        dbus = [
+            importlib.util.find_spec("dbus_next") is not None,
+            os.environ.get("DBUS_SYSTEM_BUS_ADDRESS"),
+            os.path.exists(_SYSTEM_BUS_SOCKET),
+        ]
+        return {
+            "os": os.name,
+            "platform": sys.platform,
+            "lang": os.environ.get("LANG"),
+            "binaries": binaries,
+            "dbus": dbus,
+        }
+
+    def load(self, fingerprint: dict[str, Any]) -> DetectionResult | None:
+        """Get the cached result if it was stored for the same fingerprint
+
+        Args:
+            fingerprint (dict[str, Any]): current fingerprint
+
+        Returns:
+            DetectionResult | None: cached result or None if there is no valid entry
+        """
+        try:
+            data = json.loads(self.path.read_text())
+            if data["fingerprint"] != fingerprint:
+                logger.debug("Detection cache is stale")
+                return None
+            return DetectionResult.from_json(data["result"])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Ignoring unreadable detection cache %s: %s", self.path, e)
+            return None
+
+    def store(self, fingerprint: dict[str, Any], result: DetectionResult) -> None:
+        """Persist a result for a fingerprint
+
+        Failures are logged and otherwise ignored since the cache is only an optimization.
+
+        Args:
+            fingerprint (dict[str, Any]): fingerprint the result was detected with
+            result (DetectionResult): result to store
+        """
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Write atomically so that concurrent processes never read a partial file
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"fingerprint": fingerprint, "result": result.to_json()}))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning("Failed to write detection cache %s: %s", self.path, e)
+
+    def clear(self) -> None:
+        """Delete the cache file"""
+        self.path.unlink(missing_ok=True)
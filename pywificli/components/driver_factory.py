@@ -1,100 +1,189 @@
 """Entrypoint for a client to get a suitable WifiDriver"""
 
-import ctypes
-import locale
+from __future__ import annotations
+
+import asyncio
+import importlib
+import math
 import os
-import platform
-from getpass import getpass
+import sys
+import time
 from shutil import which
+from typing import TYPE_CHECKING, Any
 
-from packaging.version import Version
-
-from pywificli.domain.driver import IWifiDriver, IWifiInterfaceController
+from pywificli.components.detection_cache import DetectionCache, DetectionResult
+from pywificli.domain.driver import IWifiDriver
 from pywificli.domain.metadata import DriverType, SystemLanguage
-from pywificli.drivers.english import (
-    EnglishLinuxMacOs,
-    EnglishLinuxNmcli,
-    EnglishLinuxNmcliLegacy,
-    EnglishLinuxWindows,
-    EnglishLinuxWpa,
-)
-from pywificli.exceptions import UnsupportedSystemConfiguration
-from pywificli.util import cmd, cmdOkOrRaise
+from pywificli.domain.retry import RetryPolicy
+from pywificli.exceptions import PrivilegedHelperError, UnsupportedSystemConfiguration
+from pywificli.util import PrivilegedHelper, cmd, cmdOkOrRaise, get_executor
+from pywificli.util.metrics import get_metrics
+
+if TYPE_CHECKING:
+    from pywificli.components.interface_controller import WifiInterfaceController
+    from pywificli.components.interface_manager import WifiInterfaceManager
+    from pywificli.components.scan_cache import ScanCache
 
 
 class WifiDriverFactory:
     """Factory to discover and configure a Wifi Driver
 
+    Detection results are cached on disk so that subsequent processes can skip probing the system tooling.
+
     Args:
         sudo_password (str | None): TODO. Defaults to None.
+        use_detection_cache (bool): cache detection results on disk. Defaults to True.
+        detection_cache (DetectionCache | None): detection cache to use. Defaults to None (the user's cache directory).
+        use_dbus (bool): prefer talking to NetworkManager over D-Bus (requires the dbus extra) when it is reachable.
+            Defaults to True.
+        retry_policy (RetryPolicy | None): how drivers retry connecting. Defaults to None (IWifiDriver's default).
+        driver_type (DriverType | None): use this driver type instead of detecting one (i.e. DriverType.SIMULATED).
+            Defaults to None.
+        driver_options (dict[str, Any] | None): keyword arguments of the driver's constructor (i.e. the
+            SimulationConfig of the simulated driver). Defaults to None.
+        use_privileged_helper (bool): when the driver needs root, authenticate once and run privileged commands
+            through a long-lived helper process (see PrivilegedHelper). Defaults to True.
     """
 
-    _driver_map: dict[tuple[SystemLanguage, DriverType], type[IWifiDriver] | None] = {
-        (SystemLanguage.ENGLISH, DriverType.LINUX_NMCLI_LEGACY): EnglishLinuxNmcliLegacy,
-        (SystemLanguage.ENGLISH, DriverType.LINUX_NMCLI): EnglishLinuxNmcli,
-        (SystemLanguage.ENGLISH, DriverType.LINUX_WPA): EnglishLinuxWpa,
-        (SystemLanguage.ENGLISH, DriverType.WINDOWS): EnglishLinuxWindows,
-        (SystemLanguage.ENGLISH, DriverType.MAC_OS): EnglishLinuxMacOs,
+    # Drivers are referenced by "module:class" and only imported once selected
+    _driver_map: dict[tuple[SystemLanguage, DriverType], str] = {
+        (
+            SystemLanguage.ENGLISH,
+            DriverType.LINUX_NMCLI_LEGACY,
+        ): "pywificli.drivers.english.linux_nmcli_legacy:EnglishLinuxNmcliLegacy",
+        (SystemLanguage.ENGLISH, DriverType.LINUX_NMCLI): "pywificli.drivers.english.linux_nmcli:EnglishLinuxNmcli",
+        (
+            SystemLanguage.ENGLISH,
+            DriverType.LINUX_NM_DBUS,
+        ): "pywificli.drivers.english.linux_nm_dbus:EnglishLinuxNmDbus",
+        (SystemLanguage.ENGLISH, DriverType.LINUX_WPA): "pywificli.drivers.english.linux_wpa:EnglishLinuxWpa",
+        (SystemLanguage.ENGLISH, DriverType.WINDOWS): "pywificli.drivers.english.windows:EnglishLinuxWindows",
+        (SystemLanguage.ENGLISH, DriverType.MAC_OS): "pywificli.drivers.english.macos:EnglishLinuxMacOs",
+        # The simulated driver does not depend on the system language
+        **{
+            (language, DriverType.SIMULATED): "pywificli.drivers.simulated:SimulatedWifiDriver"
+            for language in SystemLanguage
+        },
     }
 
-    def __init__(self, sudo_password: str | None = None) -> None:
+    def __init__(
+        self,
+        sudo_password: str | None = None,
+        use_detection_cache: bool = True,
+        detection_cache: DetectionCache | None = None,
+        use_dbus: bool = True,
+        retry_policy: RetryPolicy | None = None,
+        driver_type: DriverType | None = None,
+        driver_options: dict[str, Any] | None = None,
+        use_privileged_helper: bool = True,
+    ) -> None:
         self._sudo_password = sudo_password
+        self._use_dbus = use_dbus
+        self._retry_policy = retry_policy
+        self._driver_type = driver_type
+        self._driver_options = driver_options or {}
+        self._use_privileged_helper = use_privileged_helper
+        self._detection_cache = (detection_cache or DetectionCache()) if use_detection_cache else None
+        self.detection: DetectionResult | None = None
 
     async def _sudo_from_stdin(self) -> None:
         """Ask for sudo password input from stdin
 
         This method prompts the user to enter the sudo password from the command line.
-        It validates the password by running a command with sudo and checking if the password is valid.
+        It validates the password by starting the privileged helper with it (or, without the helper, by running a
+        command with sudo) and checking if the password is valid.
 
         Raises:
             RuntimeError: If the password is empty or invalid.
         """
+        executor = get_executor()
+        if self._use_privileged_helper and executor.privileged_helper and executor.privileged_helper.running:
+            return
         # Need password for sudo
         if not self._sudo_password:
+            from getpass import getpass  # pylint: disable=import-outside-toplevel
+
             self._sudo_password = getpass("Need to run as sudo. Enter password: ")
         if not self._sudo_password:
             raise RuntimeError("Can't use sudo with empty password.")
+        if self._use_privileged_helper:
+            helper = PrivilegedHelper()
+            try:
+                await helper.start(self._sudo_password)
+            except PrivilegedHelperError as e:
+                raise RuntimeError("Invalid password") from e
+            # Privileged driver commands are sent to the helper from now on
+            executor.privileged_helper = helper
+            return
         # TODO we probably want a non-raise version here
         # Validate password
-        result = await cmd(f'echo "{self._sudo_password}" | sudo -S echo "VALID PASSWORD"')
+        result = await cmd(["sudo", "-S", "echo", "VALID PASSWORD"], stdin=f"{self._sudo_password}\n")
         if not result.is_ok or "VALID PASSWORD" not in result.stdout_or_raise:
             raise RuntimeError("Invalid password")
 
-    # TODO can we assume password is set after this?
     async def _detect_driver_type(self) -> DriverType:
+        driver_type, _, _ = await self._probe_driver_type()
+        return driver_type
+
+    async def _probe_driver_type(self) -> tuple[DriverType, str | None, bool]:
+        """Probe the system tooling to find the driver type
+
+        Returns:
+            tuple[DriverType, str | None, bool]: (driver type, nmcli version if applicable, whether sudo is needed)
+        """
         # Try netsh (Windows).
         if os.name == "nt" and which("netsh"):
-            return DriverType.WINDOWS
+            return DriverType.WINDOWS, None, False
 
         # try networksetup (Mac OS 10.10)
         if which("networksetup"):
-            return DriverType.MAC_OS
+            return DriverType.MAC_OS, None, False
 
         # Try Linux options.
+        # NetworkManager over D-Bus avoids spawning nmcli for every operation
+        if self._use_dbus and await self._network_manager_on_dbus():
+            return DriverType.LINUX_NM_DBUS, None, False
         # try nmcli (Ubuntu 14.04). Allow for use in Snap Package
         if which("nmcli") or which("nmcli", path="/snap/bin/"):
+            from packaging.version import Version  # pylint: disable=import-outside-toplevel
 
-            ctrl_wifi = await cmdOkOrRaise("nmcli general permissions |grep enable-disable-wifi")
-            scan_wifi = await cmdOkOrRaise("nmcli general permissions |grep scan")
+            permissions = (await cmdOkOrRaise(["nmcli", "general", "permissions"])).stdout.splitlines()
+            ctrl_wifi = [line for line in permissions if "enable-disable-wifi" in line]
+            scan_wifi = [line for line in permissions if "scan" in line]
 
-            if not "yes" in ctrl_wifi.stdout or not "yes" in scan_wifi.stdout:
-                await self._sudo_from_stdin()
+            needs_sudo = not any("yes" in line for line in ctrl_wifi) or not any("yes" in line for line in scan_wifi)
 
-            version = (await cmdOkOrRaise("nmcli --version")).stdout.split()[-1]
+            version = (await cmdOkOrRaise(["nmcli", "--version"])).stdout.split()[-1]
             # On RHEL based systems, the version is in the form of 1.44.2-1.fc39
             # wich raises an error when trying to compare it with the Version class
             if any(c.isalpha() for c in version):
                 version = version.split("-")[0]
-            return DriverType.LINUX_NMCLI_LEGACY if Version(version) >= Version("0.9.9.0") else DriverType.LINUX_NMCLI
+            driver_type = (
+                DriverType.LINUX_NMCLI_LEGACY if Version(version) >= Version("0.9.9.0") else DriverType.LINUX_NMCLI
+            )
+            return driver_type, version, needs_sudo
         # try nmcli (Ubuntu w/o network-manager)
         if which("wpa_supplicant"):
-            await self._sudo_from_stdin()
-            return DriverType.LINUX_WPA
+            # The driver talks to wpa_supplicant's control sockets itself, so sudo (and the privileged helper) would
+            # not help. Access is granted through the socket group configured by wpa_supplicant's ctrl_interface.
+            return DriverType.LINUX_WPA, None, False
 
         raise UnsupportedSystemConfiguration("Unable to find compatible wireless driver.")
 
+    async def _network_manager_on_dbus(self) -> bool:
+        try:
+            # pylint: disable-next=import-outside-toplevel
+            from pywificli.drivers.english.linux_nm_dbus import network_manager_available
+        except ImportError:
+            # dbus-next is an optional dependency
+            return False
+        return await network_manager_available()
+
     async def _detect_system_language(self) -> SystemLanguage:
-        if platform.system().lower() == "windows":
+        if sys.platform == "win32":
+            import ctypes  # pylint: disable=import-outside-toplevel
+            import locale  # pylint: disable=import-outside-toplevel
+
             windll = getattr(ctypes, "windll").kernel32
             language = locale.windows_locale[windll.GetUserDefaultUILanguage()]
         else:
@@ -105,20 +194,182 @@ class WifiDriverFactory:
         except ValueError:
             raise UnsupportedSystemConfiguration(f"Language {language} is not supported.")
 
-    async def get_wifi_driver(self) -> IWifiDriver:
-        driver_type = await self._detect_driver_type()
-        system_language = await self._detect_system_language()
-        if not (driverT := self._driver_map.get((system_language, driver_type))):
+    async def _detect(self, refresh: bool = False) -> DetectionResult:
+        """Detect the driver type and system language, using the detection cache if possible
+
+        Args:
+            refresh (bool): ignore (and then update) cached results. Defaults to False.
+
+        Returns:
+            DetectionResult: detection result
+        """
+        if self._driver_type is DriverType.SIMULATED:
+            return DetectionResult(driver_type=DriverType.SIMULATED, system_language=SystemLanguage.ENGLISH)
+        if self._driver_type:
+            return DetectionResult(driver_type=self._driver_type, system_language=await self._detect_system_language())
+        with get_metrics().span("detect") as span:
+            fingerprint = (
+                {**self._detection_cache.fingerprint(), "use_dbus": self._use_dbus} if self._detection_cache else {}
+            )
+            if self._detection_cache and not refresh and (cached := self._detection_cache.load(fingerprint)):
+                if span:
+                    span.attributes.update(cached=True, driver_type=cached.driver_type.name)
+                return cached
+
+            driver_type, nmcli_version, needs_sudo = await self._probe_driver_type()
+            result = DetectionResult(
+                driver_type=driver_type,
+                system_language=await self._detect_system_language(),
+                nmcli_version=nmcli_version,
+                needs_sudo=needs_sudo,
+            )
+            if span:
+                span.attributes.update(cached=False, driver_type=driver_type.name)
+        if self._detection_cache:
+            self._detection_cache.store(fingerprint, result)
+        return result
+
+    async def get_wifi_driver(self, refresh: bool = False) -> IWifiDriver:
+        """Detect and instantiate the Wifi Driver for this system
+
+        Args:
+            refresh (bool): re-detect instead of using cached detection results. Defaults to False.
+
+        Raises:
+            UnsupportedSystemConfiguration: No driver supports this system
+
+        Returns:
+            IWifiDriver: Wifi Driver
+        """
+        self.detection = await self._detect(refresh)
+        driver_type, system_language = self.detection.driver_type, self.detection.system_language
+        if self.detection.needs_sudo:
+            await self._sudo_from_stdin()
+        if not (driver_path := self._driver_map.get((system_language, driver_type))):
             raise UnsupportedSystemConfiguration(f"No supported driver for {driver_type=} {system_language=}")
+        module, _, name = driver_path.partition(":")
+        driverT: type[IWifiDriver] = getattr(importlib.import_module(module), name)
 
         # TODO Do sudo stuff
-        driver = driverT()
+        driver = driverT(**self._driver_options)
+        if self._retry_policy:
+            driver.retry_policy = self._retry_policy
         return driver
 
 
 class WifiInterfaceControllerFactory:
-    def __init__(self) -> None:
-        pass
+    """Entrypoint for a client to get controllers of individual interfaces
+
+    The driver is detected once, on first use, and all controllers share it (see WifiInterfaceManager). Controllers are
+    kept in a registry, so asking for the same interface again is cheap and returns the same instance. The available
+    interfaces are looked up again whenever an unknown interface is requested or the last lookup is older than
+    refresh_interval, and the controllers of interfaces that disappeared are dropped.
+
+    Args:
+        driver_factory (WifiDriverFactory | None): factory detecting the driver. Defaults to None (WifiDriverFactory()).
+        scan_cache (ScanCache | None): cache shared by all controllers. Defaults to None (no caching).
+        refresh_interval (float): how long to trust the last lookup of available interfaces (in seconds).
+            Defaults to 30.
+    """
 
-    async def get_interface_controller(self, interface: str) -> IWifiInterfaceController: ...
-    async def get_first_interface_controller(self) -> IWifiInterfaceController: ...
+    def __init__(
+        self,
+        driver_factory: WifiDriverFactory | None = None,
+        scan_cache: ScanCache | None = None,
+        refresh_interval: float = 30.0,
+    ) -> None:
+        self._driver_factory = driver_factory or WifiDriverFactory()
+        self._scan_cache = scan_cache
+        self.refresh_interval = refresh_interval
+        self._manager: WifiInterfaceManager | None = None
+        self._manager_lock = asyncio.Lock()
+        self._refreshed = -math.inf
+        self._available: set[str] = set()
+
+    async def get_manager(self) -> WifiInterfaceManager:
+        """Get the manager of all interfaces, detecting the driver on first use
+
+        Raises:
+            UnsupportedSystemConfiguration: No driver supports this system
+
+        Returns:
+            WifiInterfaceManager: manager (the same instance for each call)
+        """
+        if not self._manager:
+            # Concurrent first callers wait for a single detection
+            async with self._manager_lock:
+                if not self._manager:
+                    # Only imported once needed to keep the import of this module cheap
+                    from pywificli.components.interface_manager import (  # pylint: disable=import-outside-toplevel
+                        WifiInterfaceManager,
+                    )
+
+                    driver = await self._driver_factory.get_wifi_driver()
+                    self._manager = WifiInterfaceManager(driver, self._scan_cache)
+        return self._manager
+
+    async def _refresh(self, manager: WifiInterfaceManager) -> set[str]:
+        self._available = await manager.refresh()
+        self._refreshed = time.monotonic()
+        return self._available
+
+    def _is_stale(self) -> bool:
+        return time.monotonic() - self._refreshed > self.refresh_interval
+
+    async def _available_interfaces(self, manager: WifiInterfaceManager) -> set[str]:
+        # Reuse the last lookup unless it is older than refresh_interval or found none
+        if not self._available or self._is_stale():
+            return await self._refresh(manager)
+        return self._available
+
+    async def get_interface_controller(self, interface: str) -> WifiInterfaceController:
+        """Get the controller of an interface
+
+        Args:
+            interface (str): interface to control
+
+        Raises:
+            UnsupportedSystemConfiguration: No driver supports this system
+            RuntimeError: The interface does not exist
+
+        Returns:
+            WifiInterfaceController: controller (the same instance as long as the interface exists)
+        """
+        manager = await self.get_manager()
+        if interface not in manager or self._is_stale():
+            if interface not in await self._refresh(manager):
+                raise RuntimeError(f"Interface {interface} does not exist")
+        return manager.controller(interface)
+
+    async def get_first_interface_controller(self) -> WifiInterfaceController:
+        """Get the controller of the first available interface (in alphabetical order)
+
+        The interfaces of the last lookup are reused unless it is older than refresh_interval or found none.
+
+        Raises:
+            UnsupportedSystemConfiguration: No driver supports this system
+            RuntimeError: There is no interface
+
+        Returns:
+            WifiInterfaceController: controller
+        """
+        manager = await self.get_manager()
+        if not (available := await self._available_interfaces(manager)):
+            raise RuntimeError("No Wifi interface available")
+        return manager.controller(min(available))
+
+    async def get_interface_controllers(self) -> dict[str, WifiInterfaceController]:
+        """Get the controllers of all available interfaces
+
+        The interfaces of the last lookup are reused unless it is older than refresh_interval or found none.
+
+        Raises:
+            UnsupportedSystemConfiguration: No driver supports this system
+
+        Returns:
+            dict[str, WifiInterfaceController]: interface to controller (in alphabetical order)
+        """
+        manager = await self.get_manager()
+        return {
+            interface: manager.controller(interface) for interface in sorted(await self._available_interfaces(manager))
+        }
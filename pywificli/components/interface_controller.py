@@ -0,0 +1,128 @@
+"""Wifi Controller bound to a single interface of a Wifi Driver"""
+
+import asyncio
+import contextlib
+from dataclasses import dataclass, field
+from typing import AsyncGenerator, AsyncIterator
+
+from pywificli.components.scan_cache import ScanCache
+from pywificli.domain.driver import (
+    ConnectionState,
+    IWifiDriver,
+    IWifiInterfaceController,
+    ScanResult,
+    ScanState,
+)
+from pywificli.util.metrics import get_metrics
+
+
+@dataclass
+class InterfaceState:
+    """State shared by everything operating on one interface"""
+
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    """Held for the duration of any operation (scan, connect, ...) so that they never overlap on the same radio"""
+    scan_state: ScanState = ScanState.IDLE
+    connection_state: tuple[ConnectionState, str] = (ConnectionState.DISCONNECTED, "")
+
+
+class WifiInterfaceController(IWifiInterfaceController):
+    """Control one interface by delegating to the driver that manages it
+
+    Operations are serialized per interface via the (possibly shared) InterfaceState, which also tracks the scan
+    and connection state.
+
+    Args:
+        driver (IWifiDriver): driver that manages the interface
+        interface (str): interface to control
+        scan_cache (ScanCache | None): cache to serve scan() from. Defaults to None (no caching).
+        state (InterfaceState | None): state shared with other users of this interface. Defaults to None (not shared).
+    """
+
+    def __init__(
+        self,
+        driver: IWifiDriver,
+        interface: str,
+        scan_cache: ScanCache | None = None,
+        state: InterfaceState | None = None,
+    ) -> None:
+        self.driver = driver
+        self.interface = interface
+        self.scan_cache = scan_cache
+        self.state = state or InterfaceState()
+
+    @contextlib.asynccontextmanager
+    async def _scanning(self) -> AsyncIterator[None]:
+        async with self.state.lock:
+            self.state.scan_state = ScanState.SCANNING
+            try:
+                yield
+            finally:
+                self.state.scan_state = ScanState.IDLE
+
+    async def connect(self, ssid: str, password: str, timeout: float) -> bool:
+        async with self.state.lock:
+            self.state.connection_state = (ConnectionState.CONNECTING, ssid)
+            connected = False
+            try:
+                with get_metrics().span("connect", interface=self.interface) as span:
+                    connected = await self.driver.connect(self.interface, ssid, password, timeout)
+                    if span:
+                        span.attributes["connected"] = connected
+            finally:
+                self.state.connection_state = (
+                    (ConnectionState.CONNECTED, ssid) if connected else (ConnectionState.DISCONNECTED, "")
+                )
+            return connected
+
+    async def scan_stream(self, timeout: float) -> AsyncGenerator[ScanResult, None]:
+        async with self._scanning():
+            with get_metrics().span("scan", interface=self.interface) as span:
+                async with contextlib.aclosing(self.driver.scan_stream(self.interface, timeout)) as results:
+                    async for result in results:
+                        if span:
+                            span.attributes["results"] = span.attributes.get("results", 0) + 1
+                        yield result
+
+    async def _scan(self, timeout: float) -> list[ScanResult]:
+        async with self._scanning():
+            with get_metrics().span("scan", interface=self.interface) as span:
+                results = await self.driver.scan(self.interface, timeout)
+                if span:
+                    span.attributes["results"] = len(results)
+                return results
+
+    async def scan(self, timeout: float, max_age: float | None = None) -> list[ScanResult]:
+        """Scan for SSIDs, or reuse recent results of the scan cache
+
+        Args:
+            timeout (float): how long to scan for (in seconds)
+            max_age (float | None): accept cached results at most this old (in seconds). Ignored without a scan
+                cache. Defaults to None (always scan, though a scan already in flight is joined).
+
+        Returns:
+            list[ScanResult]: list of available SSIDs
+        """
+        if not self.scan_cache:
+            return await self._scan(timeout)
+        return await self.scan_cache.get(self.interface, lambda: self._scan(timeout), max_age)
+
+    async def disconnect(self) -> bool:
+        async with self.state.lock:
+            if disconnected := await self.driver.disconnect(self.interface):
+                self.state.connection_state = (ConnectionState.DISCONNECTED, "")
+            return disconnected
+
+    async def is_enabled(self) -> bool:
+        return await self.driver.is_enabled(self.interface)
+
+    async def enable(self, enable: bool) -> bool:
+        async with self.state.lock:
+            return await self.driver.enable(self.interface, enable)
+
+    async def get_connection_state(self) -> tuple[ConnectionState, str]:
+        self.state.connection_state = await self.driver.get_connection_state(self.interface)
+        return self.state.connection_state
+
+    async def get_scan_state(self) -> ScanState:
+        return self.state.scan_state
@@ -0,0 +1,148 @@
+"""Coordinate operations across all interfaces of a Wifi Driver"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Iterable
+
+from pywificli.components.interface_controller import InterfaceState, WifiInterfaceController
+from pywificli.components.scan_cache import ScanCache
+from pywificli.domain.driver import IWifiDriver
+from pywificli.domain.scan import ScanBatch, ScanResult
+
+logger = logging.getLogger(__name__)
+
+
+def merge_scan_results(results: Iterable[list[ScanResult]]) -> ScanBatch:
+    """Merge the scan results of multiple interfaces
+
+    An access point seen by several interfaces (same BSSID, or same SSID if the BSSID is unknown) is only kept once,
+    with its strongest signal.
+
+    Args:
+        results (Iterable[list[ScanResult]]): per-interface scan results
+
+    Returns:
+        ScanBatch: merged results
+    """
+    strongest: dict[str, ScanResult] = {}
+    for interface_results in results:
+        for result in interface_results:
+            key = result.bssid or result.ssid
+            if (best := strongest.get(key)) is None or result.rssi > best.rssi:
+                strongest[key] = result
+    return ScanBatch(strongest.values())
+
+
+class WifiInterfaceManager:
+    """Manage every interface of a driver: hand out per-interface controllers and fan operations out across them
+
+    All controllers handed out for the same interface share one InterfaceState, so scans and connects on the same
+    radio are serialized while different radios operate concurrently.
+
+    Args:
+        driver (IWifiDriver): driver that manages the interfaces
+        scan_cache (ScanCache | None): cache shared by all controllers. Defaults to None (no caching).
+    """
+
+    def __init__(self, driver: IWifiDriver, scan_cache: ScanCache | None = None) -> None:
+        self.driver = driver
+        self.scan_cache = scan_cache
+        self._controllers: dict[str, WifiInterfaceController] = {}
+
+    def controller(self, interface: str) -> WifiInterfaceController:
+        """Get the controller of an interface
+
+        Args:
+            interface (str): interface to control
+
+        Returns:
+            WifiInterfaceController: controller (the same instance for each call with the same interface)
+        """
+        if not (controller := self._controllers.get(interface)):
+            controller = WifiInterfaceController(self.driver, interface, self.scan_cache, InterfaceState())
+            self._controllers[interface] = controller
+        return controller
+
+    def __contains__(self, interface: object) -> bool:
+        """Has a controller been handed out for this interface (and not been pruned since)?"""
+        return interface in self._controllers
+
+    def prune(self, available: Iterable[str]) -> set[str]:
+        """Drop the controllers (and cached scans) of interfaces that are no longer available
+
+        Callers still holding a pruned controller may keep using it, but later lookups get a fresh one.
+
+        Args:
+            available (Iterable[str]): interfaces that currently exist
+
+        Returns:
+            set[str]: interfaces that were dropped
+        """
+        vanished = set(self._controllers) - set(available)
+        for interface in vanished:
+            del self._controllers[interface]
+            if self.scan_cache:
+                self.scan_cache.invalidate(interface)
+        if vanished:
+            logger.info("Dropped controllers of vanished interfaces: %s", sorted(vanished))
+        return vanished
+
+    async def refresh(self) -> set[str]:
+        """Look up the available interfaces and prune the controllers of those that vanished
+
+        Returns:
+            set[str]: available interfaces
+        """
+        available = await self.driver.get_available_interfaces()
+        self.prune(available)
+        return available
+
+    @property
+    def states(self) -> dict[str, InterfaceState]:
+        """The tracked state of each interface that has been operated on
+
+        Returns:
+            dict[str, InterfaceState]: interface to state
+        """
+        return {interface: controller.state for interface, controller in self._controllers.items()}
+
+    async def scan_all(self, timeout: float, max_age: float | None = None) -> dict[str, list[ScanResult]]:
+        """Scan on every available interface concurrently
+
+        Interfaces whose scan fails are logged and left out of the results.
+
+        Args:
+            timeout (float): how long to scan for (in seconds)
+            max_age (float | None): accept cached results at most this old (in seconds). Defaults to None.
+
+        Returns:
+            dict[str, list[ScanResult]]: scan results per interface
+        """
+        interfaces = sorted(await self.refresh())
+        results = await asyncio.gather(
+            *[self.controller(interface).scan(timeout, max_age) for interface in interfaces],
+            return_exceptions=True,
+        )
+        scans: dict[str, list[ScanResult]] = {}
+        for interface, result in zip(interfaces, results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
+                logger.error("Scan on %s failed: %r", interface, result)
+            else:
+                scans[interface] = result
+        return scans
+
+    async def scan_merged(self, timeout: float, max_age: float | None = None) -> ScanBatch:
+        """Scan on every available interface concurrently and merge the results
+
+        Args:
+            timeout (float): how long to scan for (in seconds)
+            max_age (float | None): accept cached results at most this old (in seconds). Defaults to None.
+
+        Returns:
+            ScanBatch: merged results (see merge_scan_results)
+        """
+        return merge_scan_results((await self.scan_all(timeout, max_age)).values())
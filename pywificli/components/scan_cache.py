@@ -0,0 +1,106 @@
+"""Per-interface cache of scan results"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from pywificli.domain.scan import ScanBatch, ScanResult
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScanCacheStats:
+    """Counters describing how scan requests were served"""
+
+    hits: int = 0
+    """Served from a cached scan"""
+    misses: int = 0
+    """Started a new scan"""
+    joins: int = 0
+    """Joined a scan that was already in flight"""
+    evictions: int = 0
+    """Entries dropped to respect max_interfaces"""
+
+
+class ScanCache:
+    """Cache the latest scan results of each interface
+
+    Entries are stored column-wise (see ScanBatch) and evicted least-recently-used once more than max_interfaces
+    interfaces are cached.
+
+    Args:
+        max_interfaces (int): maximum amount of interfaces to keep results for. Defaults to 16.
+        max_results (int): maximum amount of results to keep per interface (the strongest are kept). Defaults to 4096.
+    """
+
+    def __init__(self, max_interfaces: int = 16, max_results: int = 4096) -> None:
+        self.max_interfaces = max_interfaces
+        self.max_results = max_results
+        self.stats = ScanCacheStats()
+        self._entries: OrderedDict[str, tuple[float, ScanBatch]] = OrderedDict()
+        self._in_flight: dict[str, asyncio.Future[list[ScanResult]]] = {}
+
+    async def get(
+        self,
+        interface: str,
+        scan: Callable[[], Awaitable[list[ScanResult]]],
+        max_age: float | None = None,
+    ) -> list[ScanResult]:
+        """Get the scan results of an interface, scanning only if needed
+
+        Args:
+            interface (str): interface the results belong to
+            scan (Callable[[], Awaitable[list[ScanResult]]]): performs a scan on the interface
+            max_age (float | None): accept cached results at most this old (in seconds). Defaults to None (always
+                scan, though a scan already in flight is joined).
+
+        Returns:
+            list[ScanResult]: scan results
+        """
+        if max_age is not None and (entry := self._entries.get(interface)):
+            timestamp, batch = entry
+            if time.monotonic() - timestamp <= max_age:
+                self._entries.move_to_end(interface)
+                self.stats.hits += 1
+                return list(batch)
+
+        if future := self._in_flight.get(interface):
+            self.stats.joins += 1
+            logger.debug("Joining in-flight scan on %s", interface)
+        else:
+            self.stats.misses += 1
+            future = asyncio.ensure_future(self._scan_and_store(interface, scan))
+            self._in_flight[interface] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(interface, None))
+        # Shield so that a cancelled caller does not cancel the scan other callers are waiting on
+        return await asyncio.shield(future)
+
+    async def _scan_and_store(
+        self, interface: str, scan: Callable[[], Awaitable[list[ScanResult]]]
+    ) -> list[ScanResult]:
+        results = await scan()
+        if len(results) > self.max_results:
+            results = sorted(results, key=lambda result: result.rssi, reverse=True)[: self.max_results]
+        self._entries[interface] = (time.monotonic(), ScanBatch(results))
+        self._entries.move_to_end(interface)
+        while len(self._entries) > self.max_interfaces:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+        return results
+
+    def invalidate(self, interface: str | None = None) -> None:
+        """Drop cached results
+
+        Args:
+            interface (str | None): only drop results of this interface. Defaults to None (drop everything).
+        """
+        if interface is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(interface, None)
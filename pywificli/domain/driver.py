@@ -1,19 +1,14 @@
 """Driver functionality domain entities and interfaces"""
 
+import asyncio
+import contextlib
 import enum
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from typing import AsyncGenerator
 
 from pywificli.domain.metadata import DriverType, SystemLanguage
-
-
-@dataclass
-class ScanResult:
-    """An SSID Scan Result"""
-
-    ssid: str
-    rssi: str
-    # TODO what else?
+from pywificli.domain.retry import RetryPolicy
+from pywificli.domain.scan import ScanResult
 
 
 class ConnectionState(enum.Enum):
@@ -38,6 +33,9 @@ class IWifiDriver(ABC):
     A WiFi driver can manage all of its interfaces simultaneously.
     """
 
+    retry_policy: RetryPolicy = RetryPolicy()
+    """How connect() retries. Shared by all drivers unless a driver is assigned its own policy."""
+
     @property
     @abstractmethod
     def _driver_type(self) -> DriverType:
@@ -76,6 +74,20 @@ class IWifiDriver(ABC):
         """
 
     @abstractmethod
+    def scan_stream(self, interface: str, timeout: float) -> AsyncGenerator[ScanResult, None]:
+        """Scan for SSIDs on a given interface, yielding each result as soon as it is available
+
+        The underlying scan is stopped as soon as the consumer stops iterating (use contextlib.aclosing to make this
+        deterministic).
+
+        Args:
+            interface (str): interface to use
+            timeout (float): how long to scan for (in seconds)
+
+        Returns:
+            AsyncGenerator[ScanResult, None]: available SSIDs
+        """
+
     async def scan(self, interface: str, timeout: float) -> list[ScanResult]:
         """Scan for SSIDs on a given interface
 
@@ -86,17 +98,19 @@ class IWifiDriver(ABC):
         Returns:
             list[ScanResult]: list of available SSIDs
         """
+        return [result async for result in self.scan_stream(interface, timeout)]
 
-    # TODO retries here? or above?
     @abstractmethod
     async def connect(self, interface: str, ssid: str, password: str, timeout: float) -> bool:
         """Connect to a given SSID
 
+        Failed attempts are retried according to retry_policy, within the overall timeout.
+
         Args:
             interface (str): interface to use
             ssid (str): target SSID to connect to
             password (str): password of SSID
-            timeout (float): how long to attempt to connect before giving up (in seconds)
+            timeout (float): how long to attempt to connect (across all attempts) before giving up (in seconds)
 
         Returns:
             bool: True if the connection was established, False otherwise
@@ -114,7 +128,7 @@ class IWifiDriver(ABC):
         """
 
     @abstractmethod
-    def get_connection_state(self, interface: str) -> tuple[ConnectionState, str]:
+    async def get_connection_state(self, interface: str) -> tuple[ConnectionState, str]:
         """Get the connection state of a given interface
 
         Args:
@@ -124,8 +138,64 @@ class IWifiDriver(ABC):
             tuple[ConnectionState, str]: (ConnectionState, ssid)
         """
 
+    async def watch_connection_state(
+        self, interface: str, min_interval: float = 0.1, max_interval: float = 1.0
+    ) -> AsyncGenerator[tuple[ConnectionState, str], None]:
+        """Watch the connection state of a given interface
+
+        The current state is yielded immediately and then again each time it changes. Drivers with an event source
+        override this. The default implementation polls adaptively: the interval starts at min_interval, doubles
+        while nothing changes up to max_interval, and is reset when a change is observed.
+
+        Args:
+            interface (str): interface to watch
+            min_interval (float): shortest time between polls (in seconds). Defaults to 0.1.
+            max_interval (float): longest time between polls (in seconds). Defaults to 1.0.
+
+        Yields:
+            tuple[ConnectionState, str]: (ConnectionState, ssid)
+        """
+        state = await self.get_connection_state(interface)
+        yield state
+        interval = min_interval
+        while True:
+            await asyncio.sleep(interval)
+            if (new_state := await self.get_connection_state(interface)) != state:
+                state = new_state
+                interval = min_interval
+                yield state
+            else:
+                interval = min(interval * 2, max_interval)
+
+    async def wait_for_connection_state(
+        self, interface: str, state: ConnectionState, ssid: str | None, timeout: float
+    ) -> bool:
+        """Wait until a given interface reaches a connection state
+
+        Args:
+            interface (str): interface to watch
+            state (ConnectionState): state to wait for
+            ssid (str | None): SSID that must also match. None to accept any SSID.
+            timeout (float): how long to wait before giving up (in seconds)
+
+        Returns:
+            bool: True if the state was reached, False if timed out
+        """
+
+        async def wait() -> None:
+            async with contextlib.aclosing(self.watch_connection_state(interface)) as states:
+                async for current, current_ssid in states:
+                    if current is state and (ssid is None or current_ssid == ssid):
+                        return
+
+        try:
+            await asyncio.wait_for(wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
     @abstractmethod
-    def get_scan_state(self, interface: str) -> ScanState:
+    async def get_scan_state(self, interface: str) -> ScanState:
         """Get the scan state of a given interface
 
         Args:
@@ -149,17 +219,82 @@ class IWifiDriver(ABC):
 
 
 class IWifiInterfaceController(ABC):
+    """Wifi Controller for a single interface"""
+
     @abstractmethod
-    async def connect(self, ssid: str, password: str, timeout: float) -> bool: ...
+    async def connect(self, ssid: str, password: str, timeout: float) -> bool:
+        """Connect to a network
+
+        Args:
+            ssid (str): network to connect to
+            password (str): password of the network ("" for open networks)
+            timeout (float): how long to try for (in seconds)
+
+        Returns:
+            bool: True if connected, False otherwise
+        """
+
     @abstractmethod
-    async def scan(self, timeout: float) -> set[str]: ...
+    def scan_stream(self, timeout: float) -> AsyncGenerator[ScanResult, None]:
+        """Scan for SSIDs, yielding each result as soon as it is known
+
+        Args:
+            timeout (float): how long to scan for (in seconds)
+
+        Yields:
+            ScanResult: available SSIDs
+        """
+
+    async def scan(self, timeout: float) -> list[ScanResult]:
+        """Scan for SSIDs
+
+        Args:
+            timeout (float): how long to scan for (in seconds)
+
+        Returns:
+            list[ScanResult]: list of available SSIDs
+        """
+        return [result async for result in self.scan_stream(timeout)]
+
     @abstractmethod
-    async def disconnect(self) -> bool: ...
+    async def disconnect(self) -> bool:
+        """Disconnect from the current network
+
+        Returns:
+            bool: True if the request was successful, False otherwise
+        """
+
     @abstractmethod
-    async def is_enabled(self) -> bool: ...
+    async def is_enabled(self) -> bool:
+        """Is the interface enabled?
+
+        Returns:
+            bool: True if enabled, False otherwise
+        """
+
     @abstractmethod
-    async def enable(self, enable: bool) -> bool: ...
+    async def enable(self, enable: bool) -> bool:
+        """Enable or disable the interface
+
+        Args:
+            enable (bool): True to enable, False to disable
+
+        Returns:
+            bool: True if the request was successful, False otherwise
+        """
+
     @abstractmethod
-    def get_connection_state(self) -> tuple[ConnectionState, str]: ...
+    async def get_connection_state(self) -> tuple[ConnectionState, str]:
+        """Get the current network SSID and state
+
+        Returns:
+            tuple[ConnectionState, str]: (ConnectionState, ssid)
+        """
+
     @abstractmethod
-    def get_scan_state(self) -> ScanState: ...
+    async def get_scan_state(self) -> ScanState:
+        """Get the scan state
+
+        Returns:
+            ScanState: scan state
+        """
@@ -14,6 +14,9 @@ class DriverType(enum.Enum):
 
     LINUX_NMCLI = enum.auto()
     LINUX_NMCLI_LEGACY = enum.auto()
+    LINUX_NM_DBUS = enum.auto()
     LINUX_WPA = enum.auto()
     MAC_OS = enum.auto()
     WINDOWS = enum.auto()
+    SIMULATED = enum.auto()
+    """In-process simulation for load testing. Never detected, only selected explicitly."""
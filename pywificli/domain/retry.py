@@ -0,0 +1,114 @@
+"""Deadline-aware retries of driver operations"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AttemptOutcome:
+    """How one attempt of a retried operation went"""
+
+    attempt: int
+    """1-based attempt number"""
+    started: float
+    """When the attempt started (in seconds since the first attempt started)"""
+    duration: float
+    """How long the attempt took (in seconds)"""
+    succeeded: bool
+    error: str | None = None
+    """Why the attempt failed, if it raised or timed out"""
+
+
+@dataclass
+class RetryPolicy:
+    """Retry an operation until it succeeds, the attempt budget is spent, or the overall deadline passes
+
+    Each attempt is given the time left until the deadline (and is cancelled once it is reached). Attempts are
+    separated by exponential backoff with jitter, and no backoff is started that would end after the deadline.
+
+    Args:
+        max_attempts (int): attempt budget. Defaults to 3.
+        initial_backoff (float): delay after the first failed attempt (in seconds). Defaults to 0.25.
+        max_backoff (float): longest delay between attempts (in seconds). Defaults to 2.0.
+        multiplier (float): growth factor of the delay per attempt. Defaults to 2.0.
+        jitter (float): fraction of each delay that is randomized away, to spread out retries. Defaults to 0.5.
+        on_attempt (list[Callable[[AttemptOutcome], None]]): called with the outcome of every attempt. Defaults to
+            none.
+    """
+
+    max_attempts: int = 3
+    initial_backoff: float = 0.25
+    max_backoff: float = 2.0
+    multiplier: float = 2.0
+    jitter: float = 0.5
+    on_attempt: list[Callable[[AttemptOutcome], None]] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if not 0 <= self.jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1")
+
+    def backoff(self, attempt: int) -> float:
+        """Get the delay after a failed attempt
+
+        Args:
+            attempt (int): 1-based number of the attempt that failed
+
+        Returns:
+            float: delay (in seconds)
+        """
+        delay = min(self.max_backoff, self.initial_backoff * self.multiplier ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())
+
+    def _report(self, outcome: AttemptOutcome) -> None:
+        logger.debug("Attempt %s %s: %s", outcome.attempt, "succeeded" if outcome.succeeded else "failed", outcome)
+        for callback in self.on_attempt:
+            callback(outcome)
+
+    async def run(self, operation: Callable[[float], Awaitable[bool]], deadline: float) -> bool:
+        """Run an operation with retries
+
+        Args:
+            operation (Callable[[float], Awaitable[bool]]): one attempt, given the time it may take (in seconds).
+                Returns True on success. Exceptions count as failed attempts.
+            deadline (float): overall time budget of all attempts and backoffs (in seconds)
+
+        Raises:
+            Exception: the last attempt's exception, if it raised
+
+        Returns:
+            bool: True if an attempt succeeded, False otherwise
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        end = start + deadline
+        for attempt in range(1, self.max_attempts + 1):
+            attempt_start = loop.time()
+            if (remaining := end - attempt_start) <= 0:
+                break
+            succeeded, error, exception = False, None, None
+            try:
+                succeeded = await asyncio.wait_for(operation(remaining), remaining)
+            except asyncio.TimeoutError:
+                error = "timed out"
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                error, exception = repr(e), e
+            self._report(AttemptOutcome(attempt, attempt_start - start, loop.time() - attempt_start, succeeded, error))
+            if succeeded:
+                return True
+
+            delay = self.backoff(attempt)
+            if attempt == self.max_attempts or loop.time() + delay >= end:
+                if exception:
+                    raise exception
+                break
+            await asyncio.sleep(delay)
+        return False
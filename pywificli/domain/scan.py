@@ -0,0 +1,187 @@
+"""Scan result entities"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator
+
+# Sentinel used by ScanBatch's numeric columns for unknown values
+_UNKNOWN = 0
+
+
+@dataclass(frozen=True, slots=True)
+class ScanResult:
+    """An SSID Scan Result (one per BSSID if the driver reports them)"""
+
+    ssid: str
+    rssi: int
+    """Signal strength in dBm"""
+    bssid: str | None = None
+    channel: int | None = None
+    frequency: int | None = None
+    """Center frequency in MHz"""
+    security: str | None = None
+
+
+def channel_to_frequency(channel: int, band: str | None = None) -> int | None:
+    """Get the center frequency of a Wifi channel
+
+    Args:
+        channel (int): channel number
+        band (str | None): band as reported by the OS (i.e. "6 GHz"), needed to disambiguate 6 GHz channels.
+            Defaults to None.
+
+    Returns:
+        int | None: frequency in MHz or None if the channel is not valid
+    """
+    if band and band.startswith("6"):
+        return 5950 + 5 * channel if 1 <= channel <= 233 else None
+    if channel == 14:
+        return 2484
+    if 1 <= channel <= 13:
+        return 2407 + 5 * channel
+    if 32 <= channel <= 177:
+        return 5000 + 5 * channel
+    return None
+
+
+def frequency_to_channel(frequency: int) -> int | None:
+    """Get the Wifi channel of a center frequency (the inverse of channel_to_frequency)
+
+    Args:
+        frequency (int): frequency in MHz
+
+    Returns:
+        int | None: channel number or None if the frequency is not a Wifi channel
+    """
+    if frequency == 2484:
+        return 14
+    if 2412 <= frequency <= 2472:
+        return (frequency - 2407) // 5
+    if 5160 <= frequency <= 5885:
+        return (frequency - 5000) // 5
+    if 5955 <= frequency <= 7115:
+        return (frequency - 5950) // 5
+    return None
+
+
+class ScanBatch:
+    """A column-wise (struct of arrays) container for large amounts of scan results
+
+    Numeric columns are stored in compact arrays, with 0 meaning unknown channel / frequency. Operations return new
+    batches and never materialize ScanResult objects unless iterated.
+
+    Args:
+        results (Iterable[ScanResult]): initial results. Defaults to ().
+    """
+
+    __slots__ = ("ssids", "rssis", "bssids", "channels", "frequencies", "securities")
+
+    def __init__(self, results: Iterable[ScanResult] = ()) -> None:
+        self.ssids: list[str] = []
+        self.rssis = array("h")
+        self.bssids: list[str | None] = []
+        self.channels = array("H")
+        self.frequencies = array("H")
+        self.securities: list[str | None] = []
+        self.extend(results)
+
+    def append(self, result: ScanResult) -> None:
+        """Add a result
+
+        Args:
+            result (ScanResult): result to add
+        """
+        self.ssids.append(result.ssid)
+        self.rssis.append(result.rssi)
+        self.bssids.append(result.bssid)
+        self.channels.append(result.channel or _UNKNOWN)
+        self.frequencies.append(result.frequency or _UNKNOWN)
+        self.securities.append(result.security)
+
+    def extend(self, results: Iterable[ScanResult]) -> None:
+        """Add multiple results
+
+        Args:
+            results (Iterable[ScanResult]): results to add
+        """
+        for result in results:
+            self.append(result)
+
+    def __len__(self) -> int:
+        return len(self.ssids)
+
+    def __getitem__(self, index: int) -> ScanResult:
+        return ScanResult(
+            ssid=self.ssids[index],
+            rssi=self.rssis[index],
+            bssid=self.bssids[index],
+            channel=self.channels[index] or None,
+            frequency=self.frequencies[index] or None,
+            security=self.securities[index],
+        )
+
+    def __iter__(self) -> Iterator[ScanResult]:
+        return (self[index] for index in range(len(self)))
+
+    def _select(self, indices: Iterable[int]) -> ScanBatch:
+        batch = ScanBatch()
+        for index in indices:
+            batch.ssids.append(self.ssids[index])
+            batch.rssis.append(self.rssis[index])
+            batch.bssids.append(self.bssids[index])
+            batch.channels.append(self.channels[index])
+            batch.frequencies.append(self.frequencies[index])
+            batch.securities.append(self.securities[index])
+        return batch
+
+    def filter(
+        self,
+        ssid: str | None = None,
+        min_rssi: int | None = None,
+        predicate: Callable[[ScanResult], bool] | None = None,
+    ) -> ScanBatch:
+        """Get the results matching all of the given criteria
+
+        Args:
+            ssid (str | None): only keep results with this SSID. Defaults to None.
+            min_rssi (int | None): only keep results at least this strong (in dBm). Defaults to None.
+            predicate (Callable[[ScanResult], bool] | None): arbitrary filter. This needs to materialize each
+                remaining result so it is applied last. Defaults to None.
+
+        Returns:
+            ScanBatch: matching results
+        """
+        indices: Iterable[int] = range(len(self))
+        if ssid is not None:
+            indices = [i for i in indices if self.ssids[i] == ssid]
+        if min_rssi is not None:
+            rssis = self.rssis
+            indices = [i for i in indices if rssis[i] >= min_rssi]
+        if predicate is not None:
+            indices = [i for i in indices if predicate(self[i])]
+        return self._select(indices)
+
+    def sorted_by_signal(self, strongest_first: bool = True) -> ScanBatch:
+        """Get the results sorted by signal strength
+
+        Args:
+            strongest_first (bool): sort descending. Defaults to True.
+
+        Returns:
+            ScanBatch: sorted results
+        """
+        return self._select(sorted(range(len(self)), key=self.rssis.__getitem__, reverse=strongest_first))
+
+    def dedupe_by_ssid(self) -> ScanBatch:
+        """Keep only the strongest result of each SSID
+
+        Returns:
+            ScanBatch: one result per SSID, in the order the kept results appear
+        """
+        strongest: dict[str, int] = {}
+        for index, ssid in enumerate(self.ssids):
+            if (best := strongest.get(ssid)) is None or self.rssis[index] > self.rssis[best]:
+                strongest[ssid] = index
+        return self._select(sorted(strongest.values()))
@@ -1,5 +1,32 @@
-from .linux_nmcli import EnglishLinuxNmcli
-from .linux_nmcli_legacy import EnglishLinuxNmcliLegacy
-from .linux_wpa import EnglishLinuxWpa
-from .macos import EnglishLinuxMacOs
-from .windows import EnglishLinuxWindows
+"""English System Language drivers
+
+Drivers are imported lazily (on attribute access) so that only the driver actually used is ever loaded.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .linux_nm_dbus import EnglishLinuxNmDbus
+    from .linux_nmcli import EnglishLinuxNmcli
+    from .linux_nmcli_legacy import EnglishLinuxNmcliLegacy
+    from .linux_wpa import EnglishLinuxWpa
+    from .macos import EnglishLinuxMacOs
+    from .windows import EnglishLinuxWindows
+
+_modules = {
+    "EnglishLinuxNmcli": ".linux_nmcli",
+    "EnglishLinuxNmcliLegacy": ".linux_nmcli_legacy",
+    "EnglishLinuxNmDbus": ".linux_nm_dbus",
+    "EnglishLinuxWpa": ".linux_wpa",
+    "EnglishLinuxMacOs": ".macos",
+    "EnglishLinuxWindows": ".windows",
+}
+
+__all__ = list(_modules)
+
+
+def __getattr__(name: str) -> Any:
+    if module := _modules.get(name):
+        return getattr(importlib.import_module(module, __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
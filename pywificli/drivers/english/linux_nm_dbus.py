@@ -0,0 +1,420 @@
+"""Linux NetworkManager D-Bus driver for English System Language
+
+Talks to NetworkManager over the system bus instead of spawning nmcli, so that no process is spawned and no output
+is parsed. Requires the optional dbus-next dependency (pip install pywificli[dbus]).
+"""
+
+import asyncio
+import contextlib
+import logging
+from typing import Any, AsyncGenerator, AsyncIterator
+
+from dbus_next import BusType, Message, MessageType, Variant
+from dbus_next.aio import MessageBus
+from dbus_next.errors import DBusError
+
+from pywificli.domain.driver import ConnectionState, IWifiDriver, ScanResult, ScanState
+from pywificli.domain.metadata import DriverType, SystemLanguage
+from pywificli.domain.scan import frequency_to_channel
+
+logger = logging.getLogger(__name__)
+
+NM_NAME = "org.freedesktop.NetworkManager"
+NM_PATH = "/org/freedesktop/NetworkManager"
+NM_DEVICE = "org.freedesktop.NetworkManager.Device"
+NM_WIRELESS = "org.freedesktop.NetworkManager.Device.Wireless"
+NM_ACCESS_POINT = "org.freedesktop.NetworkManager.AccessPoint"
+NM_SETTINGS = "org.freedesktop.NetworkManager.Settings"
+NM_SETTINGS_PATH = "/org/freedesktop/NetworkManager/Settings"
+NM_CONNECTION = "org.freedesktop.NetworkManager.Settings.Connection"
+PROPERTIES = "org.freedesktop.DBus.Properties"
+
+# NMDeviceType
+_DEVICE_TYPE_WIFI = 2
+# NMDeviceState
+_STATE_PREPARE = 40
+_STATE_ACTIVATED = 100
+_STATE_FAILED = 120
+# NM80211ApFlags / NM80211ApSecurityFlags
+_AP_FLAGS_PRIVACY = 0x1
+_AP_SEC_KEY_MGMT_PSK = 0x100
+_AP_SEC_KEY_MGMT_802_1X = 0x200
+_AP_SEC_KEY_MGMT_SAE = 0x400
+_AP_SEC_KEY_MGMT_OWE = 0x800
+
+
+def security_from_flags(flags: int, wpa_flags: int, rsn_flags: int) -> str | None:
+    """Summarize an access point's security flags the way nmcli's SECURITY field does
+
+    Args:
+        flags (int): NM80211ApFlags
+        wpa_flags (int): NM80211ApSecurityFlags of WPA1
+        rsn_flags (int): NM80211ApSecurityFlags of RSN (WPA2/WPA3)
+
+    Returns:
+        str | None: i.e. "WPA2 WPA3", or None for open networks
+    """
+    security: list[str] = []
+    if flags & _AP_FLAGS_PRIVACY and not wpa_flags and not rsn_flags:
+        security.append("WEP")
+    if wpa_flags:
+        security.append("WPA1")
+    if rsn_flags & (_AP_SEC_KEY_MGMT_PSK | _AP_SEC_KEY_MGMT_802_1X):
+        security.append("WPA2")
+    if rsn_flags & _AP_SEC_KEY_MGMT_SAE:
+        security.append("WPA3")
+    if rsn_flags & _AP_SEC_KEY_MGMT_OWE:
+        security.append("OWE")
+    if (wpa_flags | rsn_flags) & _AP_SEC_KEY_MGMT_802_1X:
+        security.append("802.1X")
+    return " ".join(security) or None
+
+
+def _message_bus(bus_address: str | None) -> MessageBus:
+    # dbus-next annotates bus_address as str, but None selects the bus by type
+    return MessageBus(bus_address=bus_address, bus_type=BusType.SYSTEM)  # type: ignore[arg-type]
+
+
+async def network_manager_available(bus_address: str | None = None, timeout: float = 1.0) -> bool:
+    """Is NetworkManager reachable on the (system) bus?
+
+    Args:
+        bus_address (str | None): bus to check. Defaults to None (the system bus).
+        timeout (float): how long to wait for the bus (in seconds). Defaults to 1.0.
+
+    Returns:
+        bool: True if NetworkManager owns its bus name, False otherwise
+    """
+    bus: MessageBus | None = None
+    try:
+        bus = await asyncio.wait_for(_message_bus(bus_address).connect(), timeout)
+        reply = await asyncio.wait_for(
+            bus.call(
+                Message(
+                    destination="org.freedesktop.DBus",
+                    path="/org/freedesktop/DBus",
+                    interface="org.freedesktop.DBus",
+                    member="NameHasOwner",
+                    signature="s",
+                    body=[NM_NAME],
+                )
+            ),
+            timeout,
+        )
+        return reply is not None and reply.message_type == MessageType.METHOD_RETURN and reply.body == [True]
+    except (OSError, EOFError, asyncio.TimeoutError, DBusError) as e:
+        logger.debug("NetworkManager is not available on the bus: %r", e)
+        return False
+    finally:
+        if bus:
+            bus.disconnect()
+
+
+class EnglishLinuxNmDbus(IWifiDriver):
+    """Drive NetworkManager through its D-Bus API
+
+    Scans and connects complete on NetworkManager's signals (LastScan changes, AccessPointAdded, and device
+    StateChanged) instead of on polls.
+
+    Args:
+        bus_address (str | None): address of the bus NetworkManager is on. Defaults to None (the system bus).
+    """
+
+    def __init__(self, bus_address: str | None = None) -> None:
+        self.bus_address = bus_address
+        self._bus: MessageBus | None = None
+        self._bus_lock = asyncio.Lock()
+        self._device_paths: dict[str, str] = {}
+
+    @property
+    def _driver_type(self) -> DriverType:
+        return DriverType.LINUX_NM_DBUS
+
+    @property
+    def _system_language(self) -> SystemLanguage:
+        return SystemLanguage.ENGLISH
+
+    async def _connect(self) -> MessageBus:
+        async with self._bus_lock:
+            if not (self._bus and self._bus.connected):
+                self._bus = await _message_bus(self.bus_address).connect()
+            return self._bus
+
+    def close(self) -> None:
+        """Disconnect from the bus"""
+        if self._bus:
+            self._bus.disconnect()
+            self._bus = None
+
+    async def _call(
+        self,
+        path: str,
+        interface: str,
+        member: str,
+        signature: str = "",
+        body: list[Any] | None = None,
+        destination: str = NM_NAME,
+    ) -> list[Any]:
+        """Call a method and get the body of its reply
+
+        Raises:
+            DBusError: the method returned an error
+        """
+        bus = await self._connect()
+        reply = await bus.call(
+            Message(
+                destination=destination,
+                path=path,
+                interface=interface,
+                member=member,
+                signature=signature,
+                body=body or [],
+            )
+        )
+        # Only None for calls flagged as not expecting a reply
+        assert reply is not None
+        if reply.message_type == MessageType.ERROR:
+            raise DBusError(reply.error_name, reply.body[0] if reply.body else "", reply)
+        return reply.body
+
+    async def _get(self, path: str, interface: str, name: str) -> Any:
+        variant: Variant = (await self._call(path, PROPERTIES, "Get", "ss", [interface, name]))[0]
+        return variant.value
+
+    async def _get_all(self, path: str, interface: str) -> dict[str, Any]:
+        properties: dict[str, Variant] = (await self._call(path, PROPERTIES, "GetAll", "s", [interface]))[0]
+        return {name: variant.value for name, variant in properties.items()}
+
+    @contextlib.asynccontextmanager
+    async def _signals(self, path: str, interface: str, member: str) -> AsyncIterator[asyncio.Queue[list[Any]]]:
+        """Receive the bodies of a signal while the context is active
+
+        Subscribe before calling the method whose outcome is awaited so that no signal can be missed.
+        """
+        bus = await self._connect()
+        queue: asyncio.Queue[list[Any]] = asyncio.Queue()
+        rule = f"type='signal',sender='{NM_NAME}',path='{path}',interface='{interface}',member='{member}'"
+
+        def handler(message: Message) -> None:
+            if (
+                message.message_type == MessageType.SIGNAL
+                and message.path == path
+                and message.interface == interface
+                and message.member == member
+            ):
+                queue.put_nowait(message.body)
+
+        bus.add_message_handler(handler)
+        try:
+            await self._call(
+                "/org/freedesktop/DBus", "org.freedesktop.DBus", "AddMatch", "s", [rule], "org.freedesktop.DBus"
+            )
+            yield queue
+        finally:
+            bus.remove_message_handler(handler)
+            if bus.connected:
+                with contextlib.suppress(DBusError):
+                    await self._call(
+                        "/org/freedesktop/DBus",
+                        "org.freedesktop.DBus",
+                        "RemoveMatch",
+                        "s",
+                        [rule],
+                        "org.freedesktop.DBus",
+                    )
+
+    async def _refresh_devices(self) -> None:
+        device_paths: dict[str, str] = {}
+        for path in (await self._call(NM_PATH, NM_NAME, "GetDevices"))[0]:
+            properties = await self._get_all(path, NM_DEVICE)
+            if properties.get("DeviceType") == _DEVICE_TYPE_WIFI:
+                device_paths[properties["Interface"]] = path
+        self._device_paths = device_paths
+
+    async def _device_path(self, interface: str) -> str:
+        if interface not in self._device_paths:
+            await self._refresh_devices()
+        if not (path := self._device_paths.get(interface)):
+            raise RuntimeError(f"Interface {interface} does not exist")
+        return path
+
+    async def _access_point(self, path: str) -> ScanResult:
+        properties = await self._get_all(path, NM_ACCESS_POINT)
+        frequency = properties.get("Frequency") or None
+        return ScanResult(
+            ssid=bytes(properties.get("Ssid", b"")).decode(errors="replace"),
+            # Strength is a 0-100 quality value. Convert it to an approximate dBm value (as for nmcli).
+            rssi=properties.get("Strength", 0) // 2 - 100,
+            bssid=properties.get("HwAddress") or None,
+            channel=frequency_to_channel(frequency) if frequency else None,
+            frequency=frequency,
+            security=security_from_flags(
+                properties.get("Flags", 0), properties.get("WpaFlags", 0), properties.get("RsnFlags", 0)
+            ),
+        )
+
+    async def get_available_interfaces(self) -> set[str]:
+        await self._refresh_devices()
+        return set(self._device_paths)
+
+    async def is_enabled(self, interface: str) -> bool:
+        return bool(await self._get(NM_PATH, NM_NAME, "WirelessEnabled"))
+
+    async def scan_stream(self, interface: str, timeout: float) -> AsyncGenerator[ScanResult, None]:
+        device = await self._device_path(interface)
+        seen: set[str] = set()
+        async with (
+            self._signals(device, NM_WIRELESS, "AccessPointAdded") as added,
+            self._signals(device, PROPERTIES, "PropertiesChanged") as changed,
+        ):
+            try:
+                await self._call(device, NM_WIRELESS, "RequestScan", "a{sv}", [{}])
+                scanning = True
+            except DBusError as e:
+                # i.e. NotAllowed right after a previous scan: NetworkManager's current results are fresh
+                logger.debug("Scan request on %s was refused: %s", interface, e)
+                scanning = False
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while scanning:
+                getters = [asyncio.ensure_future(added.get()), asyncio.ensure_future(changed.get())]
+                done, pending = await asyncio.wait(
+                    getters, timeout=max(0.0, deadline - loop.time()), return_when=asyncio.FIRST_COMPLETED
+                )
+                for getter in pending:
+                    getter.cancel()
+                if not done:
+                    logger.warning("Scan on %s did not complete within %s seconds", interface, timeout)
+                    break
+                for getter in getters:
+                    if getter not in done:
+                        continue
+                    body = getter.result()
+                    if getter is getters[0]:
+                        # Stream access points as soon as they are found
+                        if body[0] not in seen:
+                            seen.add(body[0])
+                            with contextlib.suppress(DBusError):
+                                yield await self._access_point(body[0])
+                    elif body[0] == NM_WIRELESS and "LastScan" in body[1]:
+                        scanning = False
+
+        for path in (await self._call(device, NM_WIRELESS, "GetAllAccessPoints"))[0]:
+            if path not in seen:
+                # Access points may vanish between listing and reading them
+                with contextlib.suppress(DBusError):
+                    yield await self._access_point(path)
+
+    async def connect(self, interface: str, ssid: str, password: str, timeout: float) -> bool:
+        return await self.retry_policy.run(
+            lambda remaining: self._connect_attempt(interface, ssid, password, remaining), timeout
+        )
+
+    async def _find_connection(self, ssid: str) -> tuple[str, dict[str, dict[str, Variant]]] | None:
+        """Find a saved wifi connection profile of an SSID
+
+        Args:
+            ssid (str): SSID of the network
+
+        Returns:
+            tuple[str, dict[str, dict[str, Variant]]] | None: path and settings (without secrets) of the profile, or
+                None if there is none
+        """
+        for path in (await self._call(NM_SETTINGS_PATH, NM_SETTINGS, "ListConnections"))[0]:
+            # Profiles may be deleted between listing and reading them
+            with contextlib.suppress(DBusError):
+                settings: dict[str, dict[str, Variant]] = (await self._call(path, NM_CONNECTION, "GetSettings"))[0]
+                if (
+                    "ssid" in (wireless := settings.get("802-11-wireless", {}))
+                    and bytes(wireless["ssid"].value) == ssid.encode()
+                ):
+                    return path, settings
+        return None
+
+    async def _connect_attempt(self, interface: str, ssid: str, password: str, timeout: float) -> bool:
+        device = await self._device_path(interface)
+        security: dict[str, Variant] = {}
+        if password:
+            security = {"key-mgmt": Variant("s", "wpa-psk"), "psk": Variant("s", password)}
+
+        connected = False
+        added = False
+        async with self._signals(device, NM_DEVICE, "StateChanged") as states:
+            if found := await self._find_connection(ssid):
+                # Update the saved profile instead of adding "ssid 1", "ssid 2", ... on every connect
+                connection, settings = found
+                settings.pop("802-11-wireless-security", None)
+                if security:
+                    settings["802-11-wireless-security"] = security
+                await self._call(connection, NM_CONNECTION, "Update", "a{sa{sv}}", [settings])
+                await self._call(NM_PATH, NM_NAME, "ActivateConnection", "ooo", [connection, device, "/"])
+            else:
+                settings = {
+                    "connection": {"type": Variant("s", "802-11-wireless"), "id": Variant("s", ssid)},
+                    "802-11-wireless": {"ssid": Variant("ay", ssid.encode()), "mode": Variant("s", "infrastructure")},
+                }
+                if security:
+                    settings["802-11-wireless-security"] = security
+                connection, _ = await self._call(
+                    NM_PATH, NM_NAME, "AddAndActivateConnection", "a{sa{sv}}oo", [settings, device, "/"]
+                )
+                added = True
+            try:
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + timeout
+                state = 0
+                while state not in (_STATE_ACTIVATED, _STATE_FAILED):
+                    state = (await asyncio.wait_for(states.get(), max(0.0, deadline - loop.time())))[0]
+                connected = state == _STATE_ACTIVATED and (
+                    await self.get_connection_state(interface) == (ConnectionState.CONNECTED, ssid)
+                )
+            except asyncio.TimeoutError:
+                logger.warning("Connection to %s did not complete within %s seconds", ssid, timeout)
+            finally:
+                if added and not connected:
+                    # Do not leave a profile with (possibly wrong) credentials behind. Saved profiles are left alone.
+                    with contextlib.suppress(DBusError):
+                        await self._call(connection, NM_CONNECTION, "Delete")
+        return connected
+
+    async def disconnect(self, interface: str) -> bool:
+        try:
+            await self._call(await self._device_path(interface), NM_DEVICE, "Disconnect")
+        except DBusError as e:
+            logger.debug("Disconnect of %s failed: %s", interface, e)
+            return False
+        return True
+
+    async def get_connection_state(self, interface: str) -> tuple[ConnectionState, str]:
+        device = await self._device_path(interface)
+        state = await self._get(device, NM_DEVICE, "State")
+        if not _STATE_PREPARE <= state <= _STATE_ACTIVATED:
+            return ConnectionState.DISCONNECTED, ""
+        ssid = ""
+        if (access_point := await self._get(device, NM_WIRELESS, "ActiveAccessPoint")) != "/":
+            ssid = bytes(await self._get(access_point, NM_ACCESS_POINT, "Ssid")).decode(errors="replace")
+        return (ConnectionState.CONNECTED if state == _STATE_ACTIVATED else ConnectionState.CONNECTING), ssid
+
+    async def watch_connection_state(
+        self, interface: str, min_interval: float = 0.1, max_interval: float = 1.0
+    ) -> AsyncGenerator[tuple[ConnectionState, str], None]:
+        async with self._signals(await self._device_path(interface), NM_DEVICE, "StateChanged") as states:
+            state = await self.get_connection_state(interface)
+            yield state
+            while True:
+                await states.get()
+                if (new_state := await self.get_connection_state(interface)) != state:
+                    state = new_state
+                    yield state
+
+    async def get_scan_state(self, interface: str) -> ScanState:
+        raise NotImplementedError
+
+    async def enable(self, interface: str, enable: bool) -> bool:
+        try:
+            await self._call(NM_PATH, PROPERTIES, "Set", "ssv", [NM_NAME, "WirelessEnabled", Variant("b", enable)])
+        except DBusError as e:
+            logger.debug("Setting WirelessEnabled failed: %s", e)
+            return False
+        return True
@@ -1,38 +1,29 @@
 """Linux NMCLI driver for English System Language"""
 
-from pywificli.domain.driver import ConnectionState, IWifiDriver, ScanResult, ScanState
 from pywificli.domain.metadata import DriverType, SystemLanguage
+from pywificli.drivers.english.nmcli_base import NmcliDriverBase
 
 
-class EnglishLinuxNmcli(IWifiDriver):
+class EnglishLinuxNmcli(NmcliDriverBase):
+    """Driver for nmcli versions before 0.9.9.0 (see WifiDriverFactory)
+
+    These versions use the "nm" / "dev" / "iface" syntax, can not choose whether a listing rescans and can not read
+    the password from stdin (so it is passed as argument).
+    """
+
+    _device = "dev"
+    _ifname = "iface"
+    _radio = ["nm", "wifi"]
+    _supports_rescan = False
+    _supports_ask = False
+
     @property
     def _driver_type(self) -> DriverType:
-        raise NotImplementedError
+        return DriverType.LINUX_NMCLI
 
     @property
     def _system_language(self) -> SystemLanguage:
-        raise NotImplementedError
-
-    async def get_available_interfaces(self) -> set[str]:
-        raise NotImplementedError
-
-    async def is_enabled(self, interface: str) -> bool:
-        raise NotImplementedError
-
-    async def scan(self, interface: str, timeout: float) -> list[ScanResult]:
-        raise NotImplementedError
-
-    async def connect(self, interface: str, ssid: str, password: str, timeout: float) -> bool:
-        raise NotImplementedError
-
-    async def disconnect(self, interface: str) -> bool:
-        raise NotImplementedError
-
-    async def get_connection_state(self, interface: str) -> tuple[ConnectionState, str]:
-        raise NotImplementedError
-
-    async def get_scan_state(self, interface: str) -> ScanState:
-        raise NotImplementedError
+        return SystemLanguage.ENGLISH
 
-    async def enable(self, interface: str, enable: bool) -> bool:
-        raise NotImplementedError
+    def _disconnect_target(self, interface: str) -> list[str]:
+        return ["iface", interface]
@@ -1,38 +1,214 @@
-"""Linux WPA driver for English System Language"""
+"""Linux WPA driver for English System Language
+
+Talks to wpa_supplicant's control sockets directly instead of spawning wpa_cli for each command.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import stat
+from pathlib import Path
+from typing import AsyncGenerator
 
 from pywificli.domain.driver import ConnectionState, IWifiDriver, ScanResult, ScanState
 from pywificli.domain.metadata import DriverType, SystemLanguage
+from pywificli.drivers.english.wpa_parser import (
+    parse_list_networks,
+    parse_scan_results_line,
+    parse_status,
+    unescape,
+)
+from pywificli.drivers.wpa_ctrl import DEFAULT_CTRL_DIR, WpaCtrl, wait_for_event
+from pywificli.exceptions import WpaCtrlError
+from pywificli.util import cmd
+
+logger = logging.getLogger(__name__)
+
+# wpa_state values while a connection is being established
+_CONNECTING_STATES = {"AUTHENTICATING", "ASSOCIATING", "ASSOCIATED", "4WAY_HANDSHAKE", "GROUP_HANDSHAKE"}
+# Events that conclude a connection attempt
+_CONNECT_OUTCOMES = ("CTRL-EVENT-CONNECTED", "CTRL-EVENT-SSID-TEMP-DISABLED")
+# Events after which the connection state may have changed
+_STATE_EVENTS = ("CTRL-EVENT-CONNECTED", "CTRL-EVENT-DISCONNECTED", "CTRL-EVENT-STATE-CHANGE")
 
 
 class EnglishLinuxWpa(IWifiDriver):
+    """Drive wpa_supplicant through its per-interface control sockets
+
+    Each interface gets a persistent request socket and an attached event socket, so scans and connects complete
+    as soon as wpa_supplicant reports them instead of on polls. The sockets are only accessible to root and to the
+    group set by wpa_supplicant's ctrl_interface, which is why this driver never asks for sudo. Only enable() runs a
+    privileged command (ip link).
+
+    Args:
+        ctrl_dir (str | os.PathLike): directory containing the control sockets. Defaults to DEFAULT_CTRL_DIR.
+    """
+
+    def __init__(self, ctrl_dir: str | os.PathLike = DEFAULT_CTRL_DIR) -> None:
+        self.ctrl_dir = Path(ctrl_dir)
+        self._requests: dict[str, WpaCtrl] = {}
+        self._events: dict[str, WpaCtrl] = {}
+        self._open_lock = asyncio.Lock()
+
     @property
     def _driver_type(self) -> DriverType:
-        raise NotImplementedError
+        return DriverType.LINUX_WPA
 
     @property
     def _system_language(self) -> SystemLanguage:
-        raise NotImplementedError
+        return SystemLanguage.ENGLISH
+
+    async def _sockets(self, interface: str) -> tuple[WpaCtrl, WpaCtrl]:
+        """Get the (request, event) sockets of an interface, (re)connecting them if needed"""
+        async with self._open_lock:
+            if not ((request := self._requests.get(interface)) and request.connected):
+                request = WpaCtrl(self.ctrl_dir / interface)
+                await request.open()
+                self._requests[interface] = request
+            if not ((events := self._events.get(interface)) and events.connected):
+                events = WpaCtrl(self.ctrl_dir / interface)
+                await events.open()
+                try:
+                    await events.attach()
+                except WpaCtrlError:
+                    events.close()
+                    raise
+                self._events[interface] = events
+            return request, events
+
+    async def _request(self, interface: str, command: str) -> str:
+        request, _ = await self._sockets(interface)
+        return await request.request(command)
+
+    async def _status(self, interface: str) -> dict[str, str]:
+        return parse_status(await self._request(interface, "STATUS"))
+
+    def close(self) -> None:
+        """Close all control sockets"""
+        for ctrl in [*self._requests.values(), *self._events.values()]:
+            ctrl.close()
+        self._requests.clear()
+        self._events.clear()
 
     async def get_available_interfaces(self) -> set[str]:
-        raise NotImplementedError
+        interfaces: set[str] = set()
+        with contextlib.suppress(FileNotFoundError):
+            for entry in os.scandir(self.ctrl_dir):
+                # P2P devices have their own control socket but are not usable as station interfaces
+                if stat.S_ISSOCK(entry.stat().st_mode) and not entry.name.startswith("p2p-dev-"):
+                    interfaces.add(entry.name)
+        return interfaces
 
     async def is_enabled(self, interface: str) -> bool:
-        raise NotImplementedError
+        return (await self._status(interface)).get("wpa_state") != "INTERFACE_DISABLED"
 
-    async def scan(self, interface: str, timeout: float) -> list[ScanResult]:
-        raise NotImplementedError
+    async def scan_stream(self, interface: str, timeout: float) -> AsyncGenerator[ScanResult, None]:
+        request, events = await self._sockets(interface)
+        with events.subscribe() as queue:
+            # FAIL-BUSY means a scan is already running, whose results will do
+            if (reply := (await request.request("SCAN")).strip()) not in ("OK", "FAIL-BUSY"):
+                raise WpaCtrlError(request.path, f"SCAN failed: {reply}")
+            if not await wait_for_event(queue, ("CTRL-EVENT-SCAN-RESULTS", "CTRL-EVENT-SCAN-FAILED"), timeout):
+                logger.warning("Scan on %s did not complete within %s seconds", interface, timeout)
+        for line in (await request.request("SCAN_RESULTS")).splitlines():
+            if result := parse_scan_results_line(line):
+                yield result
 
     async def connect(self, interface: str, ssid: str, password: str, timeout: float) -> bool:
-        raise NotImplementedError
+        return await self.retry_policy.run(
+            lambda remaining: self._connect_attempt(interface, ssid, password, remaining), timeout
+        )
+
+    async def _network(self, request: WpaCtrl, ssid: str) -> tuple[str, bool]:
+        """Get the id of the network block of an SSID, adding one if there is none yet
+
+        Reusing the block keeps repeated connects from piling up blocks for as long as wpa_supplicant runs.
+
+        Args:
+            request (WpaCtrl): request socket of the interface
+            ssid (str): SSID of the network
+
+        Raises:
+            WpaCtrlError: The network could not be added
+
+        Returns:
+            tuple[str, bool]: network id and whether it was added
+        """
+        networks = parse_list_networks(await request.request("LIST_NETWORKS"))
+        if network_id := next((network_id for network_id, name in networks.items() if name == ssid), None):
+            return network_id, False
+        network_id = (await request.request("ADD_NETWORK")).strip()
+        if not network_id.isdigit():
+            raise WpaCtrlError(request.path, f"ADD_NETWORK failed: {network_id}")
+        # An unquoted SSID is read as hex, which avoids any quoting issues
+        await request.request_ok(f"SET_NETWORK {network_id} ssid {ssid.encode().hex()}")
+        return network_id, True
+
+    async def _connect_attempt(self, interface: str, ssid: str, password: str, timeout: float) -> bool:
+        request, events = await self._sockets(interface)
+        network_id, added = await self._network(request, ssid)
+        connected = False
+        try:
+            # Set the credentials even on a reused network, which may have been open or had another password
+            if password:
+                await request.request_ok(f"SET_NETWORK {network_id} key_mgmt WPA-PSK")
+                await request.request_ok(f'SET_NETWORK {network_id} psk "{password}"')
+            else:
+                await request.request_ok(f"SET_NETWORK {network_id} key_mgmt NONE")
+            with events.subscribe() as queue:
+                await request.request_ok(f"SELECT_NETWORK {network_id}")
+                event = await wait_for_event(queue, _CONNECT_OUTCOMES, timeout)
+            if event is None:
+                logger.warning("Connection to %s did not complete within %s seconds", ssid, timeout)
+            elif event.startswith("CTRL-EVENT-CONNECTED"):
+                connected = await self.get_connection_state(interface) == (ConnectionState.CONNECTED, ssid)
+            else:
+                logger.warning("Connection to %s failed: %s", ssid, event)
+        finally:
+            # Networks that were configured before are left alone
+            if added and not connected:
+                with contextlib.suppress(WpaCtrlError):
+                    await request.request(f"REMOVE_NETWORK {network_id}")
+        return connected
 
     async def disconnect(self, interface: str) -> bool:
-        raise NotImplementedError
+        return (await self._request(interface, "DISCONNECT")).strip() == "OK"
 
     async def get_connection_state(self, interface: str) -> tuple[ConnectionState, str]:
-        raise NotImplementedError
+        status = await self._status(interface)
+        state = status.get("wpa_state")
+        if state == "COMPLETED":
+            return ConnectionState.CONNECTED, unescape(status.get("ssid", ""))
+        if state in _CONNECTING_STATES:
+            return ConnectionState.CONNECTING, unescape(status.get("ssid", ""))
+        return ConnectionState.DISCONNECTED, ""
+
+    async def watch_connection_state(
+        self, interface: str, min_interval: float = 0.1, max_interval: float = 1.0
+    ) -> AsyncGenerator[tuple[ConnectionState, str], None]:
+        _, events = await self._sockets(interface)
+        with events.subscribe() as queue:
+            state = await self.get_connection_state(interface)
+            yield state
+            while (event := await queue.get()) is not None:
+                if (
+                    event.startswith(_STATE_EVENTS)
+                    and (new_state := await self.get_connection_state(interface)) != state
+                ):
+                    state = new_state
+                    yield state
+        logger.warning("Event socket of %s was closed. Falling back to polling.", interface)
+        async for new_state in super().watch_connection_state(interface, min_interval, max_interval):
+            if new_state != state:
+                state = new_state
+                yield state
 
     async def get_scan_state(self, interface: str) -> ScanState:
-        raise NotImplementedError
+        if (await self._status(interface)).get("wpa_state") == "SCANNING":
+            return ScanState.SCANNING
+        return ScanState.IDLE
 
     async def enable(self, interface: str, enable: bool) -> bool:
-        raise NotImplementedError
+        # wpa_supplicant does not control the link, but follows it (the interface is INTERFACE_DISABLED while down)
+        return (await cmd(["ip", "link", "set", "dev", interface, "up" if enable else "down"], privileged=True)).is_ok
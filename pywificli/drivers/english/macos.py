@@ -1,5 +1,7 @@
 """MacOS driver for English System Language"""
 
+from typing import AsyncGenerator
+
 from pywificli.domain.driver import ConnectionState, IWifiDriver, ScanResult, ScanState
 from pywificli.domain.metadata import DriverType, SystemLanguage
 
@@ -19,7 +21,7 @@ class EnglishLinuxMacOs(IWifiDriver):
     async def is_enabled(self, interface: str) -> bool:
         raise NotImplementedError
 
-    async def scan(self, interface: str, timeout: float) -> list[ScanResult]:
+    def scan_stream(self, interface: str, timeout: float) -> AsyncGenerator[ScanResult, None]:
         raise NotImplementedError
 
     async def connect(self, interface: str, ssid: str, password: str, timeout: float) -> bool:
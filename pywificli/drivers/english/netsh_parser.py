@@ -0,0 +1,208 @@
+"""Single pass parsers for English netsh output"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable
+
+
+@dataclass(slots=True)
+class NetshInterface:
+    """An interface block of "netsh wlan show interfaces" """
+
+    name: str
+    description: str | None = None
+    guid: str | None = None
+    physical_address: str | None = None
+    state: str | None = None
+    ssid: str | None = None
+    bssid: str | None = None
+    radio_type: str | None = None
+    authentication: str | None = None
+    cipher: str | None = None
+    channel: int | None = None
+    signal: int | None = None
+    profile: str | None = None
+
+
+@dataclass(slots=True)
+class NetshBssid:
+    """A BSSID block of "netsh wlan show networks mode=bssid" """
+
+    bssid: str
+    signal: int | None = None
+    radio_type: str | None = None
+    band: str | None = None
+    channel: int | None = None
+
+
+@dataclass(slots=True)
+class NetshNetwork:
+    """An SSID block of "netsh wlan show networks [mode=bssid]" """
+
+    interface: str | None
+    ssid: str
+    network_type: str | None = None
+    authentication: str | None = None
+    encryption: str | None = None
+    bssids: list[NetshBssid] = field(default_factory=list)
+
+
+def split_field(line: str) -> tuple[str, str] | None:
+    """Split a "Key    : Value" line into its stripped key and value
+
+    Only the first separator is considered since values (i.e. MAC addresses or SSIDs) may contain colons.
+
+    Args:
+        line (str): line to split
+
+    Returns:
+        tuple[str, str] | None: (key, value) or None if the line is not a field
+    """
+    key, sep, value = line.partition(" : ")
+    if not sep:
+        # Empty values are printed without trailing whitespace on some versions
+        stripped = line.rstrip()
+        if not stripped.endswith(" :"):
+            return None
+        key, value = stripped[:-2], ""
+    return key.strip(), value.strip()
+
+
+def _percent(value: str) -> int | None:
+    try:
+        return int(value.rstrip("%"))
+    except ValueError:
+        return None
+
+
+def _int(value: str) -> int | None:
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+_INTERFACE_FIELDS = {
+    "Description": "description",
+    "GUID": "guid",
+    "Physical address": "physical_address",
+    "State": "state",
+    "SSID": "ssid",
+    "BSSID": "bssid",
+    "AP BSSID": "bssid",
+    "Radio type": "radio_type",
+    "Authentication": "authentication",
+    "Cipher": "cipher",
+    "Profile": "profile",
+}
+
+
+def parse_interfaces(lines: Iterable[str]) -> list[NetshInterface]:
+    """Parse the output of "netsh wlan show interfaces"
+
+    Args:
+        lines (Iterable[str]): output lines (without line endings)
+
+    Returns:
+        list[NetshInterface]: all interfaces in order of appearance
+    """
+    interfaces: list[NetshInterface] = []
+    current: NetshInterface | None = None
+    for line in lines:
+        if not (parsed := split_field(line)):
+            continue
+        key, value = parsed
+        if key == "Name":
+            current = NetshInterface(name=value)
+            interfaces.append(current)
+        elif current is None:
+            continue
+        elif attribute := _INTERFACE_FIELDS.get(key):
+            setattr(current, attribute, value)
+        elif key == "Channel":
+            current.channel = _int(value)
+        elif key == "Signal":
+            current.signal = _percent(value)
+    return interfaces
+
+
+class NetshNetworksParser:
+    """Incremental parser for the output of "netsh wlan show networks [mode=bssid]"
+
+    Lines are fed one at a time. A network is complete (and returned) once the next network or the end of the output
+    is reached.
+    """
+
+    def __init__(self) -> None:
+        self._interface: str | None = None
+        self._network: NetshNetwork | None = None
+        self._bssid: NetshBssid | None = None
+
+    def feed(self, line: str) -> NetshNetwork | None:
+        """Parse one line
+
+        Args:
+            line (str): output line (without line ending)
+
+        Returns:
+            NetshNetwork | None: the previous network if this line completed it, otherwise None
+        """
+        if not (parsed := split_field(line)):
+            return None
+        key, value = parsed
+        if key.startswith("SSID "):
+            finished = self._network
+            self._network = NetshNetwork(interface=self._interface, ssid=value)
+            self._bssid = None
+            return finished
+        if key == "Interface name":
+            finished = self.close()
+            self._interface = value
+            return finished
+        if (network := self._network) is None:
+            return None
+        if key.startswith("BSSID "):
+            self._bssid = NetshBssid(bssid=value)
+            network.bssids.append(self._bssid)
+        elif (bssid := self._bssid) is not None:
+            if key == "Signal":
+                bssid.signal = _percent(value)
+            elif key == "Channel":
+                bssid.channel = _int(value)
+            elif key == "Radio type":
+                bssid.radio_type = value
+            elif key == "Band":
+                bssid.band = value
+        elif key == "Network type":
+            network.network_type = value
+        elif key == "Authentication":
+            network.authentication = value
+        elif key == "Encryption":
+            network.encryption = value
+        return None
+
+    def close(self) -> NetshNetwork | None:
+        """Finish parsing
+
+        Returns:
+            NetshNetwork | None: the last network if there is one
+        """
+        finished, self._network, self._bssid = self._network, None, None
+        return finished
+
+
+def parse_networks(lines: Iterable[str]) -> list[NetshNetwork]:
+    """Parse the output of "netsh wlan show networks [mode=bssid]"
+
+    Args:
+        lines (Iterable[str]): output lines (without line endings)
+
+    Returns:
+        list[NetshNetwork]: all networks (of all interfaces) in order of appearance
+    """
+    parser = NetshNetworksParser()
+    networks = [network for line in lines if (network := parser.feed(line))]
+    if last := parser.close():
+        networks.append(last)
+    return networks
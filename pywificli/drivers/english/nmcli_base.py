@@ -0,0 +1,123 @@
+"""Common implementation of the NetworkManager (nmcli) drivers
+
+All queries use terse, machine readable output (nmcli -t -f ...) so that nothing depends on column layout.
+"""
+
+from typing import AsyncGenerator, Literal
+
+from pywificli.domain.driver import ConnectionState, IWifiDriver, ScanResult, ScanState
+from pywificli.drivers.english.nmcli_parser import (
+    DEVICE_STATUS_FIELDS,
+    WIFI_LIST_FIELDS,
+    NmcliDevice,
+    parse_device_status,
+    parse_wifi_list_line,
+)
+from pywificli.drivers.watch import watch_with_monitor
+from pywificli.util import cmd, cmdOkOrRaise, cmdStream
+
+Rescan = Literal["auto", "yes", "no"]
+
+
+class NmcliDriverBase(IWifiDriver):
+    """Shared nmcli driver. Subclasses adapt the command syntax to their nmcli version.
+
+    Commands changing the connection or radio are privileged: when the user lacks the NetworkManager permissions, they
+    go through the privileged helper started by WifiDriverFactory.
+
+    Args:
+        rescan (Rescan): default for scans: "auto" lets NetworkManager decide whether its cached results are recent
+            enough, "yes" always triggers a fresh scan, and "no" only returns cached results. Defaults to "auto".
+    """
+
+    # Object name of devices ("device" vs "dev")
+    _device = "device"
+    # Keyword selecting an interface ("ifname" vs "iface")
+    _ifname = "ifname"
+    # Command prefix of the wifi radio switch
+    _radio = ["radio", "wifi"]
+    # Whether "device wifi list" supports --rescan
+    _supports_rescan = True
+    # Whether --ask is supported to read missing secrets from stdin
+    _supports_ask = True
+
+    def __init__(self, rescan: Rescan = "auto") -> None:
+        self.rescan: Rescan = rescan
+
+    async def _device_status(self) -> list[NmcliDevice]:
+        response = await cmdOkOrRaise(
+            ["nmcli", "-t", "-f", DEVICE_STATUS_FIELDS, self._device, "status"], read_only=True
+        )
+        return parse_device_status(response.stdout.splitlines())
+
+    async def get_available_interfaces(self) -> set[str]:
+        return {device.device for device in await self._device_status() if device.type == "wifi"}
+
+    async def is_enabled(self, interface: str) -> bool:
+        response = await cmdOkOrRaise(["nmcli", "-t", *self._radio], read_only=True)
+        return response.stdout.split()[-1:] == ["enabled"]
+
+    async def scan_stream(
+        self, interface: str, timeout: float, rescan: Rescan | None = None
+    ) -> AsyncGenerator[ScanResult, None]:
+        command = ["nmcli", "-t", "-f", WIFI_LIST_FIELDS, self._device, "wifi", "list", self._ifname, interface]
+        if self._supports_rescan:
+            command += ["--rescan", rescan or self.rescan]
+        async with cmdStream(command, timeout=timeout) as lines:
+            async for line in lines:
+                if result := parse_wifi_list_line(line):
+                    yield result
+
+    async def connect(self, interface: str, ssid: str, password: str, timeout: float) -> bool:
+        return await self.retry_policy.run(
+            lambda remaining: self._connect_attempt(interface, ssid, password, remaining), timeout
+        )
+
+    async def _connect_attempt(self, interface: str, ssid: str, password: str, timeout: float) -> bool:
+        # nmcli blocks until the connection is activated (or --wait expires)
+        command = ["nmcli", "--wait", str(max(1, round(timeout))), self._device, "wifi", "connect", ssid]
+        stdin = None
+        if self._supports_ask:
+            # nmcli reads the password from stdin (if the network needs one) so that it never shows up in ps
+            command.insert(1, "--ask")
+            stdin = f"{password}\n"
+        elif password:
+            command += ["password", password]
+        command += [self._ifname, interface]
+        response = await cmd(command, stdin=stdin, privileged=True, timeout=timeout, secrets=[password])
+        if not response.is_ok:
+            return False
+        return await self.get_connection_state(interface) == (ConnectionState.CONNECTED, ssid)
+
+    async def disconnect(self, interface: str) -> bool:
+        command = ["nmcli", self._device, "disconnect", *self._disconnect_target(interface)]
+        return (await cmd(command, privileged=True)).is_ok
+
+    def _disconnect_target(self, interface: str) -> list[str]:
+        return [interface]
+
+    async def get_connection_state(self, interface: str) -> tuple[ConnectionState, str]:
+        for device in await self._device_status():
+            if device.device == interface:
+                break
+        else:
+            raise RuntimeError(f"Interface {interface} does not exist")
+
+        # i.e. "connected", "connected (externally)", "connecting (configuring)", "disconnected", "unavailable"
+        if device.state.startswith("connected"):
+            return ConnectionState.CONNECTED, device.connection
+        if device.state.startswith("connecting"):
+            return ConnectionState.CONNECTING, device.connection
+        return ConnectionState.DISCONNECTED, ""
+
+    async def watch_connection_state(
+        self, interface: str, min_interval: float = 0.1, max_interval: float = 1.0
+    ) -> AsyncGenerator[tuple[ConnectionState, str], None]:
+        async for state in watch_with_monitor(self, interface, ["nmcli", self._device, "monitor", interface]):
+            yield state
+
+    async def get_scan_state(self, interface: str) -> ScanState:
+        raise NotImplementedError
+
+    async def enable(self, interface: str, enable: bool) -> bool:
+        return (await cmd(["nmcli", *self._radio, "on" if enable else "off"], privileged=True)).is_ok
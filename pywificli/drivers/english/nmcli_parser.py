@@ -0,0 +1,99 @@
+"""Parsers for terse (nmcli -t) output"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from pywificli.domain.scan import ScanResult
+
+# Fields requested for scans, in order. See parse_wifi_list_line.
+WIFI_LIST_FIELDS = "SSID,BSSID,CHAN,FREQ,SIGNAL,SECURITY"
+# Fields requested for device status, in order. See parse_device_status.
+DEVICE_STATUS_FIELDS = "DEVICE,TYPE,STATE,CONNECTION"
+
+
+def split_terse(line: str) -> list[str]:
+    """Split a line of terse nmcli output into its fields
+
+    In terse mode nmcli separates fields with ":" and escapes ":" and "\\" inside of values with a backslash.
+
+    Args:
+        line (str): line to split
+
+    Returns:
+        list[str]: unescaped fields
+    """
+    # Fast path: nothing is escaped
+    if "\\" not in line:
+        return line.split(":")
+    fields: list[str] = []
+    current: list[str] = []
+    chars = iter(line)
+    for char in chars:
+        if char == "\\":
+            current.append(next(chars, ""))
+        elif char == ":":
+            fields.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    fields.append("".join(current))
+    return fields
+
+
+@dataclass(slots=True)
+class NmcliDevice:
+    """A line of "nmcli -t -f DEVICE,TYPE,STATE,CONNECTION device status" """
+
+    device: str
+    type: str
+    state: str
+    connection: str
+
+
+def parse_device_status(lines: list[str]) -> list[NmcliDevice]:
+    """Parse the output of "nmcli -t -f DEVICE,TYPE,STATE,CONNECTION device status"
+
+    Args:
+        lines (list[str]): output lines (without line endings)
+
+    Returns:
+        list[NmcliDevice]: all devices
+    """
+    devices: list[NmcliDevice] = []
+    for line in lines:
+        fields = split_terse(line)
+        if len(fields) < 3:
+            continue
+        # Older versions do not report the connection
+        devices.append(NmcliDevice(fields[0], fields[1], fields[2], fields[3] if len(fields) > 3 else ""))
+    return devices
+
+
+def parse_wifi_list_line(line: str) -> ScanResult | None:
+    """Parse a line of "nmcli -t -f SSID,BSSID,CHAN,FREQ,SIGNAL,SECURITY device wifi list"
+
+    Args:
+        line (str): line to parse
+
+    Returns:
+        ScanResult | None: scan result or None if the line is not valid
+    """
+    fields = split_terse(line)
+    if len(fields) != 6:
+        return None
+    ssid, bssid, channel, frequency, signal, security = fields
+    try:
+        # SIGNAL is a 0-100 quality value. Convert it to an approximate dBm value.
+        rssi = int(signal) // 2 - 100
+    except ValueError:
+        return None
+    return ScanResult(
+        ssid=ssid,
+        rssi=rssi,
+        bssid=bssid or None,
+        channel=int(channel) if channel.isdigit() else None,
+        # i.e. "2437 MHz"
+        frequency=int(frequency.split()[0]) if frequency[:1].isdigit() else None,
+        security=security or None,
+    )
@@ -1,16 +1,24 @@
 """Windows driver for English System Language"""
 
-import asyncio
-import enum
+import contextlib
+import hashlib
 import html
 import logging
 import os
-import re
 import tempfile
+from typing import AsyncGenerator, Iterator
 
 from pywificli.domain.driver import ConnectionState, IWifiDriver, ScanResult, ScanState
 from pywificli.domain.metadata import DriverType, SystemLanguage
-from pywificli.util import cmdOkOrRaise
+from pywificli.domain.scan import channel_to_frequency
+from pywificli.drivers.english.netsh_parser import (
+    NetshInterface,
+    NetshNetwork,
+    NetshNetworksParser,
+    parse_interfaces,
+)
+from pywificli.exceptions import CommandProcessError
+from pywificli.util import NETSH_SCRIPT, cmd, cmdBatch, cmdOkOrRaise, cmdStream
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +54,10 @@ class EnglishLinuxWindows(IWifiDriver):
     </MacRandomization>
 </WLANProfile>"""
 
+    def __init__(self) -> None:
+        # SSID -> credential hash of the profiles installed by this driver
+        self._profiles: dict[str, str] = {}
+
     @property
     def _driver_type(self) -> DriverType:
         return DriverType.LINUX_NMCLI_LEGACY
@@ -54,151 +66,173 @@ class EnglishLinuxWindows(IWifiDriver):
     def _system_language(self) -> SystemLanguage:
         return SystemLanguage.ENGLISH
 
-    # TODO move parsing out of here
+    async def _show_interfaces(self) -> list[NetshInterface]:
+        response = await cmdOkOrRaise(["netsh", "wlan", "show", "interfaces"], read_only=True)
+        return parse_interfaces(response.stdout.splitlines())
+
     async def get_available_interfaces(self) -> set[str]:
         """Discover all available interfaces.
 
-        # We're parsing, for example, the following line to find "Wi-Fi":
-        # Name                   : Wi-Fi
-
         Returns:
-            list[str]: List of interfaces
+            set[str]: names of the interfaces
         """
-        response = await cmdOkOrRaise("netsh wlan show interfaces")
-        interfaces = set()
-
-        # Look behind to find field, then match (non-greedy) any chars until CRLF
-        match = "(?<={}).+?(?=\\r\\n)"
-        for interface in re.findall(match.format("Name"), response.stdout):
-            # Strip leading whitespace and then the first two chars of remaining (i.e. " :")
-            interfaces.add(interface.strip()[2:])
-
-        return interfaces
+        return {interface.name for interface in await self._show_interfaces()}
 
     # TODO is this global or per interface?
     async def is_enabled(self, interface: str) -> bool:
-        response = await cmdOkOrRaise("netsh wlan show interfaces")
+        response = await cmdOkOrRaise(["netsh", "wlan", "show", "interfaces"], read_only=True)
         # Is there at least one interfaces enabled?
         return "no wireless interface" not in response.stdout.lower()
 
-    async def scan(self, interface: str, timeout: float) -> list[ScanResult]:
-        response = await cmdOkOrRaise("netsh wlan show networks")
-        # TODO this won't work if there are >9 ssids
-        ssids = re.findall(r"(?<=^SSID\s(\d)\s:\s)(.*)$", response.stdout, flags=re.MULTILINE)
-        return [ScanResult(ssid, 0) for ssid in ssids]
+    async def scan_stream(self, interface: str, timeout: float) -> AsyncGenerator[ScanResult, None]:
+        parser = NetshNetworksParser()
+        command = ["netsh", "wlan", "show", "networks", f"interface={interface}", "mode=bssid"]
+        async with cmdStream(command, timeout=timeout) as lines:
+            async for line in lines:
+                if network := parser.feed(line):
+                    for result in self._to_scan_results(network):
+                        yield result
+        if network := parser.close():
+            for result in self._to_scan_results(network):
+                yield result
 
-    async def connect(self, interface: str, ssid: str, password: str, timeout: float) -> bool:
-        logger.info(f"Attempting to establish Wifi connection to {ssid}...")
-        # Replace xml tokens (&, <, >, etc.)
-        password = html.escape(password)
-        ssid = html.escape(ssid)
-        # Start fresh each time.
-        await self._clean(ssid)
+    @staticmethod
+    def _to_scan_results(network: NetshNetwork) -> list[ScanResult]:
+        """Build a scan result per BSSID of a network
 
-        # Create new profile
-        output = self._template.format(ssid=ssid, auth="WPA2PSK", encrypt="AES", passwd=password)
-        logger.debug(f"Using template {output}")
+        Args:
+            network (NetshNetwork): parsed network
 
-        # Need ugly low level mkstemp and os here because standard tempfile can't be accessed by a subprocess in Windows :(
-        fd, filename = tempfile.mkstemp()
-        os.write(fd, output.encode("utf-8"))
-        os.close(fd)
-        response = await cmdOkOrRaise(f"netsh wlan add profile filename={filename}")
-        if "is added on interface" not in response.stdout:
-            raise RuntimeError(response)
-        os.remove(filename)
+        Returns:
+            list[ScanResult]: scan results
+        """
+        return [
+            ScanResult(
+                ssid=network.ssid,
+                # Windows reports signal quality in percent which it linearly maps from [-100, -50] dBm
+                rssi=(bssid.signal or 0) // 2 - 100,
+                bssid=bssid.bssid,
+                channel=bssid.channel,
+                frequency=channel_to_frequency(bssid.channel, bssid.band) if bssid.channel else None,
+                security=network.authentication,
+            )
+            for bssid in network.bssids
+        ]
 
-        async def wait_for_connection_state(status: ConnectionState, ssid: str) -> None:
-            while (await self.get_connection_state(interface)) != (status, ssid):
-                await asyncio.sleep(1)
+    @staticmethod
+    def _credential_hash(auth: str, encrypt: str, password: str) -> str:
+        return hashlib.sha256(f"{auth}\0{encrypt}\0{password}".encode()).hexdigest()
 
-        # TODO should we configure attempts. Or move to above layer?
-        for _ in range(5):
-            # Try to connect
-            response = await cmdOkOrRaise(f'netsh wlan connect ssid="{ssid}" name="{ssid}" interface="{interface}"')
-            if "was completed successfully" not in response.stdout:
-                raise RuntimeError(response)
+    @contextlib.contextmanager
+    def _profile_file(self, ssid: str, password: str) -> Iterator[str]:
+        """Write a profile connecting to SSID with a password for netsh to add
 
-            wait_for_ssid_connected = asyncio.create_task(
-                coro=wait_for_connection_state(ConnectionState.CONNECTED, ssid), name="wait_for_ssid_connected"
-            )
-            wait_for_timeout = asyncio.create_task(coro=asyncio.sleep(timeout), name="wait_for_timeout")
-            finished, _ = await asyncio.wait(
-                [wait_for_ssid_connected, wait_for_timeout],
-                return_when=asyncio.FIRST_COMPLETED,
-            )
-            if ["wait_for_ssid_connected" in task.get_name() for task in finished]:
-                return True
-        return False
+        Args:
+            ssid (str): SSID (also used as the profile name)
+            password (str): password of SSID
+
+        Yields:
+            str: path of the profile, which is removed again when the context exits
+        """
+        # Create new profile. Replace xml tokens (&, <, >, etc.)
+        output = self._template.format(
+            ssid=html.escape(ssid), auth="WPA2PSK", encrypt="AES", passwd=html.escape(password)
+        )
+
+        # Need ugly low level mkstemp and os here because standard tempfile can't be accessed by a subprocess in Windows :(
+        fd, filename = tempfile.mkstemp()
+        try:
+            os.write(fd, output.encode("utf-8"))
+            os.close(fd)
+            yield filename
+        finally:
+            os.remove(filename)
+
+    async def connect(self, interface: str, ssid: str, password: str, timeout: float) -> bool:
+        logger.info("Attempting to establish Wifi connection to %s...", ssid)
+        credentials = self._credential_hash("WPA2PSK", "AES", password)
+        installed = self._profiles.get(ssid)
+        if installed in (None, credentials) and (
+            await self.get_connection_state(interface) == (ConnectionState.CONNECTED, ssid)
+        ):
+            logger.info("Already connected to %s", ssid)
+            return True
+
+        return await self.retry_policy.run(
+            lambda remaining: self._connect_attempt(interface, ssid, password, credentials, remaining), timeout
+        )
+
+    async def _connect_attempt(
+        self, interface: str, ssid: str, password: str, credentials: str, timeout: float
+    ) -> bool:
+        connect = ["netsh", "wlan", "connect", f"ssid={ssid}", f"name={ssid}", f"interface={interface}"]
+        # Reuse the profile if it was installed with the same credentials
+        if self._profiles.get(ssid) == credentials:
+            response = await cmd(connect, timeout=timeout)
+        else:
+            # Replace the profile and connect in a single netsh script
+            self._profiles.pop(ssid, None)
+            with self._profile_file(ssid, password) as filename:
+                disconnected, _, added, response = await cmdBatch(
+                    NETSH_SCRIPT,
+                    [
+                        # Start fresh. Deleting fails if there is no such profile yet, which is fine
+                        ["netsh", "wlan", "disconnect", f"interface={interface}"],
+                        ["netsh", "wlan", "delete", "profile", f"name={ssid}"],
+                        ["netsh", "wlan", "add", "profile", f"filename={filename}"],
+                        connect,
+                    ],
+                    timeout,
+                )
+            if not disconnected.is_ok:
+                raise CommandProcessError(
+                    "netsh wlan disconnect", f"exited with return code {disconnected.return_code}"
+                )
+            if "is added on interface" not in (added.stdout or ""):
+                raise RuntimeError(added)
+            self._profiles[ssid] = credentials
+
+        if "was completed successfully" not in (response.stdout or ""):
+            # i.e. the profile was removed behind our back: reinstall it on the next attempt
+            self._profiles.pop(ssid, None)
+            raise RuntimeError(response)
+        return await self.wait_for_connection_state(interface, ConnectionState.CONNECTED, ssid, timeout)
 
     async def disconnect(self, interface: str) -> bool:
-        response = await cmdOkOrRaise(f'netsh wlan disconnect interface="{interface}"')
+        response = await cmdOkOrRaise(["netsh", "wlan", "disconnect", f"interface={interface}"])
         return bool("completed successfully" in response.stdout.lower())
 
-    # TODO move the parsing out of here
     async def get_connection_state(self, interface: str) -> tuple[ConnectionState, str]:
         """Get the current network SSID and state.
 
-        # Here is an example of what we are parsing (i.e. to find FunHouse SSID):
-        # Name                   : Wi-Fi
-        # Description            : TP-Link Wireless USB Adapter
-        # GUID                   : 093d8022-33cb-4400-8362-275eaf24cb86
-        # Physical address       : 98:48:27:88:cb:18
-        # State                  : connected
-        # SSID                   : FunHouse
+        Args:
+            interface (str): interface to query
+
+        Raises:
+            RuntimeError: interface does not exist
 
         Returns:
-            tuple[Optional[str], SsidState]: Tuple of (ssid, network_state)
+            tuple[ConnectionState, str]: Tuple of (network_state, ssid)
         """
+        for found in await self._show_interfaces():
+            if found.name == interface:
+                break
+        else:
+            raise RuntimeError(f"Interface {interface} does not exist")
 
-        class ParseState(enum.Enum):
-            """Current state of interface parsing"""
-
-            PARSE_INTERFACE = enum.auto()
-            PARSE_SSID = enum.auto()
-            PARSE_STATE = enum.auto()
-
-        response = await cmdOkOrRaise("netsh wlan show interfaces")
-        parse_state = ParseState.PARSE_INTERFACE
-        ssid: str | None = None
-        network_state: str | None = None
-        for field in response.stdout.split("\r\n"):
-            if parse_state is ParseState.PARSE_INTERFACE:
-                if "Name" in field and interface in field:
-                    parse_state = ParseState.PARSE_STATE
-            elif parse_state is ParseState.PARSE_STATE:
-                if "State" in field:
-                    network_state = field.split(":")[1].strip().lower()
-                    parse_state = ParseState.PARSE_SSID
-            elif parse_state is ParseState.PARSE_SSID:
-                if "SSID" in field:
-                    ssid = field.split(":")[1].strip()
-                    break
-
+        network_state = (found.state or "").lower()
         if network_state == "connected":
             state = ConnectionState.CONNECTED
         elif network_state == "disconnected":
             state = ConnectionState.DISCONNECTED
         else:
             state = ConnectionState.CONNECTING
-        assert ssid
-        return (state, ssid)
+        return (state, found.ssid or "")
 
     async def get_scan_state(self, interface: str) -> ScanState:
         raise NotImplementedError
 
     async def enable(self, interface: str, enable: bool) -> bool:
         arg = "enable" if enable else "disable"
-        response = await cmdOkOrRaise(f'netsh interface set interface "{interface}" "{arg}"')
+        response = await cmdOkOrRaise(["netsh", "interface", "set", "interface", interface, arg])
         return "not exist" not in response.stdout
-
-    @staticmethod
-    async def _clean(ssid: str | None) -> None:
-        """Disconnect and delete SSID profile.
-
-        Args:
-            ssid (str | None): name of SSID
-        """
-        await cmdOkOrRaise("netsh wlan disconnect")
-        if ssid:
-            await cmdOkOrRaise(f'netsh wlan delete profile name="{ssid}"')
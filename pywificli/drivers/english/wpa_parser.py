@@ -0,0 +1,120 @@
+"""Parsers for wpa_supplicant control interface replies"""
+
+from pywificli.domain.scan import ScanResult, frequency_to_channel
+
+# Escapes produced by wpa_supplicant's printf_encode (besides \xNN)
+_ESCAPES = {"\\": 0x5C, '"': 0x22, "e": 0x1B, "n": 0x0A, "r": 0x0D, "t": 0x09}
+
+
+def unescape(value: str) -> str:
+    """Decode a value (i.e. an SSID) escaped by wpa_supplicant
+
+    Non printable bytes are reported as \\xNN and a few characters as C-style escapes.
+
+    Args:
+        value (str): escaped value
+
+    Returns:
+        str: decoded value (invalid UTF-8 is replaced)
+    """
+    if "\\" not in value:
+        return value
+    raw = bytearray()
+    i = 0
+    while i < len(value):
+        char = value[i]
+        if char == "\\" and i + 1 < len(value):
+            escaped = value[i + 1]
+            if escaped == "x" and _is_hex(value[i + 2 : i + 4]):
+                raw.append(int(value[i + 2 : i + 4], 16))
+                i += 4
+                continue
+            if escaped in _ESCAPES:
+                raw.append(_ESCAPES[escaped])
+                i += 2
+                continue
+        raw += char.encode()
+        i += 1
+    return raw.decode(errors="replace")
+
+
+def _is_hex(value: str) -> bool:
+    return len(value) == 2 and all(char in "0123456789abcdefABCDEF" for char in value)
+
+
+def parse_status(reply: str) -> dict[str, str]:
+    """Parse the reply to "STATUS"
+
+    Args:
+        reply (str): key=value lines
+
+    Returns:
+        dict[str, str]: raw (still escaped) values by key
+    """
+    status: dict[str, str] = {}
+    for line in reply.splitlines():
+        key, sep, value = line.partition("=")
+        if sep:
+            status[key] = value
+    return status
+
+
+def parse_list_networks(reply: str) -> dict[str, str]:
+    """Parse the reply to "LIST_NETWORKS"
+
+    Lines are tab separated: network id, ssid, bssid, flags. The first line is a header.
+
+    Args:
+        reply (str): reply to parse
+
+    Returns:
+        dict[str, str]: decoded SSID by network id
+    """
+    networks: dict[str, str] = {}
+    for line in reply.splitlines()[1:]:
+        fields = line.split("\t")
+        if len(fields) >= 2 and fields[0].isdigit():
+            networks[fields[0]] = unescape(fields[1])
+    return networks
+
+
+def security_from_flags(flags: str) -> str | None:
+    """Summarize the flags of a scan result (i.e. "[WPA2-PSK-CCMP][WPS][ESS]")
+
+    Args:
+        flags (str): bracketed flags
+
+    Returns:
+        str | None: authentication flags (i.e. "WPA2-PSK-CCMP") or None for open networks
+    """
+    security = [flag for flag in flags.strip("[]").split("][") if flag.startswith(("WPA", "RSN", "WEP", "OWE", "SAE"))]
+    return " ".join(security) or None
+
+
+def parse_scan_results_line(line: str) -> ScanResult | None:
+    """Parse a line of the reply to "SCAN_RESULTS"
+
+    Lines are tab separated: bssid, frequency, signal level, flags, ssid.
+
+    Args:
+        line (str): line to parse
+
+    Returns:
+        ScanResult | None: scan result or None if the line is not valid (i.e. the header)
+    """
+    fields = line.split("\t", 4)
+    if len(fields) != 5:
+        return None
+    bssid, frequency, signal, flags, ssid = fields
+    try:
+        frequency_mhz, rssi = int(frequency), int(signal)
+    except ValueError:
+        return None
+    return ScanResult(
+        ssid=unescape(ssid),
+        rssi=rssi,
+        bssid=bssid or None,
+        channel=frequency_to_channel(frequency_mhz),
+        frequency=frequency_mhz,
+        security=security_from_flags(flags),
+    )
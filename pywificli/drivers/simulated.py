@@ -0,0 +1,241 @@
+"""In-process simulated Wifi driver for load testing
+
+Emulates any number of interfaces and access points without spawning anything, with configurable latencies,
+failure rates and signal drift.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import AsyncGenerator
+
+from pywificli.domain.driver import ConnectionState, IWifiDriver, ScanResult, ScanState
+from pywificli.domain.metadata import DriverType, SystemLanguage
+from pywificli.domain.scan import channel_to_frequency
+from pywificli.exceptions import CommandTimeoutError
+
+# Signal strength bounds of simulated access points (in dBm)
+_MIN_RSSI = -100
+_MAX_RSSI = -20
+# Channels access points are spread over (2.4 and 5 GHz)
+_CHANNELS = (1, 6, 11, 36, 40, 44, 48, 149, 153, 157, 161)
+
+
+class SimulatedFailure(RuntimeError):
+    """An operation failed because of the simulation's configured failure rate"""
+
+
+@dataclass(frozen=True)
+class Latency:
+    """Normally distributed latency, clipped at 0
+
+    Attributes:
+        mean (float): average latency (in seconds). Defaults to 0.
+        stddev (float): standard deviation (in seconds). Defaults to 0.
+    """
+
+    mean: float = 0.0
+    stddev: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw a latency
+
+        Args:
+            rng (random.Random): random number generator to draw from
+
+        Returns:
+            float: latency (in seconds)
+        """
+        if not self.stddev:
+            return max(0.0, self.mean)
+        return max(0.0, rng.gauss(self.mean, self.stddev))
+
+
+@dataclass
+class SimulationConfig:
+    """What the simulated driver emulates
+
+    Attributes:
+        interfaces (int): amount of interfaces (named wlan0, wlan1, ...). Defaults to 1.
+        networks (int): amount of SSIDs in range (named SimNet0, SimNet1, ...). Defaults to 20.
+        bssids_per_network (int): access points per SSID. Defaults to 1.
+        passwords (dict[str, str]): password of each SSID that requires one. Other SSIDs are open. Defaults to none.
+        scan_latency (Latency): how long a scan takes. A scan taking longer than its timeout raises
+            CommandTimeoutError at the timeout. Defaults to Latency() (instantaneous).
+        connect_latency (Latency): how long a connection attempt takes. Defaults to Latency() (instantaneous).
+        scan_failure_rate (float): probability that a scan raises SimulatedFailure. Defaults to 0.
+        connect_failure_rate (float): probability that a connection attempt fails. Defaults to 0.
+        rssi_drift (float): standard deviation of the random walk of each access point's signal per scan (in dBm).
+            Defaults to 0.
+        seed (int | None): seed making the simulation reproducible. Defaults to None.
+    """
+
+    interfaces: int = 1
+    networks: int = 20
+    bssids_per_network: int = 1
+    passwords: dict[str, str] = field(default_factory=dict)
+    scan_latency: Latency = Latency()
+    connect_latency: Latency = Latency()
+    scan_failure_rate: float = 0.0
+    connect_failure_rate: float = 0.0
+    rssi_drift: float = 0.0
+    seed: int | None = None
+
+    def __post_init__(self) -> None:
+        if not 0 <= self.scan_failure_rate <= 1 or not 0 <= self.connect_failure_rate <= 1:
+            raise ValueError("Failure rates must be between 0 and 1")
+
+
+@dataclass(slots=True)
+class _AccessPoint:
+    ssid: str
+    bssid: str
+    channel: int
+    rssi: float
+
+
+@dataclass
+class _InterfaceSimulation:
+    enabled: bool = True
+    scans: int = 0
+    """Amount of scans currently running"""
+    state: ConnectionState = ConnectionState.DISCONNECTED
+    ssid: str = ""
+
+
+class SimulatedWifiDriver(IWifiDriver):
+    """Emulate interfaces and access points in-process
+
+    All interfaces see the same access points. Each scan moves every access point's signal by a random step
+    (see SimulationConfig.rssi_drift) before reporting it.
+
+    Args:
+        config (SimulationConfig | None): what to emulate. Defaults to None (SimulationConfig()).
+    """
+
+    def __init__(self, config: SimulationConfig | None = None) -> None:
+        self.config = config or SimulationConfig()
+        self._rng = random.Random(self.config.seed)
+        self._interfaces = {f"wlan{n}": _InterfaceSimulation() for n in range(self.config.interfaces)}
+        self._access_points = [
+            _AccessPoint(
+                ssid=f"SimNet{n}",
+                bssid=f"02:00:{n >> 16 & 0xFF:02x}:{n >> 8 & 0xFF:02x}:{n & 0xFF:02x}:{b:02x}",
+                channel=_CHANNELS[(n + b) % len(_CHANNELS)],
+                rssi=float(self._rng.randint(-90, -30)),
+            )
+            for n in range(self.config.networks)
+            for b in range(self.config.bssids_per_network)
+        ]
+        self._ssids = {access_point.ssid for access_point in self._access_points}
+        self.operations: Counter[str] = Counter()
+        """How often each operation (i.e. "scan") was performed, to verify caching and coalescing"""
+
+    @property
+    def _driver_type(self) -> DriverType:
+        return DriverType.SIMULATED
+
+    @property
+    def _system_language(self) -> SystemLanguage:
+        return SystemLanguage.ENGLISH
+
+    def _interface(self, interface: str) -> _InterfaceSimulation:
+        if not (simulation := self._interfaces.get(interface)):
+            raise RuntimeError(f"Interface {interface} does not exist")
+        return simulation
+
+    def _fails(self, rate: float) -> bool:
+        return rate > 0 and self._rng.random() < rate
+
+    def _drift(self) -> None:
+        if not (drift := self.config.rssi_drift):
+            return
+        for access_point in self._access_points:
+            access_point.rssi = min(_MAX_RSSI, max(_MIN_RSSI, access_point.rssi + self._rng.gauss(0, drift)))
+
+    async def get_available_interfaces(self) -> set[str]:
+        return set(self._interfaces)
+
+    async def is_enabled(self, interface: str) -> bool:
+        return self._interface(interface).enabled
+
+    async def scan_stream(self, interface: str, timeout: float) -> AsyncGenerator[ScanResult, None]:
+        simulation = self._interface(interface)
+        if not simulation.enabled:
+            raise RuntimeError(f"Interface {interface} is disabled")
+        self.operations["scan"] += 1
+        simulation.scans += 1
+        try:
+            if (latency := self.config.scan_latency.sample(self._rng)) > timeout:
+                # Like a real tool that is killed at the deadline
+                await asyncio.sleep(timeout)
+                raise CommandTimeoutError(f"simulated scan on {interface}", timeout)
+            await asyncio.sleep(latency)
+            if self._fails(self.config.scan_failure_rate):
+                raise SimulatedFailure(f"Scan on {interface} failed")
+            self._drift()
+        finally:
+            simulation.scans -= 1
+        # Snapshot the signals so that a concurrent scan's drift does not leak into this one
+        results = [
+            ScanResult(
+                ssid=access_point.ssid,
+                rssi=round(access_point.rssi),
+                bssid=access_point.bssid,
+                channel=access_point.channel,
+                frequency=channel_to_frequency(access_point.channel),
+                security="WPA2-Personal" if access_point.ssid in self.config.passwords else "Open",
+            )
+            for access_point in self._access_points
+        ]
+        for result in results:
+            yield result
+
+    async def connect(self, interface: str, ssid: str, password: str, timeout: float) -> bool:
+        return await self.retry_policy.run(
+            lambda remaining: self._connect_attempt(interface, ssid, password, remaining), timeout
+        )
+
+    async def _connect_attempt(self, interface: str, ssid: str, password: str, timeout: float) -> bool:
+        simulation = self._interface(interface)
+        self.operations["connect"] += 1
+        simulation.state, simulation.ssid = ConnectionState.CONNECTING, ssid
+        connected = False
+        try:
+            await asyncio.sleep(self.config.connect_latency.sample(self._rng))
+            connected = (
+                simulation.enabled
+                and ssid in self._ssids
+                and self.config.passwords.get(ssid, "") in ("", password)
+                and not self._fails(self.config.connect_failure_rate)
+            )
+        finally:
+            # Also reached when the attempt is cancelled for exceeding the deadline
+            if connected:
+                simulation.state = ConnectionState.CONNECTED
+            else:
+                simulation.state, simulation.ssid = ConnectionState.DISCONNECTED, ""
+        return connected
+
+    async def disconnect(self, interface: str) -> bool:
+        simulation = self._interface(interface)
+        self.operations["disconnect"] += 1
+        simulation.state, simulation.ssid = ConnectionState.DISCONNECTED, ""
+        return True
+
+    async def get_connection_state(self, interface: str) -> tuple[ConnectionState, str]:
+        simulation = self._interface(interface)
+        return simulation.state, simulation.ssid
+
+    async def get_scan_state(self, interface: str) -> ScanState:
+        return ScanState.SCANNING if self._interface(interface).scans else ScanState.IDLE
+
+    async def enable(self, interface: str, enable: bool) -> bool:
+        simulation = self._interface(interface)
+        simulation.enabled = enable
+        if not enable:
+            simulation.state, simulation.ssid = ConnectionState.DISCONNECTED, ""
+        return True
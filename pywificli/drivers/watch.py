@@ -0,0 +1,70 @@
+"""Event driven connection state watching backed by long-lived monitor commands"""
+
+import contextlib
+import logging
+from typing import AsyncGenerator, Callable, Sequence
+
+from pywificli.domain.driver import ConnectionState, IWifiDriver
+from pywificli.exceptions import CommandProcessError
+from pywificli.util import cmdStream, get_executor
+from pywificli.util.executor import binary_name
+
+logger = logging.getLogger(__name__)
+
+
+async def watch_with_monitor(
+    driver: IWifiDriver,
+    interface: str,
+    monitor: Sequence[str],
+    is_event: Callable[[str], bool] | None = None,
+) -> AsyncGenerator[tuple[ConnectionState, str], None]:
+    """Watch the connection state of an interface, re-querying it only when a monitor command reports an event
+
+    The monitor (i.e. "nmcli device monitor wlan0") is started before the initial query so that no event can be
+    missed. Cached results of the monitor's binary are dropped on each event so that the re-query sees the new state.
+    If the monitor can not be started, fails, or exits, this falls back to the driver's adaptive polling. Errors of the
+    queries themselves are raised.
+
+    Args:
+        driver (IWifiDriver): driver used to query the connection state
+        interface (str): interface to watch
+        monitor (Sequence[str]): long-lived command that prints a line per event
+        is_event (Callable[[str], bool] | None): filter for monitor lines that warrant a re-query. Defaults to None
+            (lines mentioning the interface).
+
+    Yields:
+        tuple[ConnectionState, str]: (ConnectionState, ssid), initially and then on each change
+    """
+    is_event = is_event or (lambda line: interface in line)
+    executor = get_executor()
+    state: tuple[ConnectionState, str] | None = None
+    async with contextlib.AsyncExitStack() as stack:
+        try:
+            lines = await stack.enter_async_context(cmdStream(monitor, long_lived=True))
+        except CommandProcessError as e:
+            logger.warning("Monitor %s is not available (%s). Falling back to polling.", monitor, e)
+        else:
+            state = await driver.get_connection_state(interface)
+            yield state
+            while True:
+                try:
+                    line = await anext(lines)
+                except StopAsyncIteration:
+                    logger.warning("Monitor %s exited. Falling back to polling.", monitor)
+                    break
+                except CommandProcessError as e:
+                    logger.warning("Monitor %s failed (%s). Falling back to polling.", monitor, e)
+                    break
+                if not is_event(line):
+                    continue
+                # The event makes any cached (or in-flight) query of the tool outdated, i.e. the read-only device
+                # status of nmcli, which would otherwise hide a second event within the cache TTL
+                executor.invalidate(binary_name(monitor))
+                if (new_state := await driver.get_connection_state(interface)) != state:
+                    state = new_state
+                    yield state
+
+    async for new_state in IWifiDriver.watch_connection_state(driver, interface):
+        if new_state != state:
+            state = new_state
+            yield state
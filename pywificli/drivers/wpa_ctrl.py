@@ -0,0 +1,222 @@
+"""Client for wpa_supplicant's control interface (the protocol spoken by wpa_cli)
+
+wpa_supplicant exposes a UNIX datagram socket per interface (i.e. /var/run/wpa_supplicant/wlan0). A client binds a
+socket of its own, sends one command per datagram and receives the reply as a single datagram. Once a client sends
+"ATTACH", it additionally receives unsolicited events prefixed with their priority (i.e. "<3>CTRL-EVENT-CONNECTED").
+"""
+
+import asyncio
+import contextlib
+import itertools
+import logging
+import os
+import socket
+import tempfile
+from typing import Iterator, cast
+
+from pywificli.exceptions import WpaCtrlError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CTRL_DIR = "/var/run/wpa_supplicant"
+
+# Makes local socket names unique within the process (as wpa_ctrl.c does)
+_counter = itertools.count()
+
+EventQueue = asyncio.Queue[str | None]
+"""Events of an attached socket, without their priority prefix. None signals that the socket was closed."""
+
+
+def _split_event(message: str) -> str | None:
+    """Get the event of an unsolicited message, or None if the message is a reply"""
+    if message.startswith("<") and (end := message.find(">")) > 1 and message[1:end].isdigit():
+        return message[end + 1 :]
+    return None
+
+
+class WpaCtrl(asyncio.DatagramProtocol):
+    """A connection to one wpa_supplicant control socket
+
+    The protocol has no request identifiers so requests are serialized and each reply answers the pending request.
+    Events received once attached are fanned out to every subscriber.
+
+    Args:
+        path (str | os.PathLike): control socket of the interface
+        timeout (float): how long to wait for a reply (in seconds). Defaults to 10.0 (as wpa_cli).
+    """
+
+    def __init__(self, path: str | os.PathLike, timeout: float = 10.0) -> None:
+        self.path = os.fspath(path)
+        self.timeout = timeout
+        self.attached = False
+        self._local: str | None = None
+        self._transport: asyncio.DatagramTransport | None = None
+        self._lock = asyncio.Lock()
+        self._reply: asyncio.Future[str] | None = None
+        self._subscribers: set[EventQueue] = set()
+
+    @property
+    def connected(self) -> bool:
+        """Is the socket currently open?
+
+        Returns:
+            bool: True if open, False otherwise
+        """
+        return self._transport is not None
+
+    async def open(self) -> None:
+        """Bind a local socket and connect it to the control socket
+
+        Raises:
+            WpaCtrlError: the control socket does not exist or is not accessible
+        """
+        self._local = os.path.join(tempfile.gettempdir(), f"pywificli_wpa_{os.getpid()}-{next(_counter)}")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self._local)
+            sock.bind(self._local)
+            sock.connect(self.path)
+            sock.setblocking(False)
+        except PermissionError as e:
+            sock.close()
+            self._unlink()
+            raise WpaCtrlError(
+                self.path, f"Unable to connect: {e} (run as root or as a member of the ctrl_interface GROUP)"
+            ) from e
+        except OSError as e:
+            sock.close()
+            self._unlink()
+            raise WpaCtrlError(self.path, f"Unable to connect: {e}") from e
+        await asyncio.get_running_loop().create_datagram_endpoint(lambda: self, sock=sock)
+
+    def close(self) -> None:
+        """Close the socket (detaching first if needed)"""
+        if self._transport:
+            if self.attached:
+                # Best effort: wpa_supplicant also drops attached clients whose socket has gone away
+                self._transport.sendto(b"DETACH")
+            self._transport.close()
+
+    async def __aenter__(self) -> "WpaCtrl":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        self.close()
+
+    def _unlink(self) -> None:
+        if self._local:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self._local)
+            self._local = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        # Not an asyncio.DatagramTransport subclass before Python 3.12
+        self._transport = cast(asyncio.DatagramTransport, transport)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._transport = None
+        self.attached = False
+        self._unlink()
+        if self._reply and not self._reply.done():
+            self._reply.set_exception(WpaCtrlError(self.path, f"Connection lost: {exc}"))
+        for queue in self._subscribers:
+            queue.put_nowait(None)
+
+    def error_received(self, exc: Exception) -> None:
+        if self._reply and not self._reply.done():
+            self._reply.set_exception(WpaCtrlError(self.path, str(exc)))
+
+    def datagram_received(self, data: bytes, addr: object) -> None:
+        message = data.decode(errors="replace")
+        if (event := _split_event(message)) is not None:
+            for queue in self._subscribers:
+                queue.put_nowait(event)
+        elif self._reply and not self._reply.done():
+            self._reply.set_result(message)
+        else:
+            logger.debug("Dropping unexpected reply on %s: %r", self.path, message)
+
+    async def request(self, command: str) -> str:
+        """Send a command and wait for its reply
+
+        Args:
+            command (str): command (i.e. "STATUS")
+
+        Raises:
+            WpaCtrlError: not connected, or no reply was received in time
+
+        Returns:
+            str: raw reply
+        """
+        # Only the command name is used in errors and logs since arguments may contain credentials
+        name = command.split(" ", 1)[0]
+        async with self._lock:
+            if not self._transport:
+                raise WpaCtrlError(self.path, f"Not connected (sending {name})")
+            self._reply = asyncio.get_running_loop().create_future()
+            self._transport.sendto(command.encode())
+            try:
+                return await asyncio.wait_for(self._reply, self.timeout)
+            except asyncio.TimeoutError as e:
+                raise WpaCtrlError(self.path, f"No reply to {name} after {self.timeout} seconds") from e
+            finally:
+                self._reply = None
+
+    async def request_ok(self, command: str) -> None:
+        """Send a command that replies "OK" on success
+
+        Args:
+            command (str): command (i.e. "DISCONNECT")
+
+        Raises:
+            WpaCtrlError: the command failed
+        """
+        if (reply := (await self.request(command)).strip()) != "OK":
+            raise WpaCtrlError(self.path, f"{command.split(' ', 1)[0]} failed: {reply}")
+
+    async def attach(self) -> None:
+        """Register for events"""
+        await self.request_ok("ATTACH")
+        self.attached = True
+
+    @contextlib.contextmanager
+    def subscribe(self) -> Iterator[EventQueue]:
+        """Receive the events of an attached socket while the context is active
+
+        Subscribe before sending the command whose outcome is awaited so that no event can be missed.
+
+        Yields:
+            EventQueue: queue receiving the events
+        """
+        queue: EventQueue = asyncio.Queue()
+        self._subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+
+
+async def wait_for_event(queue: EventQueue, prefixes: tuple[str, ...], timeout: float) -> str | None:
+    """Wait for the first event starting with one of the given prefixes
+
+    Args:
+        queue (EventQueue): subscription to wait on
+        prefixes (tuple[str, ...]): event names (i.e. ("CTRL-EVENT-SCAN-RESULTS",))
+        timeout (float): how long to wait (in seconds)
+
+    Returns:
+        str | None: matching event or None on timeout or if the socket was closed
+    """
+
+    async def next_event() -> str | None:
+        while (event := await queue.get()) is not None:
+            if event.startswith(prefixes):
+                return event
+        return None
+
+    try:
+        return await asyncio.wait_for(next_event(), timeout)
+    except asyncio.TimeoutError:
+        return None
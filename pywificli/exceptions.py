@@ -8,8 +8,30 @@ class CommandProcessError(Exception):
         super().__init__(f"Error when sending command [{command}] ==> {message}")
 
 
+class CommandTimeoutError(CommandProcessError):
+    """A command did not complete before its deadline and was killed"""
+
+    def __init__(self, command: str, timeout: float) -> None:
+        super().__init__(command, f"timed out after {timeout} seconds")
+        self.timeout = timeout
+
+
 class UnsupportedSystemConfiguration(Exception):
     """Could not find a suitable Wifi Driver"""
 
     def __init__(self, message: str) -> None:
         super().__init__(f"Error when detecting Wifi Driver: {message}")
+
+
+class WpaCtrlError(Exception):
+    """Exceptions related to the wpa_supplicant control interface"""
+
+    def __init__(self, path: str, message: str) -> None:
+        super().__init__(f"Error on wpa_supplicant control socket [{path}] ==> {message}")
+
+
+class PrivilegedHelperError(Exception):
+    """Exceptions related to the privileged helper process"""
+
+    def __init__(self, message: str) -> None:
+        super().__init__(f"Error in privileged helper ==> {message}")
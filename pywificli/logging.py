@@ -1,13 +1,53 @@
-"""Common logging setup"""
+"""Common logging setup
+
+Records are handed to a background thread through a queue, so that writing to disk or the terminal never blocks the
+event loop. Loggers are only as verbose as the most verbose handler so that filtered records are never created.
+"""
 
 from __future__ import annotations
 
+import atexit
+import copy
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Any
 
-from rich import traceback
-from rich.logging import RichHandler
+MAX_LOGGED_OUTPUT = 4000
+"""Longest command output (in characters) that is logged in full"""
+
+
+def truncate(text: str, limit: int = MAX_LOGGED_OUTPUT) -> str:
+    """Shorten text for logging by keeping only its beginning and end
+
+    Args:
+        text (str): text to shorten
+        limit (int): maximum amount of characters to keep. Defaults to MAX_LOGGED_OUTPUT.
+
+    Returns:
+        str: text itself if short enough, otherwise its head and tail around an omission marker
+    """
+    if len(text) <= limit:
+        return text
+    head = limit // 2
+    tail = limit - head
+    return f"{text[:head]}\n... [{len(text) - limit} characters omitted] ...\n{text[-tail:]}"
+
+
+class _LocalQueueHandler(QueueHandler):
+    """Queue records for a listener in the same process
+
+    Unlike QueueHandler, the exception info is kept (and formatting left to the target handlers) since the record is
+    never pickled. This keeps rich tracebacks working.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # Merge the arguments now since they might change before the listener gets to the record
+        record.msg = record.getMessage()
+        record.args = None
+        return record
 
 
 class Logger:
@@ -17,6 +57,7 @@ class Logger:
         logger (logging.Logger): input logger that will be modified and then returned
         output (Path | None): Path of log file for file stream handler. If not set, will not log to file.
         modules (list[str] | None): Optional override of modules / levels. Will be merged into default modules.
+        console (bool): Log to the console (with rich formatting and tracebacks). Defaults to True.
     """
 
     _instances: dict[type[Logger], Logger] = {}
@@ -33,6 +74,7 @@ class Logger:
         logger: logging.Logger,
         output: Path | None = None,
         modules: list[str] | None = None,
+        console: bool = True,
     ) -> None:
         # TODO automatically discover somehow?
         self.modules = [
@@ -43,7 +85,14 @@ class Logger:
         self.modules = modules or self.modules
         self.handlers: list[logging.Handler] = []
 
-        logger.setLevel(logging.DEBUG)
+        # Handlers run on the listener's thread, filtering by their own level
+        log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        self.queue_handler = _LocalQueueHandler(log_queue)
+        self.listener = QueueListener(log_queue, respect_handler_level=True)
+        self.listener.start()
+        self._listening = True
+        atexit.register(self.stop)
+
         self.file_handler: logging.Handler | None
         if output:
             # Logging to file with millisecond timing
@@ -55,19 +104,26 @@ class Logger:
             self.file_handler.setFormatter(file_formatter)
             # Set to TRACE for concurrency debugging
             self.file_handler.setLevel(logging.DEBUG)
-            logger.addHandler(self.file_handler)
             self.addLoggingHandler(self.file_handler)
         else:
             self.file_handler = None
 
-        # Use Rich for colorful console logging
-        self.stream_handler = RichHandler(rich_tracebacks=True, enable_link_path=True, show_time=False)
-        stream_formatter = logging.Formatter("%(asctime)s.%(msecs)03d %(message)s", datefmt="%H:%M:%S")
-        self.stream_handler.setFormatter(stream_formatter)
-        self.stream_handler.setLevel(logging.INFO)
-        logger.addHandler(self.stream_handler)
-        self.addLoggingHandler(self.stream_handler)
-        traceback.install()  # Enable exception tracebacks in rich logger
+        self.stream_handler: logging.Handler | None
+        if console:
+            # Rich is only imported when console logging is actually used since it is slow to import
+            # pylint: disable=import-outside-toplevel
+            from rich import traceback
+            from rich.logging import RichHandler
+
+            # Use Rich for colorful console logging
+            self.stream_handler = RichHandler(rich_tracebacks=True, enable_link_path=True, show_time=False)
+            stream_formatter = logging.Formatter("%(asctime)s.%(msecs)03d %(message)s", datefmt="%H:%M:%S")
+            self.stream_handler.setFormatter(stream_formatter)
+            self.stream_handler.setLevel(logging.INFO)
+            self.addLoggingHandler(self.stream_handler)
+            traceback.install()  # Enable exception tracebacks in rich logger
+        else:
+            self.stream_handler = None
 
     @classmethod
     def get_instance(cls) -> Logger:
@@ -86,23 +142,39 @@ class Logger:
     def addLoggingHandler(self, handler: logging.Handler) -> None:
         """Add a handler for all of the internal modules
 
+        The handler is called from the logging thread, not from the thread that logs.
+
         Args:
             handler (logging.Handler): handler to add
         """
-        self.logger.addHandler(handler)
         self.handlers.append(handler)
+        self.listener.handlers = tuple(self.handlers)
+        for l in [self.logger, *map(logging.getLogger, self.modules)]:
+            if self.queue_handler not in l.handlers:
+                l.addHandler(self.queue_handler)
+        self.update_levels()
+
+    def update_levels(self) -> None:
+        """Set the application and module loggers to the level of the most verbose handler
+
+        Must be called after changing the level of a handler.
+        """
+        level = min((handler.level or logging.DEBUG for handler in self.handlers), default=logging.WARNING)
+        for l in [self.logger, *map(logging.getLogger, self.modules)]:
+            l.setLevel(level)
 
-        # Enable / disable logging in modules
-        for module in self.modules:
-            l = logging.getLogger(module)
-            l.setLevel(logging.DEBUG)
-            l.addHandler(handler)
+    def stop(self) -> None:
+        """Write out all queued records and stop the logging thread"""
+        if self._listening:
+            self._listening = False
+            self.listener.stop()
 
 
 def setup_logging(
     base: logging.Logger | str,
     output: Path | None = None,
     modules: list[str] | None = None,
+    console: bool = True,
 ) -> logging.Logger:
     """Configure the modules for logging and get a logger that can be used by the application
 
@@ -112,6 +184,7 @@ def setup_logging(
         base (logging.Logger | str): Name of application (i.e. __name__) or preconfigured logger to use as base
         output (Path | None): Path of log file for file stream handler. If not set, will not log to file.
         modules (list[str] | None): Optional override of modules / levels. Will be merged into default modules.
+        console (bool): Log to the console (with rich formatting and tracebacks). Defaults to True.
 
     Raises:
         TypeError: Base logger is not of correct type
@@ -121,7 +194,7 @@ def setup_logging(
     """
     if isinstance(base, str):
         base = logging.getLogger(base)
-    l = Logger(base, output, modules)
+    l = Logger(base, output, modules, console)
     return l.logger
 
 
@@ -131,8 +204,10 @@ def set_file_logging_level(level: int) -> None:
     Args:
         level (int): level to set
     """
-    if fh := Logger.get_instance().file_handler:
+    instance = Logger.get_instance()
+    if fh := instance.file_handler:
         fh.setLevel(level)
+        instance.update_levels()
 
 
 def set_stream_logging_level(level: int) -> None:
@@ -141,7 +216,10 @@ def set_stream_logging_level(level: int) -> None:
     Args:
         level (int): level to set
     """
-    Logger.get_instance().stream_handler.setLevel(level)
+    instance = Logger.get_instance()
+    if sh := instance.stream_handler:
+        sh.setLevel(level)
+        instance.update_levels()
 
 
 def set_logging_level(level: int) -> None:
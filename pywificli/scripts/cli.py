@@ -0,0 +1,370 @@
+"""pywificli command line interface
+
+Every subcommand prints NDJSON to stdout: one JSON object per line, each stamped with the (epoch) time of the sample it
+belongs to. Logs and errors go to stderr so that the output can be piped straight into other tools.
+
+With --watch, scan / status / interfaces keep running and print a new sample every interval. The driver is detected
+once and reused for every sample, so monitoring does not pay for startup and detection over and over again.
+
+connect never takes the password as an argument, where it would show up in the process list and the shell history.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Sequence
+
+from pywificli.components.driver_factory import WifiDriverFactory, WifiInterfaceControllerFactory
+from pywificli.domain.metadata import DriverType
+from pywificli.domain.scan import ScanResult
+from pywificli.util import get_executor
+
+if TYPE_CHECKING:
+    from pywificli.components.interface_controller import WifiInterfaceController
+
+logger = logging.getLogger(__name__)
+
+PASSWORD_ENV = "PYWIFICLI_PASSWORD"
+"""Environment variable that connect takes the password from"""
+
+Record = dict[str, Any]
+Command = Callable[[WifiInterfaceControllerFactory, argparse.Namespace], Awaitable[list[Record]]]
+
+
+def _scan_record(result: ScanResult, interface: str | None = None) -> Record:
+    """Turn a scan result into an output record
+
+    Args:
+        result (ScanResult): scan result
+        interface (str | None): interface that found it. Defaults to None (merged results of all interfaces).
+
+    Returns:
+        Record: the fields of the result, preceded by the interface if given
+    """
+    return {"interface": interface, **asdict(result)} if interface else asdict(result)
+
+
+async def _controller(factory: WifiInterfaceControllerFactory, interface: str | None) -> WifiInterfaceController:
+    """The controller of the requested interface or else of the first available one"""
+    if interface:
+        return await factory.get_interface_controller(interface)
+    return await factory.get_first_interface_controller()
+
+
+async def _interfaces(factory: WifiInterfaceControllerFactory, _: argparse.Namespace) -> list[Record]:
+    """List the available interfaces
+
+    Args:
+        factory (WifiInterfaceControllerFactory): factory of the interface controllers
+
+    Returns:
+        list[Record]: whether each interface is enabled
+    """
+    controllers = await factory.get_interface_controllers()
+    enabled = await asyncio.gather(*[controller.is_enabled() for controller in controllers.values()])
+    return [{"interface": interface, "enabled": is_enabled} for interface, is_enabled in zip(controllers, enabled)]
+
+
+async def _status(factory: WifiInterfaceControllerFactory, args: argparse.Namespace) -> list[Record]:
+    """Get the connection state of the requested interface or else of every available interface
+
+    Args:
+        factory (WifiInterfaceControllerFactory): factory of the interface controllers
+        args (argparse.Namespace): parsed arguments of the status subcommand
+
+    Returns:
+        list[Record]: state and SSID of each interface
+    """
+    if args.interface:
+        controllers = {args.interface: await factory.get_interface_controller(args.interface)}
+    else:
+        controllers = await factory.get_interface_controllers()
+    states = await asyncio.gather(*[controller.get_connection_state() for controller in controllers.values()])
+    return [
+        {"interface": interface, "state": state.name.lower(), "ssid": ssid or None}
+        for interface, (state, ssid) in zip(controllers, states)
+    ]
+
+
+async def _scan(factory: WifiInterfaceControllerFactory, args: argparse.Namespace) -> list[Record]:
+    """Scan on the requested interface or else on every available interface
+
+    Args:
+        factory (WifiInterfaceControllerFactory): factory of the interface controllers
+        args (argparse.Namespace): parsed arguments of the scan subcommand
+
+    Returns:
+        list[Record]: one record per scan result
+    """
+    if args.interface:
+        controller = await factory.get_interface_controller(args.interface)
+        return [_scan_record(result, args.interface) for result in await controller.scan(args.timeout, args.max_age)]
+    manager = await factory.get_manager()
+    if args.merged:
+        return [_scan_record(result) for result in await manager.scan_merged(args.timeout, args.max_age)]
+    scans = await manager.scan_all(args.timeout, args.max_age)
+    return [_scan_record(result, interface) for interface, results in scans.items() for result in results]
+
+
+async def _connect(factory: WifiInterfaceControllerFactory, args: argparse.Namespace) -> list[Record]:
+    """Connect the requested interface or else the first available one to a network
+
+    Args:
+        factory (WifiInterfaceControllerFactory): factory of the interface controllers
+        args (argparse.Namespace): parsed arguments of the connect subcommand
+
+    Returns:
+        list[Record]: whether the interface connected
+    """
+    controller = await _controller(factory, args.interface)
+    connected = await controller.connect(args.ssid, _password(args), args.timeout)
+    return [{"interface": controller.interface, "ssid": args.ssid, "success": connected}]
+
+
+async def _disconnect(factory: WifiInterfaceControllerFactory, args: argparse.Namespace) -> list[Record]:
+    """Disconnect the requested interface or else the first available one
+
+    Args:
+        factory (WifiInterfaceControllerFactory): factory of the interface controllers
+        args (argparse.Namespace): parsed arguments of the disconnect subcommand
+
+    Returns:
+        list[Record]: whether the interface disconnected
+    """
+    controller = await _controller(factory, args.interface)
+    return [{"interface": controller.interface, "success": await controller.disconnect()}]
+
+
+def _password(args: argparse.Namespace) -> str:
+    """Get the password of the network to connect to without it ever being on the command line
+
+    It is read from stdin (--password-stdin) or the PASSWORD_ENV environment variable, or else asked for if there is a
+    terminal to ask on. Without one, the network is taken to be open.
+
+    Args:
+        args (argparse.Namespace): parsed arguments of the connect subcommand
+
+    Returns:
+        str: password ("" for an open network)
+    """
+    if args.password_stdin:
+        return sys.stdin.readline().rstrip("\r\n")
+    if args.no_password:
+        return ""
+    if (password := os.environ.get(PASSWORD_ENV)) is not None:
+        return password
+    if not sys.stdin.isatty():
+        return ""
+    import getpass  # pylint: disable=import-outside-toplevel
+
+    return getpass.getpass(f"Password of {args.ssid} (empty for an open network): ")
+
+
+def _emit(records: list[Record]) -> None:
+    """Print the records of one sample as NDJSON, flushed right away so that consumers see each sample as it comes"""
+    now = round(time.time(), 3)
+    sys.stdout.write("".join(json.dumps({"time": now, **record}) + "\n" for record in records))
+    sys.stdout.flush()
+
+
+async def _watch(sample: Callable[[], Awaitable[list[Record]]], interval: float, count: int | None) -> None:
+    """Print a sample every interval (at a fixed rate, skipping ahead if a sample overruns) until count samples
+
+    A failed sample is logged and does not stop watching since the failure might be transient (i.e. an interface that
+    is being reset).
+    """
+    next_sample = time.monotonic()
+    for n in itertools.count(1) if count is None else range(1, count + 1):
+        try:
+            records = await sample()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Sample failed: %r", e)
+        else:
+            _emit(records)
+        if n == count:
+            break
+        next_sample = max(next_sample + interval, time.monotonic())
+        await asyncio.sleep(next_sample - time.monotonic())
+
+
+def _positive(value: str) -> float:
+    """Parse a positive number
+
+    Args:
+        value (str): command line argument
+
+    Raises:
+        argparse.ArgumentTypeError: The number is not positive
+
+    Returns:
+        float: number
+    """
+    if (number := float(value)) <= 0:
+        raise argparse.ArgumentTypeError(f"must be positive: {value}")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser
+
+    Returns:
+        argparse.ArgumentParser: parser of all subcommands
+    """
+    parser = argparse.ArgumentParser(prog="pywificli", description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-d",
+        "--driver",
+        type=str.upper,
+        choices=[driver_type.name for driver_type in DriverType],
+        help="use this driver instead of detecting one",
+    )
+    parser.add_argument("--no-detection-cache", action="store_true", help="always detect the driver from scratch")
+    parser.add_argument("-v", "--verbose", action="count", default=0, help="log to stderr (twice for debug logs)")
+    parser.add_argument("--log-file", type=Path, help="write debug logs to this file")
+
+    interface = argparse.ArgumentParser(add_help=False)
+    interface.add_argument("-i", "--interface", help="interface to use (default: see the subcommand)")
+    watch = argparse.ArgumentParser(add_help=False)
+    watch.add_argument(
+        "-w", "--watch", type=_positive, metavar="INTERVAL", help="print a sample every INTERVAL seconds"
+    )
+    watch.add_argument("-n", "--count", type=int, help="stop watching after this many samples")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    scan = subparsers.add_parser(
+        "scan", parents=[interface, watch], help="scan for networks (on every interface by default)"
+    )
+    scan.add_argument("-t", "--timeout", type=_positive, default=10.0, help="how long to scan for (default: 10)")
+    scan.add_argument("--max-age", type=float, help="accept cached results at most this old (in seconds)")
+    scan.add_argument("--merged", action="store_true", help="merge the results of all interfaces")
+    scan.set_defaults(run=_scan)
+    status = subparsers.add_parser(
+        "status", parents=[interface, watch], help="connection state (of every interface by default)"
+    )
+    status.set_defaults(run=_status)
+    interfaces = subparsers.add_parser("interfaces", parents=[watch], help="available interfaces")
+    interfaces.set_defaults(run=_interfaces)
+    connect = subparsers.add_parser(
+        "connect",
+        parents=[interface],
+        help="connect (the first interface by default)",
+        description=f"The password is asked for unless it is given through --password-stdin or ${PASSWORD_ENV}.",
+    )
+    connect.add_argument("ssid")
+    password = connect.add_mutually_exclusive_group()
+    password.add_argument(
+        "--password-stdin", action="store_true", help="read the password from the first line of stdin"
+    )
+    password.add_argument("--no-password", action="store_true", help="connect to an open network without asking")
+    connect.add_argument("-t", "--timeout", type=_positive, default=30.0, help="how long to try for (default: 30)")
+    connect.set_defaults(run=_connect)
+    disconnect = subparsers.add_parser(
+        "disconnect", parents=[interface], help="disconnect (the first interface by default)"
+    )
+    disconnect.set_defaults(run=_disconnect)
+    return parser
+
+
+def _setup_logging(args: argparse.Namespace) -> None:
+    """Log to stderr (-v) and / or a file (--log-file) if requested
+
+    Args:
+        args (argparse.Namespace): parsed arguments
+    """
+    if not args.verbose and not args.log_file:
+        # Warnings and errors still reach stderr through logging's last resort handler
+        return
+    # pylint: disable-next=import-outside-toplevel
+    from pywificli.logging import add_logging_handler, setup_logging
+
+    # The console handler of setup_logging writes to stdout, which belongs to the NDJSON output
+    setup_logging("pywificli", args.log_file, modules=["pywificli"], console=False)
+    if args.verbose:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)-8s %(name)s | %(message)s"))
+        # The level has to be set before adding the handler, which sets the loggers to the most verbose handler level
+        handler.setLevel(logging.INFO if args.verbose == 1 else logging.DEBUG)
+        add_logging_handler(handler)
+
+
+async def _run(args: argparse.Namespace) -> int:
+    """Run the subcommand once, or repeatedly with --watch
+
+    Args:
+        args (argparse.Namespace): parsed arguments
+
+    Returns:
+        int: exit status (0 on success, 1 if the command failed)
+    """
+    scan_cache = None
+    if getattr(args, "max_age", None) is not None:
+        from pywificli.components.scan_cache import ScanCache  # pylint: disable=import-outside-toplevel
+
+        scan_cache = ScanCache()
+    factory = WifiInterfaceControllerFactory(
+        WifiDriverFactory(
+            use_detection_cache=not args.no_detection_cache,
+            driver_type=DriverType[args.driver] if args.driver else None,
+        ),
+        scan_cache,
+    )
+    command: Command = args.run
+    try:
+        if getattr(args, "watch", None):
+            # Failing to detect a driver is not transient so it ends the command instead of every sample
+            await factory.get_manager()
+            # Look the interfaces up again for every sample so that it shows interfaces that came or went
+            factory.refresh_interval = 0
+            await _watch(lambda: command(factory, args), args.watch, args.count)
+            return 0
+        records = await command(factory, args)
+        _emit(records)
+        return 1 if any(record.get("success") is False for record in records) else 0
+    finally:
+        executor = get_executor()
+        if helper := executor.privileged_helper:
+            executor.privileged_helper = None
+            await helper.close()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the command line interface
+
+    Args:
+        argv (Sequence[str] | None): arguments (without the program name). Defaults to None (sys.argv).
+
+    Returns:
+        int: exit status (0 on success, 1 if the command failed)
+    """
+    args = build_parser().parse_args(argv)
+    _setup_logging(args)
+    try:
+        return asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # The consumer went away (i.e. piped into head). Keep Python from complaining again when it flushes stdout.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.debug("Command failed", exc_info=True)
+        print(f"pywificli: error: {e}", file=sys.stderr)
+        return 1
+
+
+# Needed for poetry scripts defined in pyproject.toml
+def entrypoint() -> None:
+    sys.exit(main())
+
+
+if __name__ == "__main__":
+    entrypoint()
@@ -1,29 +1,14 @@
-"""Simple entrypoint demo"""
+"""Scan on every interface (kept for compatibility: the same as `pywificli scan`)"""
 
-import asyncio
-from pathlib import Path
-
-from pywificli.components.driver_factory import WifiDriverFactory, WifiInterfaceControllerFactory
-from pywificli.logging import set_file_logging_level, set_logging_level, setup_logging
-
-
-async def main() -> None:
-    setup_logging("__name__", Path("scan_ssids.log"))
-
-    wifi = await WifiInterfaceControllerFactory().get_first_interface_controller()
-    scan_results = await wifi.scan(10.0)
-    print(scan_results)
-    # if await wifi_driver.connect(interface, scan_results[0].ssid, "password", 10.0):
-    #     print("Connected whoohoo!")
-    # else:
-    #     print("Failed to connect")
-    # await asyncio.sleep(10)
-    # await wifi_driver.disconnect(interface)
+import sys
 
 
 # Needed for poetry scripts defined in pyproject.toml
 def entrypoint() -> None:
-    asyncio.run(main())
+    # The CLI (and its argument parser) is only imported when actually run to keep this module cheap to import
+    from pywificli.scripts.cli import main  # pylint: disable=import-outside-toplevel
+
+    sys.exit(main(["scan", *sys.argv[1:]]))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,199 @@
+"""Utility functions"""
+
+import contextlib
+import logging
+import shlex
+from typing import AsyncIterator, Sequence
+
+from pywificli.exceptions import CommandProcessError
+from pywificli.logging import truncate
+from pywificli.util.batch import NETSH_SCRIPT, SH_SCRIPT, BatchDialect
+from pywificli.util.executor import CommandExecutor, get_executor, set_executor
+from pywificli.util.metrics import Metrics, get_metrics, set_metrics
+from pywificli.util.privileged import PrivilegedHelper
+from pywificli.util.result import CmdResult, CmdResultOk
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "BatchDialect",
+    "CmdResult",
+    "CmdResultOk",
+    "CommandExecutor",
+    "Metrics",
+    "NETSH_SCRIPT",
+    "PrivilegedHelper",
+    "SH_SCRIPT",
+    "cmd",
+    "cmdBatch",
+    "cmdOkOrRaise",
+    "cmdStream",
+    "get_executor",
+    "get_metrics",
+    "set_executor",
+    "set_metrics",
+]
+
+
+def _to_argv(command: str | Sequence[str]) -> list[str]:
+    return shlex.split(command) if isinstance(command, str) else list(command)
+
+
+def _redact(argv: Sequence[str], secrets: Sequence[str]) -> list[str]:
+    """Mask secrets (i.e. passwords) in a command before it is logged or put in an error message"""
+    for secret in filter(None, secrets):
+        argv = [arg.replace(secret, "******") for arg in argv]
+    return list(argv)
+
+
+def _log_output(result: CmdResult) -> None:
+    # Guarded so that (potentially large) outputs are only truncated when they will actually be logged
+    if result.stdout and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[stdout]\n%s", truncate(result.stdout))
+    if result.stderr and logger.isEnabledFor(logging.WARNING):
+        logger.warning("[stderr]\n%s", truncate(result.stderr))
+
+
+async def cmdOkOrRaise(
+    command: str | Sequence[str],
+    stdin: str | None = None,
+    read_only: bool = False,
+    privileged: bool = False,
+    timeout: float | None = None,
+    secrets: Sequence[str] = (),
+) -> CmdResultOk:
+    """Run a command in a subprocess and return its result.
+
+    The command is executed directly (not through a shell) so shell syntax such as pipes is not supported.
+
+    Args:
+        command (str | Sequence[str]): command to run, either as argument list or string to be split shell-style
+        stdin (str | None): input to write to the command's stdin. Defaults to None.
+        read_only (bool): the command does not change system state so concurrent identical commands share one
+            subprocess and its result is briefly cached. Defaults to False.
+        privileged (bool): the command may need elevated privileges, so it is sent to the executor's privileged helper
+            if one was started. Defaults to False.
+        timeout (float | None): deadline (in seconds) after which the command and its process group are killed.
+            Defaults to None (the executor's default_timeout).
+        secrets (Sequence[str]): values (i.e. passwords) to mask wherever the command is logged. Defaults to ().
+
+    Raises:
+        CommandProcessError: Did not receive return code or return code was non-success
+        CommandTimeoutError: Did not complete within the timeout
+
+    Returns:
+        CmdResult: stdout, stderr, and return code
+    """
+    argv = _to_argv(command)
+    logger.debug("Sending command ==> %s", _redact(argv, secrets))
+    result = await get_executor().run(argv, stdin, read_only, privileged, timeout)
+
+    if (return_code := result.return_code) == 0:
+        logger.debug("Exited with %s", return_code)
+    else:
+        raise CommandProcessError(
+            " ".join(_redact(argv, secrets)), f"exited with non-success return code {return_code}"
+        )
+    _log_output(result)
+
+    return CmdResultOk(
+        return_code=return_code,
+        stdout=result.stdout or "",
+        stderr=result.stderr,
+    )
+
+
+async def cmd(
+    command: str | Sequence[str],
+    stdin: str | None = None,
+    read_only: bool = False,
+    privileged: bool = False,
+    timeout: float | None = None,
+    secrets: Sequence[str] = (),
+) -> CmdResult:
+    """Run a command in a subprocess and return its result
+
+    The command is executed directly (not through a shell) so shell syntax such as pipes is not supported.
+
+    Args:
+        command (str | Sequence[str]): command to run, either as argument list or string to be split shell-style
+        stdin (str | None): input to write to the command's stdin. Defaults to None.
+        read_only (bool): the command does not change system state so concurrent identical commands share one
+            subprocess and its result is briefly cached. Defaults to False.
+        privileged (bool): the command may need elevated privileges, so it is sent to the executor's privileged helper
+            if one was started. Defaults to False.
+        timeout (float | None): deadline (in seconds) after which the command and its process group are killed.
+            Defaults to None (the executor's default_timeout).
+        secrets (Sequence[str]): values (i.e. passwords) to mask wherever the command is logged. Defaults to ().
+
+    Raises:
+        CommandTimeoutError: Did not complete within the timeout
+
+    Returns:
+        CmdResult: stdout, stderr, and return code
+    """
+    argv = _to_argv(command)
+    logger.debug("Sending command ==> %s", _redact(argv, secrets))
+    result = await get_executor().run(argv, stdin, read_only, privileged, timeout)
+
+    if result.return_code == 0:
+        logger.debug("Exited with %s", result.return_code)
+    else:
+        logger.warning("Exited with %s", result.return_code)
+    _log_output(result)
+
+    return result
+
+
+async def cmdBatch(
+    dialect: BatchDialect, commands: Sequence[str | Sequence[str]], timeout: float | None = None
+) -> list[CmdResult]:
+    """Run several commands of the same tool in one subprocess and return the result of each
+
+    Args:
+        dialect (BatchDialect): how the tool runs a script of commands (i.e. NETSH_SCRIPT)
+        commands (Sequence[str | Sequence[str]]): commands to run in order, each either as argument list or string to
+            be split shell-style
+        timeout (float | None): deadline (in seconds) of all commands together. Defaults to None (the executor's
+            default_timeout).
+
+    Returns:
+        list[CmdResult]: per-command stdout, stderr and return code. Tools do not report per-command return codes in
+            scripts, so the return code is only non-zero for a command the script stopped at.
+    """
+    argvs = [_to_argv(command) for command in commands]
+    logger.debug("Sending batch ==> %s", argvs)
+    results = await get_executor().run_batch(dialect, argvs, timeout)
+
+    for argv, result in zip(argvs, results):
+        if result.return_code == 0:
+            logger.debug("%s exited with %s", argv, result.return_code)
+        else:
+            logger.warning("%s exited with %s", argv, result.return_code)
+        _log_output(result)
+
+    return results
+
+
+@contextlib.asynccontextmanager
+async def cmdStream(
+    command: str | Sequence[str], long_lived: bool = False, timeout: float | None = None
+) -> AsyncIterator[AsyncIterator[str]]:
+    """Run a command in a subprocess and iterate over its stdout lines as they arrive
+
+    The subprocess is killed when the context exits so the caller can stop as soon as it has what it needs.
+
+    Args:
+        command (str | Sequence[str]): command to run, either as argument list or string to be split shell-style
+        long_lived (bool): the command runs until stopped (i.e. a monitor). Defaults to False.
+        timeout (float | None): deadline (in seconds) after which the command and its process group are killed and
+            iterating raises CommandTimeoutError. Defaults to None (the executor's default_timeout, or no deadline if
+            long-lived).
+
+    Yields:
+        AsyncIterator[str]: decoded stdout lines without line endings
+    """
+    argv = _to_argv(command)
+    logger.debug("Streaming command ==> %s", argv)
+    async with get_executor().stream(argv, long_lived, timeout) as lines:
+        yield lines
@@ -0,0 +1,122 @@
+"""Run several commands of the same tool in one process by handing it a script"""
+
+from __future__ import annotations
+
+import shlex
+import subprocess
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+from pywificli.exceptions import CommandProcessError
+from pywificli.util.result import CmdResult
+
+
+@dataclass(frozen=True)
+class BatchDialect:
+    """How a tool runs a script of commands in a single process
+
+    A marker line is added to the script after every command. The tool answers each marker with a recognizable output
+    line, which is how the combined output is split back into one result per command.
+
+    Attributes:
+        argv (tuple[str, ...]): command running the script. An argument "{script}" is replaced by the path of a file
+            holding the script; without one, the script is written to the command's stdin.
+        render (Callable[[Sequence[str]], str]): turn a command (argument list starting with the binary) into a script
+            line. Raises CommandProcessError if the command can not be written safely.
+        marker_command (str): script line producing a marker, where "{marker}" is replaced by the marker. Defaults to
+            "{marker}".
+    """
+
+    argv: tuple[str, ...]
+    render: Callable[[Sequence[str]], str]
+    marker_command: str = "{marker}"
+
+    @property
+    def uses_file(self) -> bool:
+        """Is the script passed as a file (instead of through stdin)?"""
+        return "{script}" in self.argv
+
+    def script(self, commands: Sequence[Sequence[str]], markers: Sequence[str]) -> str:
+        """Build the script running the commands
+
+        Args:
+            commands (Sequence[Sequence[str]]): commands as argument lists
+            markers (Sequence[str]): marker to emit after each command
+
+        Returns:
+            str: script
+        """
+        lines = []
+        for command, marker in zip(commands, markers):
+            lines.append(self.render(command))
+            lines.append(self.marker_command.format(marker=marker))
+        return "\n".join(lines) + "\n"
+
+
+def _netsh_line(command: Sequence[str]) -> str:
+    """Render a netsh command as a script line
+
+    netsh tokenizes script lines itself and expects parameter values quoted after the "=" (interface="Wi-Fi 2"). It
+    has no way to escape a quote, so an argument containing one (or a line break) could end the value early and run
+    the rest of it as another command.
+
+    Args:
+        command (Sequence[str]): netsh command as argument list
+
+    Raises:
+        CommandProcessError: An argument can not be written safely to a script line
+
+    Returns:
+        str: script line (relative to the top level context)
+    """
+    arguments = []
+    for argument in command[1:]:
+        if any(char in argument for char in '"\r\n'):
+            raise CommandProcessError(" ".join(command), f"Argument can not be quoted in a netsh script: {argument!r}")
+        name, equals, value = argument.partition("=")
+        if equals and name.isalpha():
+            arguments.append(f'{name}="{value}"')
+        else:
+            arguments.append(subprocess.list2cmdline([argument]))
+    return " ".join(arguments)
+
+
+# netsh runs a script with -f and answers an unknown command (the marker) with
+# "The following command was not found: <marker>." before carrying on with the next line. Commands in the script
+# are relative to the top level context, i.e. "wlan connect ..." for "netsh wlan connect ...".
+NETSH_SCRIPT = BatchDialect(argv=("netsh", "-f", "{script}"), render=_netsh_line)
+
+# A POSIX shell reading the script from stdin
+SH_SCRIPT = BatchDialect(argv=("sh", "-s"), render=shlex.join, marker_command="echo {marker}")
+
+
+def split_output(result: CmdResult, markers: Sequence[str]) -> list[CmdResult]:
+    """Split the result of a script into the results of the commands that ran
+
+    Scripts do not report per-command return codes, so every command whose marker appeared gets return code 0 and
+    callers judge success by its output. If the script stopped before a command's marker, that command gets the
+    script's return code (1 if the script claimed success) and any later commands are left out, so that they can be
+    run again.
+
+    Args:
+        result (CmdResult): result of the whole script
+        markers (Sequence[str]): marker emitted after each command
+
+    Returns:
+        list[CmdResult]: results of the commands that ran, in order (at most one per marker)
+    """
+    results: list[CmdResult] = []
+    lines: list[str] = []
+    for line in (result.stdout or "").splitlines(keepends=True):
+        if len(results) < len(markers) and markers[len(results)] in line:
+            results.append(CmdResult(return_code=0, stdout="".join(lines) or None, stderr=None))
+            lines = []
+        else:
+            lines.append(line)
+    # Without any output past the last marker the next command is assumed not to have run, unless nothing ran at all
+    if len(results) < len(markers) and (lines or not results):
+        # The command that was running when the script stopped
+        results.append(CmdResult(return_code=result.return_code or 1, stdout="".join(lines) or None, stderr=None))
+    # stderr can not be attributed line by line so it goes to the last command that ran
+    results[-1].stderr = result.stderr
+    return results
@@ -0,0 +1,556 @@
+"""Shell-free command executor with bounded concurrency"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import secrets
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from typing import AsyncIterator, Sequence
+
+from pywificli.exceptions import CommandProcessError, CommandTimeoutError
+from pywificli.util.batch import BatchDialect, split_output
+from pywificli.util.metrics import get_metrics
+from pywificli.util.privileged import PrivilegedHelper
+from pywificli.util.result import CmdResult
+
+logger = logging.getLogger(__name__)
+
+# How much of a pipe is read at once
+_CHUNK_SIZE = 2**16
+
+# Every command gets a process group of its own (a new session on POSIX), so that killing it also kills whatever it
+# spawned. Each option is ignored on the other platform.
+_CREATION_FLAGS: int = getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)
+
+
+def binary_name(argv: Sequence[str]) -> str:
+    """Get the normalized binary name of a command (i.e. "netsh" for "C:\\Windows\\System32\\NETSH.EXE")
+
+    Args:
+        argv (Sequence[str]): command as argument list
+
+    Returns:
+        str: lowercase basename of the binary without extension
+    """
+    name = os.path.basename(argv[0]).lower()
+    return name[:-4] if name.endswith(".exe") else name
+
+
+def _kill_group(proc: asyncio.subprocess.Process) -> None:
+    """Kill a process and its process group, if it is still running
+
+    Args:
+        proc (asyncio.subprocess.Process): process started in a process group of its own
+    """
+    if proc.returncode is not None:
+        return
+    if sys.platform == "win32":
+        # taskkill /T also ends the process' children
+        with contextlib.suppress(OSError):
+            subprocess.Popen(  # pylint: disable=consider-using-with
+                ["taskkill", "/F", "/T", "/PID", str(proc.pid)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+    else:
+        with contextlib.suppress(ProcessLookupError, PermissionError):
+            os.killpg(proc.pid, signal.SIGKILL)
+    with contextlib.suppress(ProcessLookupError):
+        proc.kill()
+
+
+async def _kill(proc: asyncio.subprocess.Process) -> None:
+    """Kill a process and its process group (if it is still running) and wait for it
+
+    Args:
+        proc (asyncio.subprocess.Process): process with piped outputs, started in a process group of its own
+    """
+    _kill_group(proc)
+    # The process only counts as finished once its pipes are closed, so discard what was left unread
+    for pipe in (proc.stdout, proc.stderr):
+        while pipe and await pipe.read(_CHUNK_SIZE):
+            pass
+    await proc.wait()
+
+
+class CommandExecutor:
+    """Run commands as argument lists directly (without an intermediate shell).
+
+    The amount of simultaneously running subprocesses is capped globally as well as per binary so that polling many
+    interfaces can not pile up processes.
+
+    Read-only commands are coalesced: concurrent identical requests share one subprocess and successful results are
+    reused for cache_ttl seconds. Any other (i.e. mutating) command invalidates the cached results of its binary.
+
+    Args:
+        max_concurrency (int): maximum amount of subprocesses running at once. Defaults to 8.
+        per_binary_limit (int): default maximum amount of subprocesses of the same binary running at once.
+            Defaults to 4.
+        binary_limits (dict[str, int] | None): per-binary overrides of per_binary_limit. Defaults to None.
+        cache_ttl (float): how long (in seconds) to reuse results of read-only commands. 0 disables caching.
+            Defaults to 0.3.
+        privileged_helper (PrivilegedHelper | None): started helper running privileged commands. Defaults to None
+            (privileged commands run like any other).
+        max_output (int): most bytes buffered per command: the whole stdout (and stderr) of run, and the longest line
+            as well as the whole output of a stream unless it is long-lived. Commands exceeding it are killed.
+            Defaults to 16 MiB.
+        default_timeout (float | None): deadline (in seconds) of commands that are not given one, except long-lived
+            streams. None waits forever. Defaults to 60.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        per_binary_limit: int = 4,
+        binary_limits: dict[str, int] | None = None,
+        cache_ttl: float = 0.3,
+        privileged_helper: PrivilegedHelper | None = None,
+        max_output: int = 16 * 2**20,
+        default_timeout: float | None = 60.0,
+    ) -> None:
+        if max_concurrency < 1 or per_binary_limit < 1:
+            raise ValueError("Concurrency limits must be at least 1")
+        if max_output < 1:
+            raise ValueError("Output limit must be at least 1 byte")
+        self.max_output = max_output
+        self.default_timeout = default_timeout
+        self.max_concurrency = max_concurrency
+        self.per_binary_limit = per_binary_limit
+        self.binary_limits = {k.lower(): v for k, v in (binary_limits or {}).items()}
+        # Asyncio primitives are bound to the loop they are first used in so (re)create them per loop
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._global_semaphore: asyncio.Semaphore
+        self._binary_semaphores: dict[str, asyncio.Semaphore] = {}
+        self.spawn_count = 0
+        self.cache_ttl = cache_ttl
+        self._cache: dict[tuple[str, ...], tuple[float, CmdResult]] = {}
+        self._in_flight: dict[tuple[str, ...], asyncio.Future[CmdResult]] = {}
+        # Bumped on every invalidation so that reads started before a mutation are not cached afterwards
+        self._generations: dict[str, int] = {}
+        self.privileged_helper = privileged_helper
+
+    def _bind_to_running_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._global_semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._binary_semaphores = {}
+
+    def _binary_semaphore(self, binary: str) -> asyncio.Semaphore:
+        if not (semaphore := self._binary_semaphores.get(binary)):
+            semaphore = asyncio.Semaphore(self.binary_limits.get(binary, self.per_binary_limit))
+            self._binary_semaphores[binary] = semaphore
+        return semaphore
+
+    @contextlib.asynccontextmanager
+    async def _slot(self, argv: Sequence[str]) -> AsyncIterator[None]:
+        """Acquire a global and per-binary slot to run a subprocess in
+
+        Args:
+            argv (Sequence[str]): command that will be run
+
+        Yields:
+            None: once the slot is acquired
+        """
+        self._bind_to_running_loop()
+        async with self._binary_semaphore(binary_name(argv)), self._global_semaphore:
+            yield
+
+    def invalidate(self, binary: str | None = None) -> None:
+        """Drop cached read-only results
+
+        Commands already in flight still complete for their callers, but later callers no longer join them.
+
+        Args:
+            binary (str | None): only drop results of this binary. Defaults to None (drop everything).
+        """
+        if binary is None:
+            self._cache.clear()
+            self._in_flight.clear()
+            self._generations = {k: v + 1 for k, v in self._generations.items()}
+            return
+        binary = binary.lower()
+        self._generations[binary] = self._generations.get(binary, 0) + 1
+        for key in [key for key in self._cache if binary_name(key) == binary]:
+            del self._cache[key]
+        for key in [key for key in self._in_flight if binary_name(key) == binary]:
+            del self._in_flight[key]
+
+    async def run(
+        self,
+        argv: Sequence[str],
+        stdin: str | None = None,
+        read_only: bool = False,
+        privileged: bool = False,
+        timeout: float | None = None,
+    ) -> CmdResult:
+        """Run a command and wait for it to complete
+
+        Args:
+            argv (Sequence[str]): command to run as argument list
+            stdin (str | None): input to write to the command's stdin. Defaults to None.
+            read_only (bool): the command does not change system state so its result can be shared with identical
+                concurrent commands and cached. Defaults to False.
+            privileged (bool): the command may need elevated privileges, so it is sent to the privileged helper if
+                there is one. Defaults to False.
+            timeout (float | None): how long the command may take (in seconds), including waiting for a concurrency
+                slot. Defaults to None (default_timeout).
+
+        Raises:
+            CommandProcessError: Command was empty, could not be started, wrote more than max_output bytes (and was
+                killed), or did not receive a return code
+            CommandTimeoutError: Command did not complete within the timeout and was killed
+            PrivilegedHelperError: The privileged helper is not running or refused the command
+
+        Returns:
+            CmdResult: stdout, stderr, and return code
+        """
+        if not argv:
+            raise CommandProcessError("", "Empty command")
+        timeout = self.default_timeout if timeout is None else timeout
+        if not read_only or stdin is not None:
+            self.invalidate(binary_name(argv))
+            try:
+                return await self._spawn(argv, stdin, privileged, timeout)
+            finally:
+                self.invalidate(binary_name(argv))
+
+        key = (*argv, "privileged") if privileged else tuple(argv)
+        if (cached := self._cache.get(key)) and time.monotonic() - cached[0] < self.cache_ttl:
+            logger.debug("Using cached result of %s", argv)
+            if (metrics := get_metrics()).enabled:
+                metrics.record_cache_hit(binary_name(argv))
+            return cached[1]
+        if not (future := self._in_flight.get(key)):
+            future = asyncio.ensure_future(self._spawn_and_cache(argv, key, privileged, timeout))
+            self._in_flight[key] = future
+            # Only forget the future if it was not replaced after an invalidation
+            future.add_done_callback(
+                lambda done: self._in_flight.pop(key, None) if self._in_flight.get(key) is done else None
+            )
+        else:
+            logger.debug("Joining in-flight %s", argv)
+        # Shield so that a cancelled (or timed out) caller does not cancel the subprocess other callers are waiting on
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError as e:
+            raise CommandTimeoutError(" ".join(argv), timeout or 0) from e
+
+    async def _spawn_and_cache(
+        self, argv: Sequence[str], key: tuple[str, ...], privileged: bool, timeout: float | None
+    ) -> CmdResult:
+        binary = binary_name(argv)
+        generation = self._generations.get(binary, 0)
+        result = await self._spawn(argv, None, privileged, timeout)
+        if result.is_ok and self.cache_ttl > 0 and self._generations.get(binary, 0) == generation:
+            self._cache[key] = (time.monotonic(), result)
+        return result
+
+    async def _spawn(
+        self, argv: Sequence[str], stdin: str | None, privileged: bool = False, timeout: float | None = None
+    ) -> CmdResult:
+        """Run a command (see _exec) and kill it once the timeout has passed
+
+        Args:
+            argv (Sequence[str]): command to run as argument list
+            stdin (str | None): input to write to the command's stdin
+            privileged (bool): send the command to the privileged helper if there is one. Defaults to False.
+            timeout (float | None): how long the command may take (in seconds). Defaults to None (no deadline).
+
+        Raises:
+            CommandTimeoutError: Command did not complete within the timeout and was killed
+
+        Returns:
+            CmdResult: stdout, stderr, and return code
+        """
+        if timeout is None:
+            return await self._exec(argv, stdin, privileged)
+        # Cancelling _exec kills the command
+        try:
+            return await asyncio.wait_for(self._exec(argv, stdin, privileged, timeout), timeout)
+        except asyncio.TimeoutError as e:
+            raise CommandTimeoutError(" ".join(argv), timeout) from e
+
+    async def _exec(
+        self, argv: Sequence[str], stdin: str | None, privileged: bool, timeout: float | None = None
+    ) -> CmdResult:
+        """Run a command in a concurrency slot, or through the privileged helper, and wait for it to exit
+
+        Args:
+            argv (Sequence[str]): command to run as argument list
+            stdin (str | None): input to write to the command's stdin
+            privileged (bool): send the command to the privileged helper if there is one
+            timeout (float | None): deadline passed on to the privileged helper (in seconds). Defaults to None.
+
+        Raises:
+            CommandProcessError: Command could not be started, wrote more than max_output bytes (and was killed), or
+                did not receive a return code
+            CommandTimeoutError: The privileged helper did not get a result within the timeout
+            PrivilegedHelperError: The privileged helper is not running or refused the command
+
+        Returns:
+            CmdResult: stdout, stderr, and return code
+        """
+        if privileged and (helper := self.privileged_helper):
+            return await self._run_privileged(helper, argv, stdin, timeout)
+        async with self._slot(argv):
+            start = time.perf_counter()
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *argv,
+                    stdin=asyncio.subprocess.PIPE if stdin is not None else asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    start_new_session=True,
+                    creationflags=_CREATION_FLAGS,
+                )
+            except OSError as e:
+                if (metrics := get_metrics()).enabled:
+                    metrics.record_command(binary_name(argv), argv, time.perf_counter() - start, False)
+                raise CommandProcessError(" ".join(argv), f"Failed to start: {e}") from e
+            self.spawn_count += 1
+            io = asyncio.gather(
+                self._read_bounded(argv, proc.stdout),
+                self._read_bounded(argv, proc.stderr),
+                self._feed(proc, stdin),
+            )
+            try:
+                stdout, stderr, _ = await io
+                await proc.wait()
+            except BaseException:
+                # Output limit exceeded, timed out or the caller was cancelled
+                io.cancel()
+                await _kill(proc)
+                if (metrics := get_metrics()).enabled:
+                    metrics.record_command(binary_name(argv), argv, time.perf_counter() - start, False)
+                raise
+
+        if (metrics := get_metrics()).enabled:
+            metrics.record_command(binary_name(argv), argv, time.perf_counter() - start, proc.returncode == 0)
+        if proc.returncode is None:
+            raise CommandProcessError(" ".join(argv), "Did not receive return code.")
+        return CmdResult(
+            return_code=proc.returncode,
+            stdout=stdout.decode() if stdout else None,
+            stderr=stderr.decode() if stderr else None,
+        )
+
+    async def _read_bounded(self, argv: Sequence[str], stream: asyncio.StreamReader | None) -> bytes:
+        """Read a pipe to its end, refusing to buffer more than max_output bytes
+
+        Args:
+            argv (Sequence[str]): command writing to the pipe
+            stream (asyncio.StreamReader | None): pipe to read
+
+        Raises:
+            CommandProcessError: The command wrote more than max_output bytes
+
+        Returns:
+            bytes: everything written to the pipe
+        """
+        chunks: list[bytes] = []
+        size = 0
+        while stream and (chunk := await stream.read(_CHUNK_SIZE)):
+            size += len(chunk)
+            if size > self.max_output:
+                raise CommandProcessError(" ".join(argv), f"Output exceeded {self.max_output} bytes")
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    @staticmethod
+    async def _feed(proc: asyncio.subprocess.Process, stdin: str | None) -> None:
+        if stdin is None or not proc.stdin:
+            return
+        # Like communicate, a command that exits without reading its input is not an error
+        with contextlib.suppress(BrokenPipeError, ConnectionResetError):
+            proc.stdin.write(stdin.encode())
+            await proc.stdin.drain()
+        proc.stdin.close()
+
+    async def _run_privileged(
+        self, helper: PrivilegedHelper, argv: Sequence[str], stdin: str | None, timeout: float | None
+    ) -> CmdResult:
+        async with self._slot(argv):
+            start = time.perf_counter()
+            succeeded = False
+            try:
+                result = await helper.run(argv, stdin, timeout)
+                succeeded = result.is_ok
+            finally:
+                if (metrics := get_metrics()).enabled:
+                    metrics.record_command(binary_name(argv), argv, time.perf_counter() - start, succeeded)
+        return result
+
+    async def run_batch(
+        self, dialect: BatchDialect, commands: Sequence[Sequence[str]], timeout: float | None = None
+    ) -> list[CmdResult]:
+        """Run several commands of the same tool in one process (see BatchDialect)
+
+        If the tool stops the script early (i.e. on an error), the commands that did not run are retried in another
+        script, so the results are the same as when running each command on its own.
+
+        Args:
+            dialect (BatchDialect): how the tool runs a script
+            commands (Sequence[Sequence[str]]): commands to run in order, as argument lists
+            timeout (float | None): how long all commands may take together (in seconds). Defaults to None
+                (default_timeout).
+
+        Raises:
+            CommandProcessError: Script could not be written (see BatchDialect.render), started, or did not receive a
+                return code
+            CommandTimeoutError: Commands did not complete within the timeout and were killed
+
+        Returns:
+            list[CmdResult]: one result per command. Their return code is 0 unless the script stopped at them.
+        """
+        if not commands or not all(commands):
+            raise CommandProcessError("", "Empty command")
+        timeout = self.default_timeout if timeout is None else timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        results: list[CmdResult] = []
+        while remaining := commands[len(results) :]:
+            # Random so that command output can not be mistaken for a marker
+            nonce = secrets.token_hex(4)
+            markers = [f"pywificli-batch-{nonce}-{n}" for n in range(len(remaining))]
+            left = None if deadline is None else max(0.0, deadline - time.monotonic())
+            result = await self._run_script(dialect, dialect.script(remaining, markers), left)
+            results.extend(split_output(result, markers))
+        return results
+
+    async def _run_script(self, dialect: BatchDialect, script: str, timeout: float | None) -> CmdResult:
+        if not dialect.uses_file:
+            return await self.run(dialect.argv, stdin=script, timeout=timeout)
+        # Closed before running so that the tool can open it on Windows
+        fd, filename = tempfile.mkstemp(suffix=".txt")
+        try:
+            os.write(fd, script.encode("utf-8"))
+            os.close(fd)
+            return await self.run([filename if arg == "{script}" else arg for arg in dialect.argv], timeout=timeout)
+        finally:
+            os.remove(filename)
+
+    @contextlib.asynccontextmanager
+    async def stream(
+        self, argv: Sequence[str], long_lived: bool = False, timeout: float | None = None
+    ) -> AsyncIterator[AsyncIterator[str]]:
+        """Run a command and iterate over its stdout lines as they are produced
+
+        The process is killed as soon as the context is exited so consumers can stop early. Lines are read as the
+        consumer asks for them, so a slow consumer holds the command back instead of output piling up in memory.
+
+        Args:
+            argv (Sequence[str]): command to run as argument list
+            long_lived (bool): the command runs until stopped (i.e. a monitor). Such commands do not occupy a
+                concurrency slot and their total output is not limited (only the length of each line). Defaults to
+                False.
+            timeout (float | None): how long the command may run (in seconds), including waiting for a concurrency
+                slot. Defaults to None (default_timeout, or no deadline if long-lived).
+
+        Raises:
+            CommandProcessError: Command could not be started, or its output (or a single line) exceeded max_output
+                bytes while iterating
+            CommandTimeoutError: Command did not complete within the timeout and was killed
+
+        Yields:
+            AsyncIterator[str]: decoded stdout lines without line endings
+        """
+        if not argv:
+            raise CommandProcessError("", "Empty command")
+        if timeout is None and not long_lived:
+            timeout = self.default_timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        async with contextlib.AsyncExitStack() as stack:
+            if not long_lived:
+                try:
+                    await asyncio.wait_for(stack.enter_async_context(self._slot(argv)), timeout)
+                except asyncio.TimeoutError as e:
+                    raise CommandTimeoutError(" ".join(argv), timeout or 0) from e
+            start = time.perf_counter()
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *argv,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                    # Longest line that is buffered
+                    limit=self.max_output,
+                    start_new_session=True,
+                    creationflags=_CREATION_FLAGS,
+                )
+            except OSError as e:
+                if (metrics := get_metrics()).enabled:
+                    metrics.record_command(binary_name(argv), argv, time.perf_counter() - start, False)
+                raise CommandProcessError(" ".join(argv), f"Failed to start: {e}") from e
+            self.spawn_count += 1
+
+            failed = timed_out = False
+
+            def expire() -> None:
+                nonlocal timed_out
+                timed_out = True
+                # Ends the output, so the consumer gets CommandTimeoutError instead of the next line
+                _kill_group(proc)
+
+            if deadline is not None:
+                expiry = asyncio.get_running_loop().call_later(max(0.0, deadline - time.monotonic()), expire)
+                stack.callback(expiry.cancel)
+
+            async def lines() -> AsyncIterator[str]:
+                nonlocal failed
+                assert proc.stdout
+                size = 0
+                while True:
+                    try:
+                        line = await proc.stdout.readline()
+                    except ValueError as e:
+                        failed = True
+                        raise CommandProcessError(" ".join(argv), f"Line exceeded {self.max_output} bytes") from e
+                    if not line:
+                        if timed_out:
+                            failed = True
+                            raise CommandTimeoutError(" ".join(argv), timeout or 0)
+                        return
+                    size += len(line)
+                    if size > self.max_output and not long_lived:
+                        failed = True
+                        raise CommandProcessError(" ".join(argv), f"Output exceeded {self.max_output} bytes")
+                    yield line.decode().rstrip("\r\n")
+
+            stopped = False
+            try:
+                yield lines()
+            finally:
+                if proc.returncode is None:
+                    stopped = True
+                await _kill(proc)
+                if (metrics := get_metrics()).enabled:
+                    # Stopping a command early is not a failure
+                    succeeded = not failed and (stopped or proc.returncode == 0)
+                    metrics.record_command(binary_name(argv), argv, time.perf_counter() - start, succeeded)
+
+
+_executor = CommandExecutor()
+
+
+def get_executor() -> CommandExecutor:
+    """Get the executor used by cmd and cmdOkOrRaise
+
+    Returns:
+        CommandExecutor: current default executor
+    """
+    return _executor
+
+
+def set_executor(executor: CommandExecutor) -> None:
+    """Replace the executor used by cmd and cmdOkOrRaise
+
+    Args:
+        executor (CommandExecutor): executor to use from now on
+    """
+    global _executor
+    _executor = executor
@@ -0,0 +1,343 @@
+"""Opt-in metrics and tracing of commands and driver operations
+
+Instrumentation is disabled by default, in which case recording a command is a single attribute check and a span is a
+shared no-op context manager.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, ContextManager, Iterator, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+"""Upper bounds (in seconds) of the latency histogram buckets"""
+
+_NO_SPAN: ContextManager[None] = contextlib.nullcontext()
+
+
+def subcommand(argv: Sequence[str]) -> str:
+    """Get a low-cardinality name of what a command does (i.e. "wlan show interfaces" for "netsh wlan show interfaces")
+
+    Up to three lowercase words are used: enough to tell operations apart (i.e. "device wifi list" from "device wifi
+    connect") while SSIDs, interface names, and option values, which follow them or are not plain words, do not end up
+    in metric labels. Tools without such words (i.e. "networksetup -getairportnetwork en0") are named by their first
+    argument.
+
+    Args:
+        argv (Sequence[str]): command as argument list
+
+    Returns:
+        str: subcommand, or "" if the command has no arguments
+    """
+    words = [arg for arg in argv[1:] if arg.isalpha() and arg.islower()][:3]
+    if words:
+        return " ".join(words)
+    return argv[1] if len(argv) > 1 and argv[1].startswith("-") else ""
+
+
+class Histogram:
+    """Cumulative latency histogram in the style of Prometheus
+
+    Args:
+        buckets (Sequence[float]): sorted upper bounds of the buckets (in seconds). Defaults to DEFAULT_BUCKETS.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        # The last count holds observations above the largest bound (+Inf)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one observation
+
+        Args:
+            value (float): observed value (in seconds)
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """Get the amount of observations at or below each bound
+
+        Returns:
+            list[tuple[float, int]]: (upper bound, count) pairs, ending with (inf, total count)
+        """
+        result: list[tuple[float, int]] = []
+        total = 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def to_dict(self) -> dict[str, Any]:
+        """Export the histogram
+
+        Returns:
+            dict[str, Any]: JSON serializable count, sum, and cumulative count per upper bound ("+Inf" for all)
+        """
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": {("+Inf" if bound == float("inf") else str(bound)): count for bound, count in self.cumulative()},
+        }
+
+
+@dataclass(frozen=True)
+class CommandSample:
+    """One finished subprocess"""
+
+    binary: str
+    subcommand: str
+    duration: float
+    """Time from spawning until exit (in seconds)"""
+    succeeded: bool
+    """Started and exited with return code 0"""
+
+
+@dataclass
+class Span:
+    """One traced operation (i.e. a scan). Attributes may be added while the span is active."""
+
+    name: str
+    attributes: dict[str, Any] = field(default_factory=dict)
+    started: float = 0.0
+    """Wall clock start (in seconds since the epoch)"""
+    duration: float = 0.0
+    """Duration (in seconds), set when the span ends"""
+    error: str | None = None
+    """Exception that ended the span, if any"""
+
+
+class Metrics:
+    """Registry of command and operation metrics with pluggable hooks
+
+    Args:
+        enabled (bool): record metrics. Defaults to False.
+        buckets (Sequence[float]): histogram bucket bounds (in seconds). Defaults to DEFAULT_BUCKETS.
+    """
+
+    def __init__(self, enabled: bool = False, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self.on_command: list[Callable[[CommandSample], None]] = []
+        """Called with every finished command"""
+        self.on_span: list[Callable[[Span], None]] = []
+        """Called with every finished span"""
+        self.command_latency: dict[tuple[str, str], Histogram] = {}
+        self.spawns: dict[str, int] = {}
+        self.failures: dict[tuple[str, str], int] = {}
+        self.cache_hits: dict[str, int] = {}
+        self.operation_latency: dict[str, Histogram] = {}
+        self.operation_failures: dict[str, int] = {}
+
+    def reset(self) -> None:
+        """Drop everything recorded so far (hooks are kept)"""
+        self.command_latency.clear()
+        self.spawns.clear()
+        self.failures.clear()
+        self.cache_hits.clear()
+        self.operation_latency.clear()
+        self.operation_failures.clear()
+
+    def _histogram(self, histograms: dict[Any, Histogram], key: Any) -> Histogram:
+        if not (histogram := histograms.get(key)):
+            histogram = histograms[key] = Histogram(self.buckets)
+        return histogram
+
+    @staticmethod
+    def _notify(callbacks: list[Callable[[Any], None]], value: Any) -> None:
+        for callback in callbacks:
+            try:
+                callback(value)
+            except Exception:  # pylint: disable=broad-exception-caught
+                # Instrumentation must never break the operation it observes
+                logger.exception("Metrics hook %s failed", callback)
+
+    def record_command(self, binary: str, argv: Sequence[str], duration: float, succeeded: bool) -> None:
+        """Record a finished subprocess
+
+        Args:
+            binary (str): normalized binary name
+            argv (Sequence[str]): command that was run
+            duration (float): time from spawning until exit (in seconds)
+            succeeded (bool): the command started and exited with return code 0
+        """
+        sample = CommandSample(binary, subcommand(argv), duration, succeeded)
+        key = (sample.binary, sample.subcommand)
+        self.spawns[binary] = self.spawns.get(binary, 0) + 1
+        if not succeeded:
+            self.failures[key] = self.failures.get(key, 0) + 1
+        self._histogram(self.command_latency, key).observe(duration)
+        self._notify(self.on_command, sample)
+
+    def record_cache_hit(self, binary: str) -> None:
+        """Record a read-only command that was served without spawning a subprocess
+
+        Args:
+            binary (str): normalized binary name
+        """
+        self.cache_hits[binary] = self.cache_hits.get(binary, 0) + 1
+
+    def span(self, name: str, **attributes: Any) -> ContextManager[Span | None]:
+        """Trace an operation while the context is active
+
+        Args:
+            name (str): operation (i.e. "scan")
+            **attributes (Any): details of the operation (i.e. interface="wlan0")
+
+        Returns:
+            ContextManager[Span | None]: context yielding the span, or None if disabled
+        """
+        if not self.enabled:
+            return _NO_SPAN
+        return self._span(Span(name, attributes))
+
+    @contextlib.contextmanager
+    def _span(self, span: Span) -> Iterator[Span]:
+        span.started = time.time()
+        start = time.perf_counter()
+        try:
+            yield span
+        except Exception as e:
+            span.error = repr(e)
+            raise
+        finally:
+            span.duration = time.perf_counter() - start
+            if span.error:
+                self.operation_failures[span.name] = self.operation_failures.get(span.name, 0) + 1
+            self._histogram(self.operation_latency, span.name).observe(span.duration)
+            self._notify(self.on_span, span)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Export everything recorded so far
+
+        Returns:
+            dict[str, Any]: JSON serializable metrics
+        """
+        return {
+            "commands": [
+                {
+                    "binary": binary,
+                    "subcommand": sub,
+                    "failures": self.failures.get((binary, sub), 0),
+                    "latency": histogram.to_dict(),
+                }
+                for (binary, sub), histogram in sorted(self.command_latency.items())
+            ],
+            "spawns": dict(sorted(self.spawns.items())),
+            "cache_hits": dict(sorted(self.cache_hits.items())),
+            "operations": [
+                {
+                    "operation": name,
+                    "failures": self.operation_failures.get(name, 0),
+                    "latency": histogram.to_dict(),
+                }
+                for name, histogram in sorted(self.operation_latency.items())
+            ],
+        }
+
+    def to_json(self) -> str:
+        """Export everything recorded so far as JSON
+
+        Returns:
+            str: JSON document
+        """
+        return json.dumps(self.to_dict())
+
+    def to_prometheus(self) -> str:
+        """Export everything recorded so far in the Prometheus text exposition format
+
+        Returns:
+            str: metric families, one sample per line
+        """
+        lines: list[str] = []
+
+        def histogram(name: str, description: str, histograms: dict[Any, Histogram], labels: Callable) -> None:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, hist in sorted(histograms.items()):
+                label = labels(key)
+                for bound, count in hist.cumulative():
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{name}_bucket{{{label},le="{le}"}} {count}')
+                lines.append(f"{name}_sum{{{label}}} {hist.sum}")
+                lines.append(f"{name}_count{{{label}}} {hist.count}")
+
+        def counter(name: str, description: str, values: dict[Any, int], labels: Callable) -> None:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} counter")
+            for key, value in sorted(values.items()):
+                lines.append(f"{name}{{{labels(key)}}} {value}")
+
+        def command_labels(key: tuple[str, str]) -> str:
+            return f'binary="{_escape(key[0])}",subcommand="{_escape(key[1])}"'
+
+        def binary_labels(binary: str) -> str:
+            return f'binary="{_escape(binary)}"'
+
+        def operation_labels(name: str) -> str:
+            return f'operation="{_escape(name)}"'
+
+        histogram("pywificli_command_duration_seconds", "Subprocess run time.", self.command_latency, command_labels)
+        counter(
+            "pywificli_command_spawns_total",
+            "Subprocesses spawned (including ones that failed to start).",
+            self.spawns,
+            binary_labels,
+        )
+        counter("pywificli_command_failures_total", "Subprocesses that failed.", self.failures, command_labels)
+        counter(
+            "pywificli_command_cache_hits_total",
+            "Read-only commands served from cache.",
+            self.cache_hits,
+            binary_labels,
+        )
+        histogram(
+            "pywificli_operation_duration_seconds",
+            "Driver operation run time.",
+            self.operation_latency,
+            operation_labels,
+        )
+        counter(
+            "pywificli_operation_failures_total",
+            "Driver operations that raised.",
+            self.operation_failures,
+            operation_labels,
+        )
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """Get the metrics registry that commands and operations are recorded in
+
+    Returns:
+        Metrics: current registry
+    """
+    return _metrics
+
+
+def set_metrics(metrics: Metrics) -> None:
+    """Replace the metrics registry that commands and operations are recorded in
+
+    Args:
+        metrics (Metrics): registry to use from now on
+    """
+    global _metrics
+    _metrics = metrics
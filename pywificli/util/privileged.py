@@ -0,0 +1,162 @@
+"""Client of the long-lived privileged helper process (see privileged_helper.py)"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Sequence
+
+from pywificli.exceptions import CommandTimeoutError, PrivilegedHelperError
+from pywificli.util.privileged_helper import DEFAULT_ALLOWED
+from pywificli.util.result import CmdResult
+
+logger = logging.getLogger(__name__)
+
+HELPER_SCRIPT = Path(__file__).with_name("privileged_helper.py")
+# Read the password from stdin without prompting
+SUDO = ("sudo", "-S", "-p", "")
+
+
+class PrivilegedHelper:
+    """Run whitelisted commands through one long-lived (usually sudo'ed) helper process
+
+    Authentication happens once when the helper starts. Afterwards each command costs a message round trip over the
+    helper's stdin / stdout instead of a sudo spawn, and the password is never part of a command line.
+
+    Args:
+        allowed (Sequence[str]): binaries the helper may run. Defaults to DEFAULT_ALLOWED.
+        elevate (Sequence[str]): command prefix starting the helper with elevated privileges. Defaults to SUDO. Pass
+            () to run the helper unprivileged (i.e. in tests).
+        start_timeout (float): how long to wait for the helper to come up (in seconds). Defaults to 10.
+    """
+
+    def __init__(
+        self, allowed: Sequence[str] = DEFAULT_ALLOWED, elevate: Sequence[str] = SUDO, start_timeout: float = 10.0
+    ) -> None:
+        self.allowed = tuple(allowed)
+        self.elevate = tuple(elevate)
+        self.start_timeout = start_timeout
+        self._process: asyncio.subprocess.Process | None = None
+        self._reader: asyncio.Task[None] | None = None
+        self._pending: dict[int, asyncio.Future[dict]] = {}
+        self._ids = itertools.count()
+
+    @property
+    def running(self) -> bool:
+        """Is the helper up and answering requests?"""
+        return bool(self._process and self._process.returncode is None and self._reader and not self._reader.done())
+
+    async def start(self, password: str | None = None) -> None:
+        """Start the helper and wait until it is ready
+
+        Args:
+            password (str | None): sudo password, written to the helper's stdin ahead of any request. Defaults to None.
+
+        Raises:
+            PrivilegedHelperError: The helper could not be started (i.e. the password was rejected)
+        """
+        if self.running:
+            return
+        argv = [*self.elevate, sys.executable, "-I", str(HELPER_SCRIPT)]
+        for binary in self.allowed:
+            argv += ["--allow", binary]
+        logger.debug("Starting privileged helper ==> %s", argv)
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *argv,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                # Responses carry whole command outputs on a single line
+                limit=2**26,
+            )
+        except OSError as e:
+            raise PrivilegedHelperError(f"Failed to start: {e}") from e
+        assert process.stdin and process.stdout
+        if password is not None:
+            # Empty lines make sudo give up right away on a wrong password instead of waiting for another attempt.
+            # The helper ignores them (as well as the password, if sudo did not need it).
+            process.stdin.write(f"{password}\n\n\n".encode())
+        started = False
+        try:
+            line = await asyncio.wait_for(process.stdout.readline(), self.start_timeout)
+            message = json.loads(line) if line else None
+            if not isinstance(message, dict) or not message.get("ready"):
+                raise PrivilegedHelperError("Helper exited before it was ready (wrong password?)")
+            started = True
+        except (asyncio.TimeoutError, ValueError) as e:
+            raise PrivilegedHelperError(f"Helper did not become ready: {e!r}") from e
+        finally:
+            if not started:
+                with contextlib.suppress(ProcessLookupError):
+                    process.kill()
+                await process.wait()
+        self._process = process
+        self._reader = asyncio.ensure_future(self._read_responses(process))
+        logger.info("Privileged helper started (pid %s)", process.pid)
+
+    async def _read_responses(self, process: asyncio.subprocess.Process) -> None:
+        assert process.stdout
+        try:
+            async for line in process.stdout:
+                response = json.loads(line)
+                if (future := self._pending.pop(response.get("id"), None)) and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(PrivilegedHelperError("Helper exited"))
+            self._pending.clear()
+
+    async def run(self, argv: Sequence[str], stdin: str | None = None, timeout: float | None = None) -> CmdResult:
+        """Run a command through the helper
+
+        Args:
+            argv (Sequence[str]): command to run as argument list. The binary must be one of allowed.
+            stdin (str | None): input to write to the command's stdin. Defaults to None.
+            timeout (float | None): how long the command may take (in seconds) before the helper kills it. Defaults to
+                None (no deadline).
+
+        Raises:
+            PrivilegedHelperError: The helper is not running or refused the command
+            CommandTimeoutError: The command did not complete within the timeout and was killed
+
+        Returns:
+            CmdResult: stdout, stderr, and return code
+        """
+        if not self.running or not self._process or not self._process.stdin:
+            raise PrivilegedHelperError("Helper is not running")
+        request_id = next(self._ids)
+        future = self._pending[request_id] = asyncio.get_running_loop().create_future()
+        self._process.stdin.write(
+            (json.dumps({"id": request_id, "argv": list(argv), "stdin": stdin, "timeout": timeout}) + "\n").encode()
+        )
+        try:
+            await self._process.stdin.drain()
+            response = await future
+        finally:
+            self._pending.pop(request_id, None)
+        if response.get("timed_out"):
+            raise CommandTimeoutError(" ".join(argv), timeout or 0)
+        if error := response.get("error"):
+            raise PrivilegedHelperError(f"{' '.join(argv)}: {error}")
+        return CmdResult(
+            return_code=response["return_code"], stdout=response["stdout"] or None, stderr=response["stderr"] or None
+        )
+
+    async def close(self) -> None:
+        """Stop the helper, letting requests in flight complete"""
+        if not (process := self._process):
+            return
+        self._process = None
+        if process.stdin:
+            process.stdin.close()
+        await process.wait()
+        if self._reader:
+            await self._reader
+        logger.info("Privileged helper stopped")
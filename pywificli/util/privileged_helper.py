@@ -0,0 +1,126 @@
+"""Privileged helper process running whitelisted commands on behalf of pywificli
+
+Started once (usually through sudo) by PrivilegedHelper and then fed requests over its stdin, so that privileged
+commands do not each pay for a sudo spawn and authentication. This file only depends on the standard library since it
+runs isolated (python -I) as another user, where pywificli might not be importable.
+
+Protocol (one JSON object per line):
+    helper -> client, once started: {"ready": true, "allowed": [binary, ...]}
+    client -> helper: {"id": int, "argv": [binary, arg, ...], "stdin": str | null, "timeout": float | null}
+    helper -> client: {"id": int, "return_code": int, "stdout": str, "stderr": str} or {"id": int, "error": str}
+        or, once the command's process group was killed for exceeding the timeout, {"id": int, "timed_out": true}
+
+Requests are run concurrently and answered as they complete. Lines that are not requests (i.e. the sudo password when
+sudo did not ask for it) are ignored without being echoed. The helper exits when its stdin is closed.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+from typing import Any, TextIO
+
+# Binaries drivers may run with elevated privileges
+DEFAULT_ALLOWED = ("nmcli", "wpa_cli", "iw", "ip", "rfkill")
+MAX_WORKERS = 8
+
+
+def handle(request: dict[str, Any], allowed: frozenset[str]) -> dict[str, Any]:
+    """Run one request
+
+    Args:
+        request (dict[str, Any]): request (see module docstring)
+        allowed (frozenset[str]): binaries that may be run
+
+    Returns:
+        dict[str, Any]: response (see module docstring)
+    """
+    argv, stdin, timeout = request.get("argv"), request.get("stdin"), request.get("timeout")
+    if not isinstance(argv, list) or not argv or not all(isinstance(arg, str) for arg in argv):
+        return {"id": request["id"], "error": "argv must be a non-empty list of strings"}
+    if stdin is not None and not isinstance(stdin, str):
+        return {"id": request["id"], "error": "stdin must be a string"}
+    if timeout is not None and (not isinstance(timeout, (int, float)) or timeout < 0):
+        return {"id": request["id"], "error": "timeout must be a non-negative number"}
+    # Only bare names, which are looked up on the helper's PATH (sudo's secure_path)
+    if argv[0] not in allowed:
+        return {"id": request["id"], "error": f"{argv[0]} is not allowed"}
+    if not (binary := shutil.which(argv[0])):
+        return {"id": request["id"], "error": f"{argv[0]} not found"}
+    try:
+        # In a session of its own so that a timeout also kills whatever the command spawned
+        process = subprocess.Popen(  # pylint: disable=consider-using-with
+            [binary, *argv[1:]],
+            stdin=subprocess.PIPE if stdin is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            start_new_session=True,
+        )
+    except OSError as e:
+        return {"id": request["id"], "error": f"Failed to start: {e}"}
+    try:
+        stdout, stderr = process.communicate(stdin, timeout)
+    except subprocess.TimeoutExpired:
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(process.pid, signal.SIGKILL)
+        process.communicate()
+        return {"id": request["id"], "timed_out": True}
+    return {"id": request["id"], "return_code": process.returncode, "stdout": stdout, "stderr": stderr}
+
+
+def serve(allowed: frozenset[str], requests: TextIO, responses: TextIO) -> None:
+    """Answer requests until the request stream is closed
+
+    Args:
+        allowed (frozenset[str]): binaries that may be run
+        requests (TextIO): stream of requests
+        responses (TextIO): stream to write responses to
+    """
+    # Deferred (like argparse in main) since the client imports this module for DEFAULT_ALLOWED
+    from concurrent.futures import ThreadPoolExecutor  # pylint: disable=import-outside-toplevel
+
+    lock = threading.Lock()
+
+    def respond(response: dict[str, Any]) -> None:
+        with lock:
+            responses.write(json.dumps(response) + "\n")
+            responses.flush()
+
+    def run(request: dict[str, Any]) -> None:
+        try:
+            response = handle(request, allowed)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            response = {"id": request["id"], "error": repr(e)}
+        respond(response)
+
+    respond({"ready": True, "allowed": sorted(allowed)})
+    with ThreadPoolExecutor(MAX_WORKERS) as pool:
+        for line in requests:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(request, dict) and isinstance(request.get("id"), int):
+                pool.submit(run, request)
+
+
+def main() -> None:
+    import argparse  # pylint: disable=import-outside-toplevel
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--allow", action="append", metavar="BINARY", help=f"binary that may be run (default: {DEFAULT_ALLOWED})"
+    )
+    args = parser.parse_args()
+    serve(frozenset(args.allow or DEFAULT_ALLOWED), sys.stdin, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
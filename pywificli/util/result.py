@@ -0,0 +1,32 @@
+"""Command result entities"""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class CmdResult:
+    """All of the information about the result of a command"""
+
+    return_code: int
+    stdout: str | None
+    stderr: str | None
+
+    @property
+    def is_ok(self) -> bool:
+        """Was the command successful (its return code is 0)
+
+        Returns:
+            bool: True if ok, False otherwise
+        """
+        return self.return_code == 0
+
+    @property
+    def stdout_or_raise(self) -> str:
+        if not self.stdout:
+            raise ValueError("Stdout is not available")
+        return self.stdout
+
+
+@dataclass
+class CmdResultOk(CmdResult):
+    stdout: str
@@ -0,0 +1,89 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Iterator
+
+import pytest
+from fakes.tools import FakeTools
+
+BASELINES = Path(__file__).parent / "baselines.json"
+
+# Set to re-record baselines.json from this run
+UPDATE_BASELINES = os.environ.get("PYWIFICLI_UPDATE_BASELINES") == "1"
+# How much slower than its baseline a benchmark may be before it fails
+TOLERANCE = float(os.environ.get("PYWIFICLI_BENCHMARK_TOLERANCE", "2.0"))
+# Absolute allowance (in spawns) so that benchmarks without any spawns do not fail on scheduler noise
+SLACK = 0.1
+
+
+def _traced() -> bool:
+    """Is a tracer (i.e. coverage or a debugger) slowing down in-process code?"""
+    return sys.gettrace() is not None
+
+
+class Baselines:
+    """Compare benchmark timings against stored baselines
+
+    Timings are stored relative to the time it takes to spawn a python interpreter (which all fake tools are), so
+    that baselines recorded on one machine remain meaningful on another.
+
+    Args:
+        path (Path): baselines file
+        spawn_time (float): time to spawn an idle python interpreter on this machine (in seconds)
+    """
+
+    def __init__(self, path: Path, spawn_time: float) -> None:
+        self.path = path
+        self.spawn_time = spawn_time
+        self.stored: dict[str, float] = json.loads(path.read_text()) if path.exists() else {}
+        self.measured: dict[str, float] = {}
+
+    def check(self, name: str, elapsed: float) -> None:
+        """Record a timing and fail if it regressed past the tolerance
+
+        Comparisons are skipped while tracing (i.e. when running with coverage) since that skews in-process timings.
+
+        Args:
+            name (str): benchmark name
+            elapsed (float): measured time (in seconds)
+        """
+        relative = elapsed / self.spawn_time
+        self.measured[name] = round(relative, 3)
+        baseline = self.stored.get(name)
+        print(f"\n{name}: {elapsed * 1e3:.1f} ms = {relative:.2f} spawns (baseline {baseline})")
+        if UPDATE_BASELINES or baseline is None or _traced():
+            return
+        assert (
+            relative <= baseline * TOLERANCE + SLACK
+        ), f"{name} regressed: {relative:.2f} spawns vs baseline {baseline}"
+
+    def save(self) -> None:
+        self.path.write_text(json.dumps({**self.stored, **self.measured}, indent=4, sort_keys=True) + "\n")
+
+
+@pytest.fixture(scope="session")
+def baselines() -> Iterator[Baselines]:
+    baselines = Baselines(BASELINES, statistics.median(_time_spawn() for _ in range(5)))
+    yield baselines
+    if UPDATE_BASELINES:
+        baselines.save()
+
+
+def _time_spawn() -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return time.perf_counter() - start
+
+
+@pytest.fixture
+def fake_tools(fake_binary) -> Callable[..., FakeTools]:
+    """Get a function taking (latency, networks) that returns a FakeTools installing onto the fake PATH"""
+
+    def create(latency: float = 0.0, networks: int = 50) -> FakeTools:
+        return FakeTools(fake_binary, latency, networks)
+
+    return create
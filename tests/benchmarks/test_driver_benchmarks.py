@@ -0,0 +1,136 @@
+"""Detection, scan, connection-state polling and connect loops of every driver against fake OS tools
+
+Timings are compared against tests/benchmarks/baselines.json (see conftest.py). Re-record them with
+PYWIFICLI_UPDATE_BASELINES=1 after intended performance changes.
+"""
+
+import contextlib
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+from fakes.tools import FakeTools
+from fakes.wpa_supplicant import FakeWpaSupplicant
+from vectors.english import wpa
+
+from pywificli.components.driver_factory import WifiDriverFactory
+from pywificli.domain.driver import ConnectionState, IWifiDriver
+from pywificli.domain.metadata import DriverType
+from pywificli.drivers.english import EnglishLinuxNmcliLegacy, EnglishLinuxWindows, EnglishLinuxWpa
+from pywificli.util import CommandExecutor, set_executor
+
+NETWORKS = 200
+SCANS = 3
+POLLS = 20
+CONNECTS = 5
+
+# Interface each driver's fake tooling reports as disconnected
+INTERFACES = {"netsh": "Wi-Fi 2", "nmcli": "wlan0", "wpa": "wlan0"}
+
+
+@contextlib.asynccontextmanager
+async def driver_for(tool: str, tools: FakeTools) -> AsyncIterator[IWifiDriver]:
+    """Set up a driver with its fake tooling
+
+    Args:
+        tool (str): "netsh", "nmcli" or "wpa" (wpa_supplicant's control socket)
+        tools (FakeTools): fake tools to install
+
+    Yields:
+        IWifiDriver: driver
+    """
+    # Every query should reach the tool
+    set_executor(CommandExecutor(cache_ttl=0))
+    if tool == "netsh":
+        tools.install("netsh")
+        yield EnglishLinuxWindows()
+    elif tool == "nmcli":
+        tools.install("nmcli")
+        yield EnglishLinuxNmcliLegacy()
+    else:
+        ctrl_dir = Path(tempfile.mkdtemp(prefix="wpa"))
+        supplicant = FakeWpaSupplicant(
+            str(ctrl_dir / "wlan0"), {"Home": "password"}, wpa.scan_results(tools.networks), tools.latency
+        )
+        await supplicant.start()
+        driver = EnglishLinuxWpa(ctrl_dir)
+        try:
+            yield driver
+        finally:
+            driver.close()
+            supplicant.stop()
+            shutil.rmtree(ctrl_dir)
+
+
+@pytest.mark.parametrize(
+    "tool, driver_type",
+    [
+        ("nmcli", DriverType.LINUX_NMCLI_LEGACY),
+        ("networksetup", DriverType.MAC_OS),
+        ("wpa_supplicant", DriverType.LINUX_WPA),
+    ],
+)
+@pytest.mark.asyncio
+async def test_detection(tool: str, driver_type: DriverType, fake_tools, baselines, monkeypatch: pytest.MonkeyPatch):
+    # GIVEN only this tool is installed (netsh is only considered on Windows)
+    path = fake_tools().install(tool)
+    monkeypatch.setenv("PATH", str(path.parent))
+    monkeypatch.setenv("LANG", "en_US")
+    factory = WifiDriverFactory(use_detection_cache=False, use_dbus=False)
+
+    # WHEN
+    start = time.perf_counter()
+    detection = await factory._detect()
+    elapsed = time.perf_counter() - start
+
+    # THEN
+    assert detection.driver_type == driver_type
+    baselines.check(f"detection[{tool}]", elapsed)
+
+
+@pytest.mark.parametrize("tool", ["netsh", "nmcli", "wpa"])
+@pytest.mark.asyncio
+async def test_scan(tool: str, fake_tools, baselines):
+    async with driver_for(tool, fake_tools(networks=NETWORKS)) as driver:
+        # WHEN
+        start = time.perf_counter()
+        for _ in range(SCANS):
+            results = await driver.scan(INTERFACES[tool], 5)
+        elapsed = (time.perf_counter() - start) / SCANS
+
+    # THEN netsh reports two BSSIDs per network
+    assert len(results) == NETWORKS * (2 if tool == "netsh" else 1)
+    baselines.check(f"scan[{tool}]", elapsed)
+
+
+@pytest.mark.parametrize("tool", ["netsh", "nmcli", "wpa"])
+@pytest.mark.asyncio
+async def test_connection_state_polling(tool: str, fake_tools, baselines):
+    async with driver_for(tool, fake_tools()) as driver:
+        # WHEN
+        start = time.perf_counter()
+        for _ in range(POLLS):
+            state = await driver.get_connection_state(INTERFACES[tool])
+        elapsed = (time.perf_counter() - start) / POLLS
+
+    # THEN
+    assert state == (ConnectionState.DISCONNECTED, "")
+    baselines.check(f"connection_state_polling[{tool}]", elapsed)
+
+
+@pytest.mark.parametrize("tool", ["netsh", "nmcli", "wpa"])
+@pytest.mark.asyncio
+async def test_connect_loop(tool: str, fake_tools, baselines):
+    async with driver_for(tool, fake_tools()) as driver:
+        # WHEN
+        start = time.perf_counter()
+        for _ in range(CONNECTS):
+            assert await driver.connect(INTERFACES[tool], "Home", "password", 5)
+            assert await driver.disconnect(INTERFACES[tool])
+        elapsed = (time.perf_counter() - start) / CONNECTS
+
+    # THEN
+    baselines.check(f"connect_loop[{tool}]", elapsed)
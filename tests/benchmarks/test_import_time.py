@@ -0,0 +1,65 @@
+"""Cold start import time budget (based on python -X importtime)"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative import time budget in milliseconds. Override for slow machines.
+BUDGET_MS = float(os.environ.get("PYWIFICLI_IMPORT_BUDGET_MS", "150"))
+RUNS = 5
+
+# Modules applications and the command line interface start from
+ENTRYPOINTS = ["pywificli.components.driver_factory", "pywificli.scripts.scan_ssids", "pywificli.scripts.cli"]
+
+# Modules that must only be imported once they are actually needed
+DEFERRED = [
+    "rich",
+    "ctypes",
+    "getpass",
+    "packaging.version",
+    "pywificli.drivers.english.linux_nmcli",
+    "pywificli.drivers.english.linux_nmcli_legacy",
+    "pywificli.drivers.english.linux_wpa",
+    "pywificli.drivers.english.macos",
+    "pywificli.drivers.english.windows",
+]
+
+
+def cumulative_import_time_us(module: str) -> int:
+    """Import a module in a fresh interpreter and get its cumulative import time in microseconds"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True
+    )
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative)
+    raise RuntimeError(f"{module} not found in importtime output")
+
+
+@pytest.mark.parametrize("module", ENTRYPOINTS)
+def test_import_time_is_within_budget(module: str):
+    # WHEN
+    best = min(cumulative_import_time_us(module) for _ in range(RUNS)) / 1000
+
+    # THEN
+    print(f"\n{module}: {best:.1f} ms (budget {BUDGET_MS:.0f} ms)")
+    assert best < BUDGET_MS
+
+
+@pytest.mark.parametrize("module", ENTRYPOINTS)
+def test_heavy_modules_are_deferred(module: str):
+    # WHEN
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys, {module}; print(' '.join(sorted(sys.modules)))"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # THEN
+    loaded = set(result.stdout.split())
+    assert [name for name in DEFERRED if name in loaded] == []
@@ -0,0 +1,52 @@
+"""Parsing throughput over large (dense RF environment) netsh outputs"""
+
+import re
+import time
+
+from vectors.english import netsh
+
+from pywificli.drivers.english.netsh_parser import parse_interfaces, parse_networks
+
+NETWORKS = 500
+BSSIDS = 4
+ITERATIONS = 10
+
+
+def legacy_scan(output: str) -> list[str]:
+    """The original look-behind based SSID extraction"""
+    return [m[1] for m in re.findall(r"(?<=^SSID\s(\d)\s:\s)(.*)$", output, flags=re.MULTILINE)]
+
+
+def test_parse_networks_throughput():
+    # GIVEN
+    lines = netsh.show_networks_bssid(NETWORKS, BSSIDS).splitlines()
+
+    # WHEN
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        networks = parse_networks(lines)
+    elapsed = (time.perf_counter() - start) / ITERATIONS
+
+    # THEN
+    assert len(networks) == NETWORKS
+    assert sum(len(network.bssids) for network in networks) == NETWORKS * BSSIDS
+    print(f"\nparsed {NETWORKS} SSIDs / {NETWORKS * BSSIDS} BSSIDs ({len(lines)} lines) in {elapsed * 1e3:.2f} ms")
+    # The legacy parser silently drops every SSID past the 9th
+    assert len(legacy_scan("\n".join(lines))) == 9
+    assert elapsed < 0.25
+
+
+def test_parse_interfaces_throughput():
+    # GIVEN
+    lines = (netsh.SHOW_INTERFACES * 100).splitlines()
+
+    # WHEN
+    start = time.perf_counter()
+    for _ in range(ITERATIONS * 10):
+        interfaces = parse_interfaces(lines)
+    elapsed = (time.perf_counter() - start) / (ITERATIONS * 10)
+
+    # THEN
+    assert len(interfaces) == 200
+    print(f"\nparsed {len(interfaces)} interfaces ({len(lines)} lines) in {elapsed * 1e3:.2f} ms")
+    assert elapsed < 0.1
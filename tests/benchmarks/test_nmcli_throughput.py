@@ -0,0 +1,104 @@
+"""Throughput of the nmcli driver against a fake nmcli serving recorded output"""
+
+import asyncio
+import re
+import time
+
+import pytest
+from vectors.english import nmcli
+
+from pywificli.drivers.english import EnglishLinuxNmcliLegacy
+from pywificli.drivers.english.nmcli_parser import parse_wifi_list_line, split_terse
+from pywificli.util import CommandExecutor, get_executor, set_executor
+
+NETWORKS = 2000
+QUERIES = 50
+
+
+@pytest.fixture
+def fake_nmcli(fake_binary):
+    output = nmcli.wifi_list(NETWORKS)
+    return fake_binary(
+        "nmcli",
+        f"""
+        import sys
+        sys.stdout.write({nmcli.DEVICE_STATUS!r} if "status" in sys.argv else {output!r})
+        """,
+    )
+
+
+@pytest.fixture
+def uncached_executor():
+    previous = get_executor()
+    set_executor(CommandExecutor(cache_ttl=0))
+    yield
+    set_executor(previous)
+
+
+def regex_split(line: str) -> list[str]:
+    """Reference implementation: split on unescaped colons with a regex, then unescape"""
+    return [re.sub(r"\\(.)", r"\1", field) for field in re.split(r"(?<!\\):", line)]
+
+
+def test_terse_split_throughput():
+    # GIVEN
+    lines = nmcli.wifi_list(NETWORKS).splitlines() + nmcli.DEVICE_STATUS.splitlines() * 500
+
+    # WHEN
+    start = time.perf_counter()
+    fast = [split_terse(line) for line in lines]
+    fast_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    reference = [regex_split(line) for line in lines]
+    regex_elapsed = time.perf_counter() - start
+
+    # THEN
+    assert fast == reference
+    print(f"\nsplit {len(lines)} lines: {fast_elapsed * 1e3:.2f} ms (regex {regex_elapsed * 1e3:.2f} ms)")
+    assert fast_elapsed < regex_elapsed
+
+
+def test_scan_parsing_throughput():
+    # GIVEN
+    lines = nmcli.wifi_list(NETWORKS).splitlines()
+
+    # WHEN
+    start = time.perf_counter()
+    results = [parse_wifi_list_line(line) for line in lines]
+    elapsed = time.perf_counter() - start
+
+    # THEN
+    assert all(results)
+    print(f"\nparsed {NETWORKS} access points in {elapsed * 1e3:.2f} ms")
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_state_query_throughput(fake_nmcli, uncached_executor):
+    # GIVEN
+    driver = EnglishLinuxNmcliLegacy()
+
+    # WHEN
+    start = time.perf_counter()
+    for _ in range(QUERIES):
+        await driver.get_connection_state("wlan0")
+    sequential = (time.perf_counter() - start) / QUERIES
+    start = time.perf_counter()
+    await asyncio.gather(*[driver.get_connection_state("wlan0") for _ in range(QUERIES)])
+    coalesced = (time.perf_counter() - start) / QUERIES
+
+    # THEN
+    print(f"\nstate query: {sequential * 1e3:.2f} ms sequential, {coalesced * 1e3:.2f} ms concurrent (coalesced)")
+    assert coalesced < sequential
+
+
+@pytest.mark.asyncio
+async def test_full_scan_throughput(fake_nmcli):
+    # WHEN
+    start = time.perf_counter()
+    results = await EnglishLinuxNmcliLegacy().scan("wlan0", 10)
+    elapsed = time.perf_counter() - start
+
+    # THEN
+    assert len(results) == NETWORKS
+    print(f"\nscan of {NETWORKS} access points through fake nmcli: {elapsed * 1e3:.2f} ms")
@@ -0,0 +1,62 @@
+"""Memory footprint of survey-scale scan result sets"""
+
+import tracemalloc
+
+from pywificli.domain.scan import ScanBatch, ScanResult
+
+RESULTS = 50_000
+
+
+def make_results() -> list[ScanResult]:
+    securities = ["WPA2-Personal", "WPA3-Personal", "Open"]
+    return [
+        ScanResult(
+            f"Network{i % 5000}",
+            -30 - i % 60,
+            f"aa:bb:cc:{i >> 8 & 0xFF:02x}:{i & 0xFF:02x}:01",
+            36,
+            5180,
+            securities[i % 3],
+        )
+        for i in range(RESULTS)
+    ]
+
+
+def measure(build) -> int:
+    tracemalloc.start()
+    try:
+        kept = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(kept) == RESULTS
+    return size
+
+
+def test_batch_uses_less_memory_than_objects():
+    # GIVEN
+    results = make_results()
+
+    # WHEN
+    objects = measure(
+        lambda: [ScanResult(r.ssid, r.rssi, r.bssid, r.channel, r.frequency, r.security) for r in results]
+    )
+    batch = measure(lambda: ScanBatch(results))
+
+    # THEN
+    print(f"\n{RESULTS} results: objects {objects / 1e6:.2f} MB, batch {batch / 1e6:.2f} MB")
+    assert batch < objects / 2
+
+
+def test_batch_operations_at_scale():
+    # GIVEN
+    results = make_results()
+    batch = ScanBatch(results)
+
+    # WHEN
+    strongest = batch.dedupe_by_ssid().sorted_by_signal()
+
+    # THEN
+    assert len(strongest) == 5000
+    assert strongest[0].rssi == -30
+    assert len(batch.filter(min_rssi=-40)) == sum(1 for result in results if result.rssi >= -40)
@@ -0,0 +1,46 @@
+"""Compare the spawn overhead of shell-based vs direct (exec) command execution"""
+
+import asyncio
+import logging
+import shutil
+import time
+
+import pytest
+
+from pywificli.util import CommandExecutor
+
+logger = logging.getLogger(__name__)
+
+ITERATIONS = 50
+
+
+async def spawn_with_shell(command: str) -> None:
+    proc = await asyncio.create_subprocess_shell(
+        command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    await proc.communicate()
+
+
+@pytest.mark.skipif(not shutil.which("true"), reason="Requires a POSIX 'true' binary")
+@pytest.mark.asyncio
+async def test_exec_spawn_overhead_is_lower_than_shell():
+    # GIVEN
+    executor = CommandExecutor(max_concurrency=1)
+    true = shutil.which("true")
+    assert true
+
+    # WHEN
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await spawn_with_shell(true)
+    shell = (time.perf_counter() - start) / ITERATIONS
+
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await executor.run([true])
+    direct = (time.perf_counter() - start) / ITERATIONS
+
+    # THEN
+    print(f"\nshell spawn: {shell * 1e3:.3f} ms / command, exec spawn: {direct * 1e3:.3f} ms / command")
+    # Leave some headroom for scheduler noise
+    assert direct < shell * 1.2
@@ -0,0 +1,50 @@
+"""Status queries over the wpa_supplicant control socket versus spawning wpa_cli for each"""
+
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+from fakes.tools import FakeTools
+from fakes.wpa_supplicant import FakeWpaSupplicant
+
+from pywificli.drivers.english import EnglishLinuxWpa
+from pywificli.util import CommandExecutor, cmdOkOrRaise, get_executor, set_executor
+
+SOCKET_QUERIES = 500
+SPAWN_QUERIES = 20
+
+
+@pytest.mark.asyncio
+async def test_status_query_throughput(fake_binary):
+    # GIVEN
+    ctrl_dir = Path(tempfile.mkdtemp(prefix="wpa"))
+    supplicant = FakeWpaSupplicant(str(ctrl_dir / "wlan0"), {})
+    await supplicant.start()
+    driver = EnglishLinuxWpa(ctrl_dir)
+    FakeTools(fake_binary).install("wpa_cli")
+    previous = get_executor()
+    set_executor(CommandExecutor(cache_ttl=0))
+
+    try:
+        # WHEN
+        await driver.get_connection_state("wlan0")
+        start = time.perf_counter()
+        for _ in range(SOCKET_QUERIES):
+            await driver.get_connection_state("wlan0")
+        over_socket = (time.perf_counter() - start) / SOCKET_QUERIES
+        start = time.perf_counter()
+        for _ in range(SPAWN_QUERIES):
+            await cmdOkOrRaise(["wpa_cli", "-i", "wlan0", "status"], read_only=True)
+        spawned = (time.perf_counter() - start) / SPAWN_QUERIES
+    finally:
+        set_executor(previous)
+        driver.close()
+        supplicant.stop()
+        shutil.rmtree(ctrl_dir)
+
+    # THEN
+    print(f"\nstatus query: {over_socket * 1e6:.0f} us over the socket, {spawned * 1e6:.0f} us spawning wpa_cli")
+    assert supplicant.commands["STATUS"] == SOCKET_QUERIES + 1
+    assert over_socket * 5 < spawned
@@ -1,9 +1,15 @@
 import logging
+import os
+import stat
+import sys
+import textwrap
 from pathlib import Path
+from typing import Callable, Iterator
 
 import pytest
 
 from pywificli.logging import set_logging_level, setup_logging
+from pywificli.util import CommandExecutor, get_executor, set_executor
 
 ##############################################################################################################
 #                                             Log Management
@@ -40,3 +46,32 @@ def test_log(request):
 ##############################################################################################################
 
 # TODO detect OS and pass into tests
+
+##############################################################################################################
+#  Fake OS tools
+##############################################################################################################
+
+
+@pytest.fixture
+def fake_binary(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Callable[[str, str], Path]]:
+    """Install fake command line tools (python scripts) at the front of PATH
+
+    Commands run on a fresh executor so that no output cached from another test's fakes is served.
+
+    Yields:
+        Callable[[str, str], Path]: function taking (binary name, python script body) that returns the binary's path
+    """
+    previous = get_executor()
+    set_executor(CommandExecutor())
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+
+    def install(name: str, script: str) -> Path:
+        path = bin_dir / name
+        path.write_text(f"#!{sys.executable}\n" + textwrap.dedent(script))
+        path.chmod(path.stat().st_mode | stat.S_IEXEC)
+        return path
+
+    yield install
+    set_executor(previous)
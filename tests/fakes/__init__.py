@@ -0,0 +1 @@
+"""Stand-ins for system services used by the drivers"""
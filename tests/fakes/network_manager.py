@@ -0,0 +1,272 @@
+"""A stand-in for NetworkManager's D-Bus API, to be served on a private bus"""
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+
+from dbus_next import DBusError, Variant
+from dbus_next.aio import MessageBus
+from dbus_next.service import PropertyAccess, ServiceInterface, dbus_property, method, signal
+
+NM_PATH = "/org/freedesktop/NetworkManager"
+WIFI_DEVICE = f"{NM_PATH}/Devices/3"
+ETHERNET_DEVICE = f"{NM_PATH}/Devices/1"
+
+# NMDeviceState
+DISCONNECTED, PREPARE, NEED_AUTH, ACTIVATED, FAILED = 30, 40, 60, 100, 120
+
+
+@dataclass
+class AccessPoint:
+    ssid: str
+    bssid: str
+    frequency: int
+    strength: int
+    flags: int = 0x1
+    wpa_flags: int = 0
+    rsn_flags: int = 0x188
+
+
+class FakeAccessPoint(ServiceInterface):
+    def __init__(self, access_point: AccessPoint):
+        super().__init__("org.freedesktop.NetworkManager.AccessPoint")
+        self.access_point = access_point
+
+    @dbus_property(access=PropertyAccess.READ)
+    def Ssid(self) -> "ay":
+        return self.access_point.ssid.encode()
+
+    @dbus_property(access=PropertyAccess.READ)
+    def HwAddress(self) -> "s":
+        return self.access_point.bssid
+
+    @dbus_property(access=PropertyAccess.READ)
+    def Frequency(self) -> "u":
+        return self.access_point.frequency
+
+    @dbus_property(access=PropertyAccess.READ)
+    def Strength(self) -> "y":
+        return self.access_point.strength
+
+    @dbus_property(access=PropertyAccess.READ)
+    def Flags(self) -> "u":
+        return self.access_point.flags
+
+    @dbus_property(access=PropertyAccess.READ)
+    def WpaFlags(self) -> "u":
+        return self.access_point.wpa_flags
+
+    @dbus_property(access=PropertyAccess.READ)
+    def RsnFlags(self) -> "u":
+        return self.access_point.rsn_flags
+
+
+class FakeConnection(ServiceInterface):
+    def __init__(self, service: "FakeNetworkManagerService", path: str):
+        super().__init__("org.freedesktop.NetworkManager.Settings.Connection")
+        self.service = service
+        self.path = path
+
+    @method()
+    def GetSettings(self) -> "a{sa{sv}}":
+        # Like NetworkManager, leave out the secrets
+        settings = self.service.connections[self.path]
+        return {
+            name: {key: value for key, value in section.items() if key != "psk"} for name, section in settings.items()
+        }
+
+    @method()
+    def Update(self, properties: "a{sa{sv}}") -> None:
+        self.service.calls["Update"] += 1
+        self.service.connections[self.path] = properties
+
+    @method()
+    def Delete(self) -> None:
+        self.service.connections.pop(self.path)
+        self.service.bus.unexport(self.path)
+
+
+class FakeSettings(ServiceInterface):
+    def __init__(self, service: "FakeNetworkManagerService"):
+        super().__init__("org.freedesktop.NetworkManager.Settings")
+        self.service = service
+
+    @method()
+    def ListConnections(self) -> "ao":
+        return list(self.service.connections)
+
+
+class FakeDevice(ServiceInterface):
+    def __init__(self, interface: str, device_type: int):
+        super().__init__("org.freedesktop.NetworkManager.Device")
+        self.interface = interface
+        self.device_type = device_type
+        self.state = DISCONNECTED
+
+    def set_state(self, state: int, reason: int = 0) -> None:
+        old, self.state = self.state, state
+        self.StateChanged(state, old, reason)
+
+    @dbus_property(access=PropertyAccess.READ)
+    def Interface(self) -> "s":
+        return self.interface
+
+    @dbus_property(access=PropertyAccess.READ)
+    def DeviceType(self) -> "u":
+        return self.device_type
+
+    @dbus_property(access=PropertyAccess.READ)
+    def State(self) -> "u":
+        return self.state
+
+    @method()
+    def Disconnect(self) -> None:
+        self.set_state(DISCONNECTED, 39)
+
+    @signal()
+    def StateChanged(self, new: int, old: int, reason: int) -> "uuu":
+        return [new, old, reason]
+
+
+class FakeWireless(ServiceInterface):
+    def __init__(self, service: "FakeNetworkManagerService"):
+        super().__init__("org.freedesktop.NetworkManager.Device.Wireless")
+        self.service = service
+        self.scanning = False
+        self.last_scan = -1
+        self.active_access_point = "/"
+
+    @method()
+    def RequestScan(self, options: "a{sv}") -> None:
+        if self.scanning:
+            raise DBusError("org.freedesktop.NetworkManager.Device.NotAllowed", "Scanning not allowed while scanning")
+        self.scanning = True
+        asyncio.get_running_loop().call_later(self.service.delay, self._scan_done)
+
+    def _scan_done(self) -> None:
+        for access_point in self.service.found_by_scan:
+            self.AccessPointAdded(self.service.add_access_point(access_point))
+        self.service.found_by_scan = []
+        self.scanning = False
+        self.last_scan += 1000
+        self.emit_properties_changed({"LastScan": self.last_scan})
+
+    @method()
+    def GetAllAccessPoints(self) -> "ao":
+        return list(self.service.access_points)
+
+    @dbus_property(access=PropertyAccess.READ)
+    def LastScan(self) -> "x":
+        return self.last_scan
+
+    @dbus_property(access=PropertyAccess.READ)
+    def ActiveAccessPoint(self) -> "o":
+        return self.active_access_point
+
+    @signal()
+    def AccessPointAdded(self, path: str) -> "o":
+        return path
+
+
+class FakeNetworkManager(ServiceInterface):
+    def __init__(self, service: "FakeNetworkManagerService"):
+        super().__init__("org.freedesktop.NetworkManager")
+        self.service = service
+        self.wireless_enabled = True
+
+    @method()
+    def GetDevices(self) -> "ao":
+        self.service.calls["GetDevices"] += 1
+        return [ETHERNET_DEVICE, WIFI_DEVICE]
+
+    @method()
+    def AddAndActivateConnection(self, connection: "a{sa{sv}}", device: "o", specific_object: "o") -> "oo":
+        self.service.calls["AddAndActivateConnection"] += 1
+        self.service.ids += 1
+        path = f"{NM_PATH}/Settings/{self.service.ids}"
+        self.service.connections[path] = connection
+        self.service.bus.export(path, FakeConnection(self.service, path))
+        return [path, self._activate(path)]
+
+    @method()
+    def ActivateConnection(self, connection: "o", device: "o", specific_object: "o") -> "o":
+        if connection not in self.service.connections:
+            raise DBusError("org.freedesktop.NetworkManager.UnknownConnection", f"{connection} does not exist")
+        return self._activate(connection)
+
+    def _activate(self, path: str) -> str:
+        self.service.device.set_state(PREPARE)
+        asyncio.get_running_loop().call_later(self.service.delay, self._activated, self.service.connections[path])
+        return f"{NM_PATH}/ActiveConnection/1"
+
+    def _activated(self, connection: dict[str, dict[str, Variant]]) -> None:
+        ssid = connection["802-11-wireless"]["ssid"].value.decode()
+        security = connection.get("802-11-wireless-security", {})
+        psk = security["psk"].value if "psk" in security else ""
+        if self.service.networks.get(ssid) == psk:
+            self.service.wireless.active_access_point = next(
+                (path for path, ap in self.service.access_points.items() if ap.ssid == ssid), "/"
+            )
+            self.service.device.set_state(ACTIVATED)
+        else:
+            self.service.device.set_state(NEED_AUTH)
+            self.service.device.set_state(FAILED, 7)
+
+    @dbus_property()
+    def WirelessEnabled(self) -> "b":
+        return self.wireless_enabled
+
+    @WirelessEnabled.setter
+    def WirelessEnabled(self, value: "b") -> None:
+        self.wireless_enabled = value
+
+
+class FakeNetworkManagerService:
+    """Serve a NetworkManager with one wifi device (wlan0) and one ethernet device
+
+    Args:
+        networks (dict[str, str]): passphrase of each reachable SSID ("" for open networks)
+        access_points (list[AccessPoint]): access points known before any scan
+        found_by_scan (list[AccessPoint]): access points added by the next scan
+        delay (float): how long scans and connection attempts take (in seconds). Defaults to 0.05.
+    """
+
+    def __init__(
+        self,
+        networks: dict[str, str],
+        access_points: list[AccessPoint],
+        found_by_scan: list[AccessPoint],
+        delay: float = 0.05,
+    ):
+        self.networks = networks
+        self.found_by_scan = found_by_scan
+        self.delay = delay
+        self.calls: Counter[str] = Counter()
+        self.connections: dict[str, dict] = {}
+        self.ids = 0
+        self.access_points: dict[str, AccessPoint] = {}
+        self._initial = access_points
+        self.bus: MessageBus
+
+    async def start(self, bus_address: str) -> None:
+        self.bus = await MessageBus(bus_address=bus_address).connect()
+        self.manager = FakeNetworkManager(self)
+        self.device = FakeDevice("wlan0", 2)
+        self.wireless = FakeWireless(self)
+        self.bus.export(NM_PATH, self.manager)
+        self.bus.export(f"{NM_PATH}/Settings", FakeSettings(self))
+        self.bus.export(WIFI_DEVICE, self.device)
+        self.bus.export(WIFI_DEVICE, self.wireless)
+        self.bus.export(ETHERNET_DEVICE, FakeDevice("eth0", 1))
+        for access_point in self._initial:
+            self.add_access_point(access_point)
+        await self.bus.request_name("org.freedesktop.NetworkManager")
+
+    def add_access_point(self, access_point: AccessPoint) -> str:
+        path = f"{NM_PATH}/AccessPoint/{len(self.access_points) + 1}"
+        self.access_points[path] = access_point
+        self.bus.export(path, FakeAccessPoint(access_point))
+        return path
+
+    def stop(self) -> None:
+        self.bus.disconnect()
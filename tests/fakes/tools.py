@@ -0,0 +1,171 @@
+"""Fake OS command line tools (netsh, nmcli, wpa_cli, networksetup) serving generated output
+
+Each tool is a python script that sleeps for a configurable latency before answering and keeps the connection state
+in files next to itself, so that connect / disconnect / state queries behave like the real tool across invocations.
+"""
+
+from pathlib import Path
+from typing import Callable
+
+TESTS_DIR = Path(__file__).resolve().parents[1]
+
+HEADER = """
+import os, sys, time
+sys.path.insert(0, {tests_dir!r})
+NETWORKS = {networks!r}
+BASE, ARGS = sys.argv[0], sys.argv[1:]
+
+def read(name):
+    return open(BASE + name).read() if os.path.exists(BASE + name) else ""
+
+def write(name, text):
+    open(BASE + name, "w").write(text)
+
+time.sleep({latency!r})
+"""
+
+NETSH = """
+import re, shlex
+from vectors.english import netsh
+
+def run(args):
+    ssid = read(".ssid")
+    profiles = read(".profiles").splitlines()
+    if args[:3] == ["wlan", "show", "interfaces"]:
+        output = netsh.SHOW_INTERFACES
+        if ssid:
+            output = output.replace(
+                "State                  : disconnected",
+                "State                  : connected\\r\\n    SSID                   : " + ssid,
+            )
+        sys.stdout.write(output)
+    elif args[:3] == ["wlan", "show", "networks"]:
+        sys.stdout.write(netsh.show_networks_bssid(NETWORKS))
+    elif args[:3] == ["wlan", "add", "profile"]:
+        name = re.search("<name>(.*)</name>", open(args[3][len("filename="):]).read()).group(1)
+        write(".profiles", "\\n".join(profiles + [name]))
+        print("Profile " + name + " is added on interface Wi-Fi 2.")
+    elif args[:3] == ["wlan", "delete", "profile"]:
+        name = args[3][len("name="):]
+        if name not in profiles:
+            print('Profile "' + name + '" is not found on any interface.')
+            return 1
+        write(".profiles", "\\n".join(profile for profile in profiles if profile != name))
+        print('Profile "' + name + '" is deleted from interface "Wi-Fi 2".')
+    elif args[:2] == ["wlan", "connect"]:
+        name = args[3][len("name="):]
+        if name not in profiles:
+            print('There is no profile "' + name + '" assigned to the specified interface.')
+            return 1
+        write(".ssid", name)
+        print("Connection request was completed successfully.")
+    elif args[:2] == ["wlan", "disconnect"]:
+        write(".ssid", "")
+        print('Disconnection request was completed successfully for interface "Wi-Fi 2".')
+    else:
+        print("The following command was not found: " + " ".join(args) + ".")
+        return 1
+    return 0
+
+if ARGS[:1] == ["-f"]:
+    # Scripts carry on after failing lines
+    sys.exit(max([run(shlex.split(line)) for line in open(ARGS[1]).read().splitlines()]))
+sys.exit(run(ARGS))
+"""
+
+NMCLI = """
+from vectors.english import nmcli
+ssid = read(".ssid")
+if ARGS == ["--version"]:
+    print("nmcli tool, version 1.44.2")
+elif ARGS == ["general", "permissions"]:
+    print("PERMISSION                                                        VALUE")
+    print("org.freedesktop.NetworkManager.enable-disable-wifi                yes")
+    print("org.freedesktop.NetworkManager.wifi.scan                          yes")
+elif ARGS[-1:] == ["status"]:
+    state = "connected:" + ssid.replace(":", "\\\\:") if ssid else "disconnected:"
+    print("wlan0:wifi:" + state)
+    print("eth0:ethernet:connected:Wired connection 1")
+elif "list" in ARGS:
+    sys.stdout.write(nmcli.wifi_list(NETWORKS))
+elif "connect" in ARGS:
+    write(".ssid", ARGS[ARGS.index("connect") + 1])
+    print("Device 'wlan0' successfully activated.")
+elif "disconnect" in ARGS:
+    write(".ssid", "")
+    print("Device 'wlan0' successfully disconnected.")
+elif "radio" in ARGS:
+    print("enabled")
+else:
+    sys.exit(1)
+"""
+
+WPA_CLI = """
+from vectors.english import wpa
+ssid = read(".ssid")
+command = ARGS[2:] if ARGS[:1] == ["-i"] else ARGS
+if command == ["status"]:
+    print("wpa_state=COMPLETED\\nssid=" + ssid if ssid else "wpa_state=DISCONNECTED")
+elif command == ["scan"]:
+    print("OK")
+elif command == ["scan_results"]:
+    sys.stdout.write(wpa.scan_results(NETWORKS))
+else:
+    sys.exit(1)
+"""
+
+NETWORKSETUP = """
+from vectors.english import networksetup
+ssid = read(".ssid")
+if ARGS == ["-listallhardwareports"]:
+    sys.stdout.write(networksetup.LIST_ALL_HARDWARE_PORTS)
+elif ARGS[:1] == ["-getairportnetwork"]:
+    if ssid:
+        sys.stdout.write(networksetup.GET_AIRPORT_NETWORK.format(ssid=ssid))
+    else:
+        sys.stdout.write(networksetup.GET_AIRPORT_NETWORK_DISCONNECTED)
+elif ARGS[:1] == ["-setairportnetwork"]:
+    write(".ssid", ARGS[2])
+else:
+    sys.exit(1)
+"""
+
+# wpa_supplicant itself is only looked up on PATH (it is then talked to over its control sockets)
+WPA_SUPPLICANT = """
+sys.exit(0)
+"""
+
+SCRIPTS = {
+    "netsh": NETSH,
+    "nmcli": NMCLI,
+    "wpa_cli": WPA_CLI,
+    "networksetup": NETWORKSETUP,
+    "wpa_supplicant": WPA_SUPPLICANT,
+}
+
+
+class FakeTools:
+    """Install fake OS tools
+
+    Args:
+        install (Callable[[str, str], Path]): installs a script as binary (the fake_binary fixture)
+        latency (float): how long every invocation takes before answering (in seconds). Defaults to 0.
+        networks (int): amount of access points in scan outputs. Defaults to 50.
+    """
+
+    def __init__(self, install: Callable[[str, str], Path], latency: float = 0.0, networks: int = 50) -> None:
+        self._install = install
+        self.latency = latency
+        self.networks = networks
+
+    def install(self, name: str) -> Path:
+        """Install one tool
+
+        Args:
+            name (str): tool (one of SCRIPTS)
+
+        Returns:
+            Path: path of the installed binary
+        """
+        header = HEADER.format(tests_dir=str(TESTS_DIR), networks=self.networks, latency=self.latency)
+        return self._install(name, header + SCRIPTS[name])
@@ -0,0 +1,132 @@
+"""A stand-in for wpa_supplicant's control socket that speaks the wpa_ctrl protocol"""
+
+import asyncio
+import os
+import socket
+from collections import Counter
+from typing import cast
+
+from vectors.english import wpa
+
+
+class FakeWpaSupplicant(asyncio.DatagramProtocol):
+    """Serve one interface's control socket
+
+    Scans and connection attempts complete after a delay and are reported as events to attached clients.
+
+    Args:
+        path (str): control socket to create
+        networks (dict[str, str]): passphrase of each reachable SSID ("" for open networks)
+        scan_results (str): reply to SCAN_RESULTS. Defaults to vectors.english.wpa.SCAN_RESULTS.
+        delay (float): how long scans and connection attempts take (in seconds). Defaults to 0.05.
+    """
+
+    def __init__(self, path: str, networks: dict[str, str], scan_results: str = wpa.SCAN_RESULTS, delay: float = 0.05):
+        self.path = path
+        self.networks = networks
+        self.scan_results = scan_results
+        self.delay = delay
+        self.state = "DISCONNECTED"
+        self.ssid = ""
+        self.commands: Counter[str] = Counter()
+        self.attached: set[str] = set()
+        self.configured: dict[str, dict[str, str]] = {}
+        self._ids = 0
+        self._transport: asyncio.DatagramTransport | None = None
+
+    async def start(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(self.path)
+        sock.setblocking(False)
+        await asyncio.get_running_loop().create_datagram_endpoint(lambda: self, sock=sock)
+
+    def stop(self) -> None:
+        if self._transport:
+            self._transport.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        # Not an asyncio.DatagramTransport subclass before Python 3.12
+        self._transport = cast(asyncio.DatagramTransport, transport)
+
+    def emit(self, event: str, level: int = 2) -> None:
+        assert self._transport
+        for client in list(self.attached):
+            try:
+                self._transport.sendto(f"<{level}>{event}".encode(), client)
+            except OSError:
+                self.attached.discard(client)
+
+    def datagram_received(self, data: bytes, addr: str) -> None:  # type: ignore[override]
+        command, *args = data.decode().split(" ", 3)
+        self.commands[command] += 1
+        reply = self.handle(command, args, addr)
+        if reply is not None:
+            assert self._transport
+            self._transport.sendto(reply.encode(), addr)
+
+    def handle(self, command: str, args: list[str], addr: str) -> str | None:
+        loop = asyncio.get_running_loop()
+        match command:
+            case "PING":
+                return "PONG\n"
+            case "ATTACH":
+                self.attached.add(addr)
+                return "OK\n"
+            case "DETACH":
+                self.attached.discard(addr)
+                return None
+            case "STATUS":
+                status = f"wpa_state={self.state}\n"
+                if self.state == "COMPLETED":
+                    status = f"bssid=aa:bb:cc:dd:ee:01\nssid={self.ssid}\n" + status
+                return status
+            case "SCAN":
+                if self.state == "SCANNING":
+                    return "FAIL-BUSY\n"
+                previous, self.state = self.state, "SCANNING"
+                loop.call_later(self.delay, self._scan_done, previous)
+                return "OK\n"
+            case "SCAN_RESULTS":
+                return self.scan_results
+            case "LIST_NETWORKS":
+                lines = ["network id / ssid / bssid / flags"]
+                for network_id, network in self.configured.items():
+                    ssid = bytes.fromhex(network["ssid"]).decode() if "ssid" in network else ""
+                    lines.append(f"{network_id}\t{ssid}\tany\t")
+                return "\n".join(lines) + "\n"
+            case "ADD_NETWORK":
+                self._ids += 1
+                self.configured[str(self._ids)] = {}
+                return f"{self._ids}\n"
+            case "SET_NETWORK":
+                self.configured[args[0]][args[1]] = args[2]
+                return "OK\n"
+            case "REMOVE_NETWORK":
+                return "OK\n" if self.configured.pop(args[0], None) is not None else "FAIL\n"
+            case "SELECT_NETWORK":
+                self.state = "ASSOCIATING"
+                loop.call_later(self.delay, self._connect_done, self.configured[args[0]], args[0])
+                return "OK\n"
+            case "DISCONNECT":
+                self.state, self.ssid = "DISCONNECTED", ""
+                self.emit("CTRL-EVENT-DISCONNECTED bssid=aa:bb:cc:dd:ee:01 reason=3 locally_generated=1", 3)
+                return "OK\n"
+        return "UNKNOWN COMMAND\n"
+
+    def _scan_done(self, previous: str) -> None:
+        self.state = previous
+        self.emit("CTRL-EVENT-SCAN-RESULTS ")
+
+    def _connect_done(self, network: dict[str, str], network_id: str) -> None:
+        ssid = bytes.fromhex(network["ssid"]).decode()
+        psk = network.get("psk", '""')[1:-1]
+        if ssid in self.networks and self.networks[ssid] == psk:
+            self.state, self.ssid = "COMPLETED", ssid
+            self.emit(f"CTRL-EVENT-CONNECTED - Connection to aa:bb:cc:dd:ee:01 completed [id={network_id} id_str=]")
+        else:
+            self.state = "DISCONNECTED"
+            self.emit(
+                f'CTRL-EVENT-SSID-TEMP-DISABLED id={network_id} ssid="{ssid}" auth_failures=1 reason=WRONG_KEY', 3
+            )
@@ -0,0 +1,98 @@
+import io
+import json
+
+import pytest
+
+from pywificli.components.driver_factory import WifiDriverFactory
+from pywificli.drivers.simulated import SimulatedWifiDriver
+from pywificli.scripts.cli import PASSWORD_ENV, main
+
+
+def records(output: str) -> list[dict]:
+    return [json.loads(line) for line in output.splitlines()]
+
+
+def test_scan_prints_one_json_line_per_result(capsys: pytest.CaptureFixture[str]):
+    # WHEN
+    status = main(["--driver", "simulated", "scan", "--timeout", "1"])
+
+    # THEN
+    results = records(capsys.readouterr().out)
+    assert status == 0
+    assert len(results) == 20
+    assert {result["interface"] for result in results} == {"wlan0"}
+    assert {"time", "ssid", "rssi", "bssid", "channel", "frequency", "security"} <= set(results[0])
+
+
+def test_watch_reuses_one_driver(capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch):
+    # GIVEN
+    detections = []
+    get_wifi_driver = WifiDriverFactory.get_wifi_driver
+
+    async def counting_get_wifi_driver(self, refresh: bool = False):
+        detections.append(refresh)
+        return await get_wifi_driver(self, refresh)
+
+    monkeypatch.setattr(WifiDriverFactory, "get_wifi_driver", counting_get_wifi_driver)
+
+    # WHEN
+    status = main(["-d", "simulated", "status", "--watch", "0.05", "--count", "3"])
+
+    # THEN
+    samples = records(capsys.readouterr().out)
+    assert status == 0
+    assert [(sample["interface"], sample["state"]) for sample in samples] == [("wlan0", "disconnected")] * 3
+    assert samples[0]["time"] <= samples[1]["time"] <= samples[2]["time"]
+    assert len(detections) == 1
+
+
+def test_failures_set_the_exit_status(capsys: pytest.CaptureFixture[str]):
+    # WHEN
+    connected = main(["-d", "simulated", "connect", "SimNet1", "--timeout", "1"])
+    not_connected = main(["-d", "simulated", "connect", "Elsewhere", "--timeout", "0.5"])
+    missing = main(["-d", "simulated", "status", "--interface", "wlan7"])
+
+    # THEN
+    output = capsys.readouterr()
+    assert (connected, not_connected, missing) == (0, 1, 1)
+    assert [result["success"] for result in records(output.out)] == [True, False]
+    assert "Interface wlan7 does not exist" in output.err
+
+
+@pytest.mark.parametrize(
+    "argv, stdin, environ, expected",
+    [
+        (["--password-stdin"], "from stdin\n", {}, "from stdin"),
+        ([], "", {PASSWORD_ENV: "from env"}, "from env"),
+        (["--no-password"], "", {PASSWORD_ENV: "from env"}, ""),
+        ([], "", {}, ""),
+    ],
+)
+def test_connect_takes_the_password_off_the_command_line(
+    argv: list[str],
+    stdin: str,
+    environ: dict[str, str],
+    expected: str,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # GIVEN
+    passwords = []
+
+    async def connect(self, interface: str, ssid: str, password: str, timeout: float) -> bool:
+        passwords.append(password)
+        return True
+
+    monkeypatch.setattr(SimulatedWifiDriver, "connect", connect)
+    monkeypatch.setattr("sys.stdin", io.StringIO(stdin))
+    monkeypatch.delenv(PASSWORD_ENV, raising=False)
+    for name, value in environ.items():
+        monkeypatch.setenv(name, value)
+
+    # WHEN
+    status = main(["-d", "simulated", "connect", "SimNet1", *argv])
+
+    # THEN
+    assert status == 0
+    assert passwords == [expected]
+    assert records(capsys.readouterr().out)[0]["success"]
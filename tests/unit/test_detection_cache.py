@@ -0,0 +1,90 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from pywificli.components.detection_cache import DetectionCache, DetectionResult
+from pywificli.components.driver_factory import WifiDriverFactory
+from pywificli.domain.metadata import DriverType, SystemLanguage
+
+NMCLI = """
+import sys
+with open(sys.argv[0] + ".calls", "a") as calls:
+    calls.write(" ".join(sys.argv[1:]) + "\\n")
+if sys.argv[1:] == ["--version"]:
+    print("nmcli tool, version 1.44.2-1.fc39")
+elif sys.argv[1:] == ["general", "permissions"]:
+    print("PERMISSION                                                        VALUE")
+    print("org.freedesktop.NetworkManager.enable-disable-wifi                yes")
+    print("org.freedesktop.NetworkManager.wifi.scan                          yes")
+"""
+
+
+@pytest.fixture
+def nmcli(fake_binary, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = fake_binary("nmcli", NMCLI)
+    # Only the fake tooling should be discoverable
+    monkeypatch.setenv("PATH", str(path.parent))
+    monkeypatch.setenv("LANG", "en_US")
+    # Nor NetworkManager over D-Bus
+    monkeypatch.setenv("DBUS_SYSTEM_BUS_ADDRESS", f"unix:path={path.parent}/missing_bus")
+    return path
+
+
+def calls(nmcli: Path) -> int:
+    calls_file = Path(str(nmcli) + ".calls")
+    return len(calls_file.read_text().splitlines()) if calls_file.exists() else 0
+
+
+@pytest.mark.asyncio
+async def test_detection_is_cached_across_factories(nmcli: Path, tmp_path: Path):
+    # GIVEN
+    cache = DetectionCache(tmp_path / "cache" / "detection.json")
+
+    # WHEN
+    first = await WifiDriverFactory(detection_cache=cache)._detect()
+    probes = calls(nmcli)
+    second = await WifiDriverFactory(detection_cache=cache)._detect()
+
+    # THEN
+    assert first == DetectionResult(DriverType.LINUX_NMCLI_LEGACY, SystemLanguage.ENGLISH, "1.44.2", False)
+    assert second == first
+    assert probes == 2
+    assert calls(nmcli) == probes
+
+
+@pytest.mark.asyncio
+async def test_refresh_bypasses_cache(nmcli: Path, tmp_path: Path):
+    # GIVEN
+    cache = DetectionCache(tmp_path / "detection.json")
+    await WifiDriverFactory(detection_cache=cache)._detect()
+
+    # WHEN
+    await WifiDriverFactory(detection_cache=cache)._detect(refresh=True)
+
+    # THEN
+    assert calls(nmcli) == 4
+
+
+@pytest.mark.asyncio
+async def test_cache_is_invalidated_when_tooling_changes(nmcli: Path, tmp_path: Path):
+    # GIVEN
+    cache = DetectionCache(tmp_path / "detection.json")
+    await WifiDriverFactory(detection_cache=cache)._detect()
+
+    # WHEN nmcli is upgraded
+    stat = nmcli.stat()
+    os.utime(nmcli, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    await WifiDriverFactory(detection_cache=cache)._detect()
+
+    # THEN
+    assert calls(nmcli) == 4
+
+
+def test_unreadable_cache_is_ignored(tmp_path: Path):
+    # GIVEN
+    cache = DetectionCache(tmp_path / "detection.json")
+    cache.path.write_text("{not json")
+
+    # THEN
+    assert cache.load(cache.fingerprint()) is None
@@ -0,0 +1,298 @@
+import asyncio
+import shlex
+import sys
+import time
+from typing import Iterator
+
+import pytest
+
+from pywificli.exceptions import CommandProcessError, CommandTimeoutError
+from pywificli.util import (
+    NETSH_SCRIPT,
+    SH_SCRIPT,
+    BatchDialect,
+    CommandExecutor,
+    cmd,
+    cmdBatch,
+    cmdOkOrRaise,
+    get_executor,
+    set_executor,
+)
+
+SLEEP = [sys.executable, "-c", "import time; time.sleep(0.2)"]
+
+
+@pytest.mark.asyncio
+async def test_arguments_are_not_interpreted_by_a_shell():
+    # WHEN
+    response = await cmdOkOrRaise([sys.executable, "-c", "import sys; print(sys.argv[1])", "a b | c; $HOME"])
+
+    # THEN
+    assert response.stdout.strip() == "a b | c; $HOME"
+
+
+@pytest.mark.asyncio
+async def test_stdin_is_forwarded():
+    # WHEN
+    response = await cmdOkOrRaise([sys.executable, "-c", "print(input()[::-1])"], stdin="secret\n")
+
+    # THEN
+    assert response.stdout.strip() == "terces"
+
+
+@pytest.mark.asyncio
+async def test_non_success_raises_and_cmd_does_not():
+    # GIVEN
+    command = [sys.executable, "-c", "import sys; sys.exit(3)"]
+
+    # WHEN
+    response = await cmd(command)
+
+    # THEN
+    assert response.return_code == 3
+    with pytest.raises(CommandProcessError):
+        await cmdOkOrRaise(command)
+
+
+@pytest.mark.asyncio
+async def test_missing_binary_raises():
+    with pytest.raises(CommandProcessError):
+        await cmd(["pywificli-does-not-exist"])
+
+
+@pytest.mark.asyncio
+async def test_global_concurrency_is_capped():
+    # GIVEN
+    executor = CommandExecutor(max_concurrency=2, per_binary_limit=4)
+
+    # WHEN
+    start = time.perf_counter()
+    await asyncio.gather(*[executor.run(SLEEP) for _ in range(4)])
+
+    # THEN two waves of two
+    assert time.perf_counter() - start >= 0.4
+    assert executor.spawn_count == 4
+
+
+@pytest.mark.asyncio
+async def test_per_binary_concurrency_is_capped():
+    # GIVEN
+    name = SLEEP[0].rsplit("/", 1)[-1].lower()
+    executor = CommandExecutor(max_concurrency=8, binary_limits={name: 1})
+
+    # WHEN
+    start = time.perf_counter()
+    await asyncio.gather(*[executor.run(SLEEP) for _ in range(3)])
+
+    # THEN
+    assert time.perf_counter() - start >= 0.6
+
+
+COUNT = [sys.executable, "-c", "import time; time.sleep(0.1); print('out')"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_read_only_commands_share_one_subprocess():
+    # GIVEN
+    executor = CommandExecutor(cache_ttl=0)
+
+    # WHEN
+    results = await asyncio.gather(*[executor.run(COUNT, read_only=True) for _ in range(5)])
+
+    # THEN
+    assert executor.spawn_count == 1
+    assert all(result.stdout == results[0].stdout for result in results)
+
+
+@pytest.mark.asyncio
+async def test_read_only_results_are_cached_until_ttl_expires():
+    # GIVEN
+    executor = CommandExecutor(cache_ttl=0.3)
+
+    # WHEN
+    await executor.run(COUNT, read_only=True)
+    await executor.run(COUNT, read_only=True)
+
+    # THEN
+    assert executor.spawn_count == 1
+
+    # WHEN
+    await asyncio.sleep(0.3)
+    await executor.run(COUNT, read_only=True)
+
+    # THEN
+    assert executor.spawn_count == 2
+
+
+@pytest.mark.asyncio
+async def test_mutating_command_invalidates_cache_of_its_binary():
+    # GIVEN
+    executor = CommandExecutor(cache_ttl=10)
+    await executor.run(COUNT, read_only=True)
+
+    # WHEN
+    await executor.run([sys.executable, "-c", "pass"])
+    await executor.run(COUNT, read_only=True)
+
+    # THEN
+    assert executor.spawn_count == 3
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_subprocess():
+    # GIVEN
+    executor = CommandExecutor(cache_ttl=0)
+    first = asyncio.create_task(executor.run(COUNT, read_only=True))
+    second = asyncio.create_task(executor.run(COUNT, read_only=True))
+    await asyncio.sleep(0.01)
+
+    # WHEN
+    first.cancel()
+
+    # THEN
+    assert (await second).stdout
+    assert executor.spawn_count == 1
+
+
+@pytest.fixture
+def executor() -> Iterator[CommandExecutor]:
+    """Run cmd and friends on a fresh executor"""
+    previous = get_executor()
+    set_executor(executor := CommandExecutor())
+    yield executor
+    set_executor(previous)
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_in_one_process_and_splits_output(executor: CommandExecutor):
+    # WHEN
+    results = await cmdBatch(SH_SCRIPT, ["echo one", ["printf", "two\\nlines\\n"], ["true"], ["echo", "a b | c"]])
+
+    # THEN
+    assert executor.spawn_count == 1
+    assert [result.stdout for result in results] == ["one\n", "two\nlines\n", None, "a b | c\n"]
+    assert all(result.is_ok for result in results)
+
+
+@pytest.mark.asyncio
+async def test_batch_resumes_after_script_stops(executor: CommandExecutor):
+    # GIVEN a shell that stops at the first failing command
+    stopping_sh = BatchDialect(argv=("sh", "-e", "-s"), render=shlex.join, marker_command="echo {marker}")
+
+    # WHEN
+    results = await cmdBatch(stopping_sh, ["echo before", "sh -c 'echo failing; exit 3'", "echo after"])
+
+    # THEN the commands after the failure run in another script
+    assert executor.spawn_count == 2
+    assert [(result.return_code, result.stdout) for result in results] == [
+        (0, "before\n"),
+        (3, "failing\n"),
+        (0, "after\n"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_script_can_be_passed_as_file():
+    # GIVEN
+    python = BatchDialect(
+        argv=(sys.executable, "{script}"),
+        render=lambda command: f"print({command[1]!r})",
+        marker_command="print('{marker}')",
+    )
+
+    # WHEN
+    results = await cmdBatch(python, [["print", "x"], ["print", "y"]])
+
+    # THEN
+    assert [result.stdout for result in results] == ["x\n", "y\n"]
+
+
+def test_netsh_script_quotes_parameter_values():
+    # WHEN
+    script = NETSH_SCRIPT.script(
+        [
+            ["netsh", "wlan", "disconnect", "interface=Wi-Fi 2"],
+            ["netsh", "wlan", "connect", "ssid=Fun: House", "name=Fun: House", "interface=Wi-Fi 2"],
+        ],
+        ["marker-1", "marker-2"],
+    )
+
+    # THEN
+    assert script.splitlines() == [
+        'wlan disconnect interface="Wi-Fi 2"',
+        "marker-1",
+        'wlan connect ssid="Fun: House" name="Fun: House" interface="Wi-Fi 2"',
+        "marker-2",
+    ]
+
+
+@pytest.mark.parametrize("ssid", ['Evil" interface="Wi-Fi', "Two\nLines"])
+def test_netsh_script_refuses_values_it_can_not_quote(ssid: str):
+    with pytest.raises(CommandProcessError, match="can not be quoted"):
+        NETSH_SCRIPT.script([["netsh", "wlan", "connect", f"ssid={ssid}", "interface=Wi-Fi"]], ["marker-1"])
+
+
+@pytest.mark.asyncio
+async def test_output_beyond_limit_kills_command():
+    # GIVEN a command that would write forever
+    executor = CommandExecutor(max_output=2**20)
+    endless = [sys.executable, "-c", "import sys\nwhile True: sys.stdout.write('x' * 4096)"]
+
+    # WHEN / THEN
+    with pytest.raises(CommandProcessError, match="Output exceeded 1048576 bytes"):
+        await asyncio.wait_for(executor.run(endless), 5)
+
+
+@pytest.mark.asyncio
+async def test_stream_limits_output_but_not_of_long_lived_commands():
+    # GIVEN
+    executor = CommandExecutor(max_output=1000)
+    lines = [sys.executable, "-c", "for i in range(1000): print('line', i, flush=True)"]
+    long_line = [sys.executable, "-c", "print('x' * 5000)"]
+
+    # WHEN
+    async with executor.stream(lines, long_lived=True) as output:
+        received = [line async for line in output]
+    with pytest.raises(CommandProcessError, match="Output exceeded"):
+        async with executor.stream(lines) as output:
+            async for _ in output:
+                pass
+    with pytest.raises(CommandProcessError, match="Line exceeded"):
+        async with executor.stream(long_line, long_lived=True) as output:
+            async for _ in output:
+                pass
+
+    # THEN
+    assert len(received) == 1000
+
+
+@pytest.mark.asyncio
+async def test_timeout_kills_whole_process_group():
+    # GIVEN a command whose child keeps the output pipe open
+    executor = CommandExecutor()
+    spawning = [sys.executable, "-c", "import subprocess, time; subprocess.Popen(['sleep', '30']); time.sleep(30)"]
+
+    # WHEN
+    start = time.perf_counter()
+    with pytest.raises(CommandTimeoutError, match="timed out after 0.5 seconds"):
+        await executor.run(spawning, timeout=0.5)
+
+    # THEN the output ended, so the child was killed as well
+    assert time.perf_counter() - start < 3
+
+
+@pytest.mark.asyncio
+async def test_stream_timeout_raises_while_iterating():
+    # GIVEN
+    executor = CommandExecutor()
+    slow = [sys.executable, "-c", "import time\nfor i in range(100): print(i, flush=True); time.sleep(0.1)"]
+
+    # WHEN
+    received = []
+    with pytest.raises(CommandTimeoutError):
+        async with executor.stream(slow, timeout=0.5) as lines:
+            async for line in lines:
+                received.append(line)
+
+    # THEN
+    assert 0 < len(received) < 10
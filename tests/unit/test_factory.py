@@ -1,7 +1,21 @@
+import asyncio
+import importlib
+
 import pytest
 
-from pywificli.components.driver_factory import WifiDriverFactory
+from pywificli.components.driver_factory import WifiDriverFactory, WifiInterfaceControllerFactory
+from pywificli.domain.driver import IWifiDriver
 from pywificli.domain.metadata import DriverType, SystemLanguage
+from pywificli.drivers.simulated import SimulationConfig
+
+
+def simulated_controllers(interfaces: int, refresh_interval: float = 30.0) -> WifiInterfaceControllerFactory:
+    driver_factory = WifiDriverFactory(
+        use_detection_cache=False,
+        driver_type=DriverType.SIMULATED,
+        driver_options={"config": SimulationConfig(interfaces=interfaces)},
+    )
+    return WifiInterfaceControllerFactory(driver_factory, refresh_interval=refresh_interval)
 
 
 @pytest.mark.asyncio
@@ -39,3 +53,121 @@ async def test_driver_type_is_detected_correctly():
 
     # THEN
     assert driver_type is DriverType.WINDOWS
+
+
+@pytest.mark.parametrize("driver_path", sorted(set(WifiDriverFactory._driver_map.values())))
+def test_driver_map_entries_resolve_to_drivers(driver_path: str):
+    # GIVEN
+    module, _, name = driver_path.partition(":")
+    if module.endswith(".linux_nm_dbus"):
+        # The D-Bus driver needs the optional dbus extra
+        pytest.importorskip("dbus_next")
+
+    # WHEN
+    driverT = getattr(importlib.import_module(module), name)
+
+    # THEN
+    assert issubclass(driverT, IWifiDriver)
+
+
+@pytest.mark.asyncio
+async def test_controllers_share_one_detected_driver(monkeypatch: pytest.MonkeyPatch):
+    # GIVEN
+    factory = simulated_controllers(interfaces=3)
+    detections = 0
+    get_wifi_driver = WifiDriverFactory.get_wifi_driver
+
+    async def counting(self: WifiDriverFactory, refresh: bool = False) -> IWifiDriver:
+        nonlocal detections
+        detections += 1
+        return await get_wifi_driver(self, refresh)
+
+    monkeypatch.setattr(WifiDriverFactory, "get_wifi_driver", counting)
+
+    # WHEN
+    first, *controllers = await asyncio.gather(
+        factory.get_first_interface_controller(),
+        *[factory.get_interface_controller(interface) for interface in ["wlan0", "wlan1", "wlan2", "wlan0"]],
+    )
+
+    # THEN
+    assert detections == 1
+    assert first is controllers[0] is controllers[3]
+    assert len({id(controller) for controller in controllers}) == 3
+    manager = await factory.get_manager()
+    assert all(manager.controller(controller.interface) is controller for controller in controllers)
+
+
+@pytest.mark.asyncio
+async def test_controllers_of_vanished_interfaces_are_dropped(monkeypatch: pytest.MonkeyPatch):
+    # GIVEN
+    factory = simulated_controllers(interfaces=2, refresh_interval=0)
+    wlan1 = await factory.get_interface_controller("wlan1")
+    manager = await factory.get_manager()
+    monkeypatch.setattr(manager.driver, "get_available_interfaces", lambda: asyncio.sleep(0, {"wlan0"}))
+
+    # WHEN
+    with pytest.raises(RuntimeError, match="wlan1 does not exist"):
+        await factory.get_interface_controller("wlan1")
+
+    # THEN
+    assert "wlan1" not in manager
+    assert set(manager.states) == set()
+    assert wlan1 is not manager.controller("wlan1")
+
+
+@pytest.mark.asyncio
+async def test_first_controller_reuses_the_last_lookup(monkeypatch: pytest.MonkeyPatch):
+    # GIVEN
+    factory = simulated_controllers(interfaces=2)
+    manager = await factory.get_manager()
+    lookups = 0
+    get_available_interfaces = manager.driver.get_available_interfaces
+
+    async def counting() -> set[str]:
+        nonlocal lookups
+        lookups += 1
+        return await get_available_interfaces()
+
+    monkeypatch.setattr(manager.driver, "get_available_interfaces", counting)
+
+    # WHEN
+    first = await factory.get_first_interface_controller()
+    again = await factory.get_first_interface_controller()
+    factory.refresh_interval = 0
+    stale = await factory.get_first_interface_controller()
+
+    # THEN
+    assert first is again is stale
+    assert first.interface == "wlan0"
+    assert lookups == 2
+
+
+@pytest.mark.asyncio
+async def test_controllers_of_all_interfaces():
+    # GIVEN
+    factory = simulated_controllers(interfaces=3)
+
+    # WHEN
+    controllers = await factory.get_interface_controllers()
+
+    # THEN
+    assert list(controllers) == ["wlan0", "wlan1", "wlan2"]
+    assert controllers["wlan0"] is await factory.get_first_interface_controller()
+    assert all(controller.interface == interface for interface, controller in controllers.items())
+
+
+@pytest.mark.asyncio
+async def test_prune_keeps_available_interfaces():
+    # GIVEN
+    manager = await simulated_controllers(interfaces=3).get_manager()
+    controllers = [manager.controller(interface) for interface in ["wlan0", "wlan1", "wlan2"]]
+
+    # WHEN
+    vanished = manager.prune({"wlan0", "wlan2"})
+
+    # THEN
+    assert vanished == {"wlan1"}
+    assert set(manager.states) == {"wlan0", "wlan2"}
+    assert manager.controller("wlan0") is controllers[0]
+    assert manager.controller("wlan1") is not controllers[1]
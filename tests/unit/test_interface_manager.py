@@ -0,0 +1,145 @@
+import asyncio
+import time
+from collections import Counter
+
+import pytest
+
+from pywificli.components.interface_manager import WifiInterfaceManager, merge_scan_results
+from pywificli.domain.driver import ConnectionState, IWifiDriver, ScanResult, ScanState
+from pywificli.domain.metadata import DriverType, SystemLanguage
+
+
+class RadioDriver(IWifiDriver):
+    """Driver that records how many operations overlap on each interface"""
+
+    def __init__(self, interfaces: list[str], delay: float = 0.1, failing: set[str] | None = None) -> None:
+        self.interfaces = interfaces
+        self.delay = delay
+        self.failing = failing or set()
+        self.active: Counter[str] = Counter()
+        self.max_active: Counter[str] = Counter()
+
+    async def _operate(self, interface: str) -> None:
+        self.active[interface] += 1
+        self.max_active[interface] = max(self.max_active[interface], self.active[interface])
+        try:
+            await asyncio.sleep(self.delay)
+            if interface in self.failing:
+                raise RuntimeError("Radio wedged")
+        finally:
+            self.active[interface] -= 1
+
+    @property
+    def _driver_type(self) -> DriverType:
+        return DriverType.WINDOWS
+
+    @property
+    def _system_language(self) -> SystemLanguage:
+        return SystemLanguage.ENGLISH
+
+    async def get_available_interfaces(self) -> set[str]:
+        return set(self.interfaces)
+
+    async def is_enabled(self, interface: str) -> bool:
+        return True
+
+    async def scan_stream(self, interface: str, timeout: float):
+        await self._operate(interface)
+        yield ScanResult("Shared", -80 if interface == "wlan0" else -40, "aa:bb:cc:dd:ee:ff")
+        yield ScanResult(f"Only-{interface}", -60, f"aa:bb:cc:dd:ee:{len(interface):02x}{interface[-1]}")
+
+    async def connect(self, interface: str, ssid: str, password: str, timeout: float) -> bool:
+        await self._operate(interface)
+        return True
+
+    async def disconnect(self, interface: str) -> bool:
+        await self._operate(interface)
+        return True
+
+    async def get_connection_state(self, interface: str) -> tuple[ConnectionState, str]:
+        return ConnectionState.DISCONNECTED, ""
+
+    async def get_scan_state(self, interface: str) -> ScanState:
+        raise NotImplementedError
+
+    async def enable(self, interface: str, enable: bool) -> bool:
+        return True
+
+
+@pytest.mark.asyncio
+async def test_scan_all_runs_interfaces_concurrently():
+    # GIVEN
+    driver = RadioDriver(["wlan0", "wlan1", "wlan2"])
+    manager = WifiInterfaceManager(driver)
+
+    # WHEN
+    start = time.perf_counter()
+    scans = await manager.scan_all(10)
+
+    # THEN
+    assert time.perf_counter() - start < 0.25
+    assert sorted(scans) == ["wlan0", "wlan1", "wlan2"]
+
+
+@pytest.mark.asyncio
+async def test_operations_on_the_same_interface_are_serialized():
+    # GIVEN
+    driver = RadioDriver(["wlan0", "wlan1"])
+    manager = WifiInterfaceManager(driver)
+
+    # WHEN
+    await asyncio.gather(
+        manager.scan_all(10),
+        manager.controller("wlan0").connect("FunHouse", "password", 10),
+        manager.controller("wlan0").scan(10),
+    )
+
+    # THEN
+    assert driver.max_active == Counter({"wlan0": 1, "wlan1": 1})
+
+
+@pytest.mark.asyncio
+async def test_states_are_tracked_per_interface():
+    # GIVEN
+    driver = RadioDriver(["wlan0", "wlan1"])
+    manager = WifiInterfaceManager(driver)
+
+    # WHEN
+    scan = asyncio.create_task(manager.scan_all(10))
+    connect = asyncio.create_task(manager.controller("wlan1").connect("FunHouse", "password", 10))
+    await asyncio.sleep(0.05)
+
+    # THEN
+    assert await manager.controller("wlan0").get_scan_state() is ScanState.SCANNING
+    assert manager.states["wlan1"].connection_state == (ConnectionState.CONNECTING, "FunHouse")
+
+    # WHEN
+    await asyncio.gather(scan, connect)
+
+    # THEN
+    assert await manager.controller("wlan0").get_scan_state() is ScanState.IDLE
+    assert manager.states["wlan1"].connection_state == (ConnectionState.CONNECTED, "FunHouse")
+    assert manager.controller("wlan1") is manager.controller("wlan1")
+
+
+@pytest.mark.asyncio
+async def test_merged_scan_keeps_strongest_per_access_point_and_skips_failures():
+    # GIVEN
+    driver = RadioDriver(["wlan0", "wlan1", "wlan2"], failing={"wlan2"})
+    manager = WifiInterfaceManager(driver)
+
+    # WHEN
+    merged = await manager.scan_merged(10)
+
+    # THEN
+    assert sorted((result.ssid, result.rssi) for result in merged) == [
+        ("Only-wlan0", -60),
+        ("Only-wlan1", -60),
+        ("Shared", -40),
+    ]
+    assert await manager.controller("wlan2").get_scan_state() is ScanState.IDLE
+
+
+def test_merge_falls_back_to_ssid_without_bssid():
+    merged = merge_scan_results([[ScanResult("A", -50)], [ScanResult("A", -30), ScanResult("B", -70)]])
+    assert list(merged) == [ScanResult("A", -30), ScanResult("B", -70)]
@@ -0,0 +1,72 @@
+import logging
+import threading
+
+import pytest
+
+import pywificli.util
+from pywificli.logging import Logger, add_logging_handler, truncate
+from pywificli.util import cmd
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self, level: int) -> None:
+        super().__init__(level)
+        self.records: list[tuple[logging.LogRecord, str]] = []
+        self.received = threading.Event()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append((record, threading.current_thread().name))
+        self.received.set()
+
+
+def test_truncate_keeps_head_and_tail():
+    # GIVEN
+    text = "a" * 50 + "b" * 100 + "c" * 50
+
+    # WHEN
+    truncated = truncate(text, 100)
+
+    # THEN
+    assert truncated == "a" * 50 + "\n... [100 characters omitted] ...\n" + "c" * 50
+    assert truncate("short", 100) == "short"
+
+
+def test_records_are_handled_off_the_logging_thread():
+    # GIVEN
+    handler = RecordingHandler(logging.WARNING)
+    add_logging_handler(handler)
+    logger = logging.getLogger("pywificli.util")
+
+    # WHEN
+    try:
+        raise RuntimeError("Radio wedged")
+    except RuntimeError:
+        logger.warning("Scan on %s failed", "wlan0", exc_info=True)
+    logger.info("Filtered by every handler")
+
+    # THEN
+    assert handler.received.wait(5)
+    [(record, thread)] = handler.records
+    assert thread != threading.current_thread().name
+    assert record.getMessage() == "Scan on wlan0 failed"
+    assert record.exc_info and isinstance(record.exc_info[1], RuntimeError)
+    # No handler wants INFO so the logger does not even create such records
+    assert not logger.isEnabledFor(logging.INFO)
+    assert Logger.get_instance().listener.handlers[-1] is handler
+
+
+@pytest.mark.asyncio
+async def test_output_is_not_formatted_when_filtered(fake_binary, monkeypatch: pytest.MonkeyPatch):
+    # GIVEN
+    fake_binary("nmcli", "print('x' * 100_000)")
+
+    def fail(_: str) -> str:
+        raise AssertionError("Output of a filtered record was formatted")
+
+    monkeypatch.setattr(pywificli.util, "truncate", fail)
+
+    # WHEN
+    response = await cmd(["nmcli", "device", "wifi", "list"])
+
+    # THEN
+    assert len(response.stdout or "") > 100_000
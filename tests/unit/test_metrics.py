@@ -0,0 +1,212 @@
+import json
+from typing import Iterator
+
+import pytest
+
+from pywificli.components.interface_controller import WifiInterfaceController
+from pywificli.domain.driver import ConnectionState, IWifiDriver, ScanResult, ScanState
+from pywificli.domain.metadata import DriverType, SystemLanguage
+from pywificli.util import Metrics, cmd, get_metrics, set_metrics
+from pywificli.util.metrics import Histogram, Span, subcommand
+
+
+class InstantDriver(IWifiDriver):
+    """Driver whose operations complete immediately, or raise on the failing interfaces"""
+
+    def __init__(self, failing: set[str] | None = None) -> None:
+        self.failing = failing or set()
+
+    @property
+    def _driver_type(self) -> DriverType:
+        return DriverType.WINDOWS
+
+    @property
+    def _system_language(self) -> SystemLanguage:
+        return SystemLanguage.ENGLISH
+
+    async def get_available_interfaces(self) -> set[str]:
+        return {"wlan0", "wlan1"}
+
+    async def is_enabled(self, interface: str) -> bool:
+        return True
+
+    async def scan_stream(self, interface: str, timeout: float):
+        yield ScanResult("Home", -40, "aa:bb:cc:dd:ee:01")
+        yield ScanResult("Cafe", -70, "aa:bb:cc:dd:ee:02")
+
+    async def connect(self, interface: str, ssid: str, password: str, timeout: float) -> bool:
+        if interface in self.failing:
+            raise RuntimeError("Radio wedged")
+        return True
+
+    async def disconnect(self, interface: str) -> bool:
+        return True
+
+    async def get_connection_state(self, interface: str) -> tuple[ConnectionState, str]:
+        return ConnectionState.DISCONNECTED, ""
+
+    async def get_scan_state(self, interface: str) -> ScanState:
+        return ScanState.IDLE
+
+    async def enable(self, interface: str, enable: bool) -> bool:
+        return True
+
+
+@pytest.fixture
+def metrics() -> Iterator[Metrics]:
+    previous = get_metrics()
+    metrics = Metrics(enabled=True)
+    set_metrics(metrics)
+    yield metrics
+    set_metrics(previous)
+
+
+@pytest.mark.parametrize(
+    "argv, expected",
+    [
+        (["netsh", "wlan", "show", "interfaces"], "wlan show interfaces"),
+        (["netsh", "wlan", "show", "networks", "interface=Wi-Fi", "mode=bssid"], "wlan show networks"),
+        (["nmcli", "-t", "-f", "SSID,BSSID", "device", "wifi", "list", "ifname", "wlan0"], "device wifi list"),
+        (
+            ["nmcli", "--ask", "--wait", "10", "device", "wifi", "connect", "home", "ifname", "wlan0"],
+            "device wifi connect",
+        ),
+        (["netsh", "wlan", "connect", "ssid=Secret Net", "interface=Wi-Fi"], "wlan connect"),
+        (["networksetup", "-getairportnetwork", "en0"], "-getairportnetwork"),
+        (["nmcli"], ""),
+    ],
+)
+def test_subcommand_keeps_labels_low_cardinality(argv, expected):
+    assert subcommand(argv) == expected
+
+
+def test_histogram_buckets_are_cumulative():
+    # GIVEN
+    histogram = Histogram((0.1, 1.0))
+
+    # WHEN
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    # THEN
+    assert histogram.cumulative() == [(0.1, 2), (1.0, 3), (float("inf"), 4)]
+    assert histogram.sum == pytest.approx(3.65)
+
+
+@pytest.mark.asyncio
+async def test_commands_are_recorded_by_binary_and_subcommand(fake_binary, metrics: Metrics):
+    # GIVEN
+    fake_binary(
+        "netsh",
+        """
+        import sys
+        sys.exit(1 if "connect" in sys.argv else 0)
+        """,
+    )
+    samples = []
+    metrics.on_command.append(samples.append)
+
+    # WHEN
+    await cmd(["netsh", "wlan", "show", "interfaces"], read_only=True)
+    await cmd(["netsh", "wlan", "show", "interfaces"], read_only=True)
+    await cmd(["netsh", "wlan", "connect", "ssid=Net"])
+
+    # THEN
+    assert metrics.spawns == {"netsh": 2}
+    assert metrics.cache_hits == {"netsh": 1}
+    assert metrics.failures == {("netsh", "wlan connect"): 1}
+    assert metrics.command_latency[("netsh", "wlan show interfaces")].count == 1
+    assert [(sample.subcommand, sample.succeeded) for sample in samples] == [
+        ("wlan show interfaces", True),
+        ("wlan connect", False),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_operations_are_traced(metrics: Metrics):
+    # GIVEN
+    spans: list[Span] = []
+    metrics.on_span.append(spans.append)
+    driver = InstantDriver(failing={"wlan1"})
+    controller = WifiInterfaceController(driver, "wlan0")
+    failing = WifiInterfaceController(driver, "wlan1")
+
+    # WHEN
+    await controller.scan(5)
+    await controller.connect("Net", "password", 5)
+    with pytest.raises(RuntimeError):
+        await failing.connect("Net", "password", 5)
+
+    # THEN
+    assert [(span.name, span.attributes, span.error is None) for span in spans] == [
+        ("scan", {"interface": "wlan0", "results": 2}, True),
+        ("connect", {"interface": "wlan0", "connected": True}, True),
+        ("connect", {"interface": "wlan1"}, False),
+    ]
+    assert metrics.operation_latency["connect"].count == 2
+    assert metrics.operation_failures == {"connect": 1}
+
+
+@pytest.mark.asyncio
+async def test_failing_hooks_do_not_break_operations(metrics: Metrics):
+    # GIVEN
+    def broken(_: Span) -> None:
+        raise ValueError("Exporter down")
+
+    metrics.on_span.append(broken)
+    controller = WifiInterfaceController(InstantDriver(), "wlan0")
+
+    # WHEN
+    connected = await controller.connect("Net", "password", 5)
+
+    # THEN
+    assert connected
+    assert metrics.operation_latency["connect"].count == 1
+
+
+@pytest.mark.asyncio
+async def test_nothing_is_recorded_when_disabled(fake_binary):
+    # GIVEN
+    fake_binary("nmcli", "print('wifi enabled')")
+    metrics = get_metrics()
+    assert not metrics.enabled
+
+    # WHEN
+    await cmd(["nmcli", "radio", "wifi"])
+    with metrics.span("scan") as span:
+        pass
+
+    # THEN
+    assert span is None
+    assert metrics.to_dict() == {"commands": [], "spawns": {}, "cache_hits": {}, "operations": []}
+
+
+def test_exports():
+    # GIVEN
+    metrics = Metrics(enabled=True, buckets=(0.5,))
+    metrics.record_command("nmcli", ["nmcli", "device", "wifi", "rescan"], 0.25, False)
+    with metrics.span("detect"):
+        pass
+
+    # WHEN
+    exported = json.loads(metrics.to_json())
+    prometheus = metrics.to_prometheus().splitlines()
+
+    # THEN
+    assert exported["commands"] == [
+        {
+            "binary": "nmcli",
+            "subcommand": "device wifi rescan",
+            "failures": 1,
+            "latency": {"count": 1, "sum": 0.25, "buckets": {"0.5": 1, "+Inf": 1}},
+        }
+    ]
+    assert exported["operations"][0]["operation"] == "detect"
+    assert (
+        'pywificli_command_duration_seconds_bucket{binary="nmcli",subcommand="device wifi rescan",le="0.5"} 1'
+        in prometheus
+    )
+    assert 'pywificli_command_duration_seconds_count{binary="nmcli",subcommand="device wifi rescan"} 1' in prometheus
+    assert 'pywificli_command_failures_total{binary="nmcli",subcommand="device wifi rescan"} 1' in prometheus
+    assert 'pywificli_operation_duration_seconds_count{operation="detect"} 1' in prometheus
+    assert "# TYPE pywificli_command_spawns_total counter" in prometheus
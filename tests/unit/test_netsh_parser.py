@@ -0,0 +1,76 @@
+from vectors.english import netsh
+
+from pywificli.drivers.english.netsh_parser import (
+    NetshNetworksParser,
+    parse_interfaces,
+    parse_networks,
+    split_field,
+)
+
+
+def test_split_field_only_splits_on_first_separator():
+    assert split_field("    SSID                   : a : b") == ("SSID", "a : b")
+    assert split_field("    Physical address       : 98:48:27:88:cb:18") == ("Physical address", "98:48:27:88:cb:18")
+    assert split_field("SSID 3 :") == ("SSID 3", "")
+    assert split_field("There are 2 interfaces on the system:") is None
+
+
+def test_parse_all_interfaces():
+    # WHEN
+    interfaces = parse_interfaces(netsh.SHOW_INTERFACES.splitlines())
+
+    # THEN
+    assert [interface.name for interface in interfaces] == ["Wi-Fi", "Wi-Fi 2"]
+    connected, disconnected = interfaces
+    assert connected.state == "connected"
+    assert connected.ssid == "Fun: House"
+    assert connected.bssid == "aa:bb:cc:dd:ee:01"
+    assert connected.physical_address == "98:48:27:88:cb:18"
+    assert connected.channel == 36
+    assert connected.signal == 96
+    assert disconnected.state == "disconnected"
+    assert disconnected.ssid is None
+
+
+def test_parse_no_interfaces():
+    assert parse_interfaces(netsh.SHOW_NO_INTERFACES.splitlines()) == []
+
+
+def test_parse_more_than_nine_networks_with_every_bssid():
+    # WHEN
+    networks = parse_networks(netsh.SHOW_NETWORKS_BSSID.splitlines())
+
+    # THEN
+    assert [network.ssid for network in networks] == [f"Network{n}" for n in range(1, 13)]
+    network = networks[10]
+    assert network.interface == "Wi-Fi"
+    assert network.authentication == "WPA2-Personal"
+    assert network.encryption == "CCMP"
+    assert [bssid.bssid for bssid in network.bssids] == ["aa:bb:cc:0b:ee:01", "aa:bb:cc:0b:ee:02"]
+    assert network.bssids[0].signal == (11 * 7 + 1) % 100
+    assert network.bssids[1].channel == 44
+    assert network.bssids[1].band == "5 GHz"
+
+
+def test_parse_networks_of_multiple_interfaces():
+    # GIVEN
+    output = netsh.show_networks_bssid(2, interface="Wi-Fi") + netsh.show_networks_bssid(3, interface="Wi-Fi 2")
+
+    # WHEN
+    networks = parse_networks(output.splitlines())
+
+    # THEN
+    assert [network.interface for network in networks] == ["Wi-Fi"] * 2 + ["Wi-Fi 2"] * 3
+
+
+def test_incremental_parser_emits_network_once_complete():
+    # GIVEN
+    parser = NetshNetworksParser()
+    lines = netsh.show_networks_bssid(2).splitlines()
+    second_ssid = next(i for i, line in enumerate(lines) if line.startswith("SSID 2"))
+
+    # WHEN / THEN
+    assert not any(parser.feed(line) for line in lines[:second_ssid])
+    assert parser.feed(lines[second_ssid]).ssid == "Network1"
+    assert not any(parser.feed(line) for line in lines[second_ssid + 1 :])
+    assert parser.close().ssid == "Network2"
@@ -0,0 +1,186 @@
+import asyncio
+import contextlib
+import shutil
+import subprocess
+from typing import AsyncIterator, Iterator
+
+import pytest
+
+pytest.importorskip("dbus_next")
+if not shutil.which("dbus-daemon"):
+    pytest.skip("dbus-daemon is required for a private bus", allow_module_level=True)
+
+from fakes.network_manager import AccessPoint, FakeNetworkManagerService  # noqa: E402
+
+from pywificli.domain.driver import ConnectionState, ScanResult  # noqa: E402
+from pywificli.domain.retry import RetryPolicy  # noqa: E402
+from pywificli.drivers.english import EnglishLinuxNmDbus  # noqa: E402
+from pywificli.drivers.english.linux_nm_dbus import (  # noqa: E402
+    network_manager_available,
+    security_from_flags,
+)
+
+HOME = AccessPoint("Home", "AA:BB:CC:DD:EE:01", 2437, 90)
+CAFE = AccessPoint("Café", "AA:BB:CC:DD:EE:02", 5180, 40, flags=0, rsn_flags=0)
+NEW = AccessPoint("New", "AA:BB:CC:DD:EE:03", 5955, 60, rsn_flags=0x488)
+
+
+@pytest.fixture
+def bus_address() -> Iterator[str]:
+    daemon = subprocess.Popen(
+        ["dbus-daemon", "--session", "--print-address", "--nofork"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    assert daemon.stdout
+    yield daemon.stdout.readline().strip()
+    daemon.terminate()
+    daemon.wait()
+
+
+@pytest.fixture
+async def network_manager(bus_address: str) -> AsyncIterator[FakeNetworkManagerService]:
+    service = FakeNetworkManagerService({"Home": "password", "Café": ""}, [HOME, CAFE], [NEW])
+    await service.start(bus_address)
+    yield service
+    service.stop()
+
+
+@pytest.fixture
+async def driver(bus_address: str, network_manager: FakeNetworkManagerService) -> AsyncIterator[EnglishLinuxNmDbus]:
+    driver = EnglishLinuxNmDbus(bus_address)
+    yield driver
+    driver.close()
+
+
+def test_security_from_flags():
+    assert security_from_flags(0x1, 0, 0x188) == "WPA2"
+    assert security_from_flags(0x1, 0x188, 0x588) == "WPA1 WPA2 WPA3"
+    assert security_from_flags(0x1, 0, 0) == "WEP"
+    assert security_from_flags(0, 0, 0) is None
+
+
+@pytest.mark.asyncio
+async def test_availability(bus_address: str, network_manager: FakeNetworkManagerService, tmp_path):
+    assert await network_manager_available(bus_address)
+    assert not await network_manager_available(f"unix:path={tmp_path}/missing")
+
+
+@pytest.mark.asyncio
+async def test_interfaces(driver: EnglishLinuxNmDbus):
+    assert await driver.get_available_interfaces() == {"wlan0"}
+
+
+@pytest.mark.asyncio
+async def test_scan_streams_added_access_points(driver: EnglishLinuxNmDbus):
+    # WHEN
+    results = await driver.scan("wlan0", 5)
+
+    # THEN
+    # Access points found by the scan are streamed first, then the ones already known
+    assert results == [
+        ScanResult("New", -70, "AA:BB:CC:DD:EE:03", 1, 5955, "WPA3"),
+        ScanResult("Home", -55, "AA:BB:CC:DD:EE:01", 6, 2437, "WPA2"),
+        ScanResult("Café", -80, "AA:BB:CC:DD:EE:02", 36, 5180, None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_refused_scan_returns_current_access_points(driver: EnglishLinuxNmDbus):
+    # WHEN
+    first, second = await asyncio.gather(driver.scan("wlan0", 5), driver.scan("wlan0", 5))
+
+    # THEN
+    assert {result.ssid for result in first} == {"Home", "Café", "New"}
+    assert {result.ssid for result in second} <= {"Home", "Café", "New"}
+
+
+@pytest.mark.asyncio
+async def test_connect(driver: EnglishLinuxNmDbus, network_manager: FakeNetworkManagerService):
+    # WHEN
+    connected = await driver.connect("wlan0", "Home", "password", 5)
+
+    # THEN
+    assert connected
+    assert await driver.get_connection_state("wlan0") == (ConnectionState.CONNECTED, "Home")
+    assert len(network_manager.connections) == 1
+    # Device paths are looked up once
+    assert network_manager.calls["GetDevices"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_connect_deletes_profile(driver: EnglishLinuxNmDbus, network_manager: FakeNetworkManagerService):
+    assert not await driver.connect("wlan0", "Home", "wrong password", 5)
+    assert network_manager.connections == {}
+
+
+@pytest.mark.asyncio
+async def test_repeated_connects_reuse_one_profile(
+    driver: EnglishLinuxNmDbus, network_manager: FakeNetworkManagerService
+):
+    # GIVEN
+    assert await driver.connect("wlan0", "Home", "password", 5)
+    await driver.disconnect("wlan0")
+
+    # WHEN
+    connected = await driver.connect("wlan0", "Home", "password", 5)
+
+    # THEN
+    assert connected
+    assert len(network_manager.connections) == 1
+    assert (network_manager.calls["AddAndActivateConnection"], network_manager.calls["Update"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_failed_connect_keeps_saved_profile(
+    driver: EnglishLinuxNmDbus, network_manager: FakeNetworkManagerService
+):
+    # GIVEN
+    assert await driver.connect("wlan0", "Home", "password", 5)
+    await driver.disconnect("wlan0")
+    driver.retry_policy = RetryPolicy(max_attempts=1)
+
+    # WHEN
+    connected = await driver.connect("wlan0", "Home", "wrong password", 5)
+
+    # THEN
+    assert not connected
+    assert len(network_manager.connections) == 1
+
+
+@pytest.mark.asyncio
+async def test_watch_follows_state_changes(driver: EnglishLinuxNmDbus):
+    # GIVEN
+    states = []
+    watching_started = asyncio.Event()
+
+    async def watch() -> None:
+        async with contextlib.aclosing(driver.watch_connection_state("wlan0")) as watcher:
+            async for state in watcher:
+                states.append(state)
+                watching_started.set()
+                if len(states) == 4:
+                    return
+
+    watching = asyncio.create_task(watch())
+    await asyncio.wait_for(watching_started.wait(), 1)
+
+    # WHEN
+    await driver.connect("wlan0", "Café", "", 5)
+    await driver.disconnect("wlan0")
+    await asyncio.wait_for(watching, 5)
+
+    # THEN
+    assert states == [
+        (ConnectionState.DISCONNECTED, ""),
+        (ConnectionState.CONNECTING, ""),
+        (ConnectionState.CONNECTED, "Café"),
+        (ConnectionState.DISCONNECTED, ""),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_enable(driver: EnglishLinuxNmDbus):
+    assert await driver.enable("wlan0", False)
+    assert not await driver.is_enabled("wlan0")
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+from pathlib import Path
+
+import pytest
+from vectors.english import nmcli
+
+from pywificli.domain.driver import ConnectionState, ScanResult
+from pywificli.drivers.english import EnglishLinuxNmcli, EnglishLinuxNmcliLegacy
+from pywificli.drivers.english.nmcli_parser import parse_wifi_list_line, split_terse
+
+FAKE_NMCLI = f"""
+import sys
+args = sys.argv[1:]
+with open(sys.argv[0] + ".calls", "a") as calls:
+    calls.write(" ".join(args) + "\\n")
+if "status" in args:
+    sys.stdout.write({nmcli.DEVICE_STATUS!r})
+elif "list" in args:
+    sys.stdout.write({nmcli.WIFI_LIST!r})
+elif args[-2:] in (["radio", "wifi"], ["nm", "wifi"]):
+    print("enabled")
+elif "connect" in args or "disconnect" in args:
+    if "--ask" in args:
+        with open(sys.argv[0] + ".stdin", "a") as stdin:
+            stdin.write(sys.stdin.readline())
+    print("Device 'wlan0' successfully activated.")
+else:
+    sys.exit(2)
+"""
+
+
+@pytest.fixture
+def fake_nmcli(fake_binary) -> Path:
+    return fake_binary("nmcli", FAKE_NMCLI)
+
+
+def calls(fake_nmcli: Path) -> list[str]:
+    return Path(str(fake_nmcli) + ".calls").read_text().splitlines()
+
+
+@pytest.mark.parametrize(
+    "line, fields",
+    [
+        ("a:b:c", ["a", "b", "c"]),
+        ("Fun\\: House:AA\\:BB:", ["Fun: House", "AA:BB", ""]),
+        ("back\\\\slash:x", ["back\\slash", "x"]),
+    ],
+)
+def test_split_terse(line: str, fields: list[str]):
+    assert split_terse(line) == fields
+
+
+def test_parse_wifi_list_line():
+    assert parse_wifi_list_line("Fun\\: House:AA\\:BB\\:CC\\:DD\\:EE\\:FF:36:5180 MHz:80:WPA2 WPA3") == ScanResult(
+        "Fun: House", -60, "AA:BB:CC:DD:EE:FF", 36, 5180, "WPA2 WPA3"
+    )
+    assert parse_wifi_list_line("garbage") is None
+
+
+@pytest.mark.asyncio
+async def test_interfaces_and_states_need_one_call_each(fake_nmcli: Path):
+    # GIVEN
+    driver = EnglishLinuxNmcliLegacy()
+
+    # WHEN
+    interfaces = await driver.get_available_interfaces()
+    connected = await driver.get_connection_state("wlan0")
+    disconnected = await driver.get_connection_state("wlan1")
+    connecting = await driver.get_connection_state("wlan2")
+
+    # THEN
+    assert interfaces == {"wlan0", "wlan1", "wlan2"}
+    assert connected == (ConnectionState.CONNECTED, "Fun: House")
+    assert disconnected == (ConnectionState.DISCONNECTED, "")
+    assert connecting == (ConnectionState.CONNECTING, "Guest")
+    # Concurrent / back to back identical queries are coalesced
+    assert calls(fake_nmcli) == ["-t -f DEVICE,TYPE,STATE,CONNECTION device status"]
+
+
+@pytest.mark.asyncio
+async def test_scan_with_rescan_choice(fake_nmcli: Path):
+    # GIVEN
+    driver = EnglishLinuxNmcliLegacy(rescan="no")
+
+    # WHEN
+    results = await driver.scan("wlan0", 10)
+    [_ async for _ in driver.scan_stream("wlan0", 10, rescan="yes")]
+
+    # THEN
+    assert len(results) == 13
+    assert results[9] == ScanResult("Net:work10", -95, "AA:BB:CC:00:0A:01", 36, 5180, "WPA2")
+    assert results[12] == ScanResult("", -90, None, 11, 2462, None)
+    assert calls(fake_nmcli) == [
+        "-t -f SSID,BSSID,CHAN,FREQ,SIGNAL,SECURITY device wifi list ifname wlan0 --rescan no",
+        "-t -f SSID,BSSID,CHAN,FREQ,SIGNAL,SECURITY device wifi list ifname wlan0 --rescan yes",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_old_nmcli_syntax(fake_nmcli: Path):
+    # GIVEN
+    driver = EnglishLinuxNmcli()
+
+    # WHEN
+    enabled = await driver.is_enabled("wlan0")
+    await driver.scan("wlan0", 10)
+    await driver.disconnect("wlan0")
+
+    # THEN
+    assert enabled
+    assert calls(fake_nmcli) == [
+        "-t nm wifi",
+        "-t -f SSID,BSSID,CHAN,FREQ,SIGNAL,SECURITY dev wifi list iface wlan0",
+        "dev disconnect iface wlan0",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_connect_confirms_state(fake_nmcli: Path, caplog: pytest.LogCaptureFixture):
+    # GIVEN
+    driver = EnglishLinuxNmcliLegacy()
+
+    # WHEN
+    with caplog.at_level(logging.DEBUG, "pywificli.util"):
+        connected = await driver.connect("wlan0", "Fun: House", "s3cret", 10)
+    other = await driver.connect("wlan0", "Other", "s3cret", 10)
+
+    # THEN the password is passed on stdin instead of the command line
+    assert connected
+    assert not other
+    assert calls(fake_nmcli)[0] == "--ask --wait 10 device wifi connect Fun: House ifname wlan0"
+    assert Path(str(fake_nmcli) + ".stdin").read_text().splitlines()[0] == "s3cret"
+    assert "s3cret" not in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_old_nmcli_password_is_not_logged(fake_nmcli: Path, caplog: pytest.LogCaptureFixture):
+    # GIVEN
+    driver = EnglishLinuxNmcli()
+
+    # WHEN
+    with caplog.at_level(logging.DEBUG, "pywificli.util"):
+        await driver.connect("wlan0", "Fun: House", "s3cret", 10)
+
+    # THEN old versions can not read it from stdin but it is still masked in logs
+    assert calls(fake_nmcli)[0] == "--wait 10 dev wifi connect Fun: House password s3cret iface wlan0"
+    assert "Sending command" in caplog.text
+    assert "s3cret" not in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_watch_sees_events_within_the_cache_ttl(fake_binary, tmp_path: Path):
+    # GIVEN events 100 ms apart (within the executor's cache TTL)
+    state = tmp_path / "state"
+    state.write_text("wlan0:wifi:disconnected:\n")
+    fake_binary(
+        "nmcli",
+        f"""
+        import sys, time
+        def event(line, status):
+            open({str(state)!r}, "w").write(status)
+            print(line, flush=True)
+        if "monitor" in sys.argv:
+            time.sleep(0.2)
+            event("wlan0: connecting (prepare)", "wlan0:wifi:connecting (prepare):FunHouse\\n")
+            time.sleep(0.1)
+            event("wlan0: connected", "wlan0:wifi:connected:FunHouse\\n")
+            time.sleep(5)
+        else:
+            sys.stdout.write(open({str(state)!r}).read())
+        """,
+    )
+    driver = EnglishLinuxNmcliLegacy()
+
+    async def first_states(count: int) -> list[tuple[ConnectionState, str]]:
+        states = []
+        async for current in driver.watch_connection_state("wlan0"):
+            states.append(current)
+            if len(states) == count:
+                break
+        return states
+
+    # WHEN
+    states = await asyncio.wait_for(first_states(3), 3)
+
+    # THEN
+    assert states == [
+        (ConnectionState.DISCONNECTED, ""),
+        (ConnectionState.CONNECTING, "FunHouse"),
+        (ConnectionState.CONNECTED, "FunHouse"),
+    ]
@@ -0,0 +1,108 @@
+import asyncio
+import time
+from typing import AsyncIterator
+
+import pytest
+
+from pywificli.exceptions import CommandTimeoutError, PrivilegedHelperError
+from pywificli.util import PrivilegedHelper, cmd, get_executor
+
+# Checks the password on the first stdin line and then runs the command on the rest of stdin, as "sudo -S -p ''" does
+FAKE_SUDO = """
+import os, sys
+password = b""
+while (char := os.read(0, 1)) not in (b"\\n", b""):
+    password += char
+if password != b"secret":
+    sys.exit(1)
+os.execvp(sys.argv[4], sys.argv[4:])
+"""
+
+
+@pytest.fixture
+async def helper() -> AsyncIterator[PrivilegedHelper]:
+    """A helper running unprivileged"""
+    helper = PrivilegedHelper(["echo", "cat", "sh"], elevate=())
+    await helper.start()
+    yield helper
+    await helper.close()
+
+
+@pytest.mark.asyncio
+async def test_commands_round_trip(helper: PrivilegedHelper):
+    # WHEN
+    echoed = await helper.run(["echo", "a b | c"])
+    piped = await helper.run(["cat"], stdin="input")
+    failed = await helper.run(["sh", "-c", "echo oops >&2; exit 3"])
+
+    # THEN
+    assert echoed.stdout == "a b | c\n"
+    assert piped.stdout == "input"
+    assert (failed.return_code, failed.stderr) == (3, "oops\n")
+
+
+@pytest.mark.asyncio
+async def test_only_whitelisted_binaries_run(helper: PrivilegedHelper):
+    # WHEN / THEN
+    with pytest.raises(PrivilegedHelperError, match="rm is not allowed"):
+        await helper.run(["rm", "-rf", "/tmp/nothing"])
+    with pytest.raises(PrivilegedHelperError, match="is not allowed"):
+        await helper.run(["/bin/echo", "full paths bypass the whitelist"])
+    assert helper.running
+
+
+@pytest.mark.asyncio
+async def test_requests_run_concurrently(helper: PrivilegedHelper):
+    # WHEN
+    start = time.perf_counter()
+    results = await asyncio.gather(*[helper.run(["sh", "-c", f"sleep 0.3; echo {n}"]) for n in range(5)])
+
+    # THEN
+    assert [result.stdout for result in results] == [f"{n}\n" for n in range(5)]
+    assert time.perf_counter() - start < 1
+
+
+@pytest.mark.asyncio
+async def test_helper_kills_commands_past_their_timeout(helper: PrivilegedHelper):
+    # WHEN
+    start = time.perf_counter()
+    with pytest.raises(CommandTimeoutError):
+        await helper.run(["sh", "-c", "sleep 10 & sleep 10"], timeout=0.3)
+
+    # THEN
+    assert time.perf_counter() - start < 2
+    assert (await helper.run(["echo", "still running"])).is_ok
+
+
+@pytest.mark.asyncio
+async def test_privileged_commands_do_not_spawn(fake_binary, helper: PrivilegedHelper):
+    # GIVEN
+    executor = get_executor()
+    executor.privileged_helper = helper
+
+    # WHEN
+    privileged = [await cmd(["echo", "root"], privileged=True) for _ in range(3)]
+    await cmd(["echo", "user"])
+
+    # THEN
+    assert all(result.stdout == "root\n" for result in privileged)
+    assert executor.spawn_count == 1
+
+
+@pytest.mark.asyncio
+async def test_sudo_password_is_checked_once(fake_binary):
+    # GIVEN
+    fake_binary("sudo", FAKE_SUDO)
+    helper = PrivilegedHelper(["echo"])
+
+    # WHEN
+    with pytest.raises(PrivilegedHelperError):
+        await helper.start("wrong")
+    await helper.start("secret")
+
+    # THEN
+    assert (await helper.run(["echo", "elevated"])).stdout == "elevated\n"
+    await helper.close()
+    assert not helper.running
+    with pytest.raises(PrivilegedHelperError, match="not running"):
+        await helper.run(["echo"])
@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+import pytest
+
+from pywificli.domain.retry import AttemptOutcome, RetryPolicy
+
+
+def test_backoff_grows_with_jitter_and_is_capped():
+    policy = RetryPolicy(initial_backoff=0.1, max_backoff=0.3, multiplier=2, jitter=0.5)
+
+    for attempt, base in [(1, 0.1), (2, 0.2), (3, 0.3), (10, 0.3)]:
+        delays = [policy.backoff(attempt) for _ in range(100)]
+        assert all(base / 2 <= delay <= base for delay in delays)
+    assert RetryPolicy(initial_backoff=0.1, jitter=0).backoff(2) == 0.2
+
+
+@pytest.mark.asyncio
+async def test_retries_until_success_and_reports_outcomes():
+    # GIVEN
+    outcomes: list[AttemptOutcome] = []
+    policy = RetryPolicy(max_attempts=5, initial_backoff=0.01, on_attempt=[outcomes.append])
+    results = iter([False, RuntimeError("netsh failed"), True])
+
+    async def attempt(remaining: float) -> bool:
+        if isinstance(result := next(results), Exception):
+            raise result
+        return result
+
+    # WHEN
+    connected = await policy.run(attempt, 5)
+
+    # THEN
+    assert connected
+    assert [(o.attempt, o.succeeded, o.error) for o in outcomes] == [
+        (1, False, None),
+        (2, False, "RuntimeError('netsh failed')"),
+        (3, True, None),
+    ]
+    assert outcomes[0].started < outcomes[1].started < outcomes[2].started
+
+
+@pytest.mark.asyncio
+async def test_attempts_share_the_overall_deadline():
+    # GIVEN
+    outcomes: list[AttemptOutcome] = []
+    policy = RetryPolicy(max_attempts=5, initial_backoff=0.05, on_attempt=[outcomes.append])
+    budgets: list[float] = []
+
+    async def attempt(remaining: float) -> bool:
+        budgets.append(remaining)
+        # Ignores its budget. It is cancelled once the deadline is reached.
+        await asyncio.sleep(0.2 if len(budgets) == 1 else 10)
+        return False
+
+    # WHEN
+    start = time.perf_counter()
+    connected = await policy.run(attempt, 0.5)
+    elapsed = time.perf_counter() - start
+
+    # THEN the worst case is the deadline, not max_attempts times the timeout
+    assert not connected
+    assert elapsed < 0.7
+    assert len(budgets) == 2 and budgets[1] < 0.3
+    assert outcomes[-1].error == "timed out"
+
+
+@pytest.mark.asyncio
+async def test_last_exception_is_raised():
+    policy = RetryPolicy(max_attempts=2, initial_backoff=0.01)
+
+    async def attempt(remaining: float) -> bool:
+        raise RuntimeError("netsh failed")
+
+    with pytest.raises(RuntimeError, match="netsh failed"):
+        await policy.run(attempt, 5)
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
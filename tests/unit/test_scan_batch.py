@@ -0,0 +1,64 @@
+import dataclasses
+
+import pytest
+
+from pywificli.domain.scan import ScanBatch, ScanResult, channel_to_frequency
+
+RESULTS = [
+    ScanResult("FunHouse", -70, "aa:bb:cc:dd:ee:01", 36, 5180, "WPA2-Personal"),
+    ScanResult("Guest", -40, "aa:bb:cc:dd:ee:02", 6, 2437, "Open"),
+    ScanResult("FunHouse", -55, "aa:bb:cc:dd:ee:03", 1, 2412, "WPA2-Personal"),
+    ScanResult("Hidden", -90),
+]
+
+
+def test_scan_result_is_slotted_and_immutable():
+    result = RESULTS[0]
+    assert not hasattr(result, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        result.rssi = 0  # type: ignore
+
+
+@pytest.mark.parametrize(
+    "channel, band, frequency",
+    [(1, None, 2412), (14, None, 2484), (36, "5 GHz", 5180), (165, None, 5825), (37, "6 GHz", 6135), (200, None, None)],
+)
+def test_channel_to_frequency(channel, band, frequency):
+    assert channel_to_frequency(channel, band) == frequency
+
+
+def test_batch_round_trips_results():
+    # WHEN
+    batch = ScanBatch(RESULTS)
+
+    # THEN
+    assert len(batch) == 4
+    assert list(batch) == RESULTS
+    assert batch[3].channel is None
+
+
+def test_batch_filter():
+    # GIVEN
+    batch = ScanBatch(RESULTS)
+
+    # THEN
+    assert [r.bssid for r in batch.filter(ssid="FunHouse")] == ["aa:bb:cc:dd:ee:01", "aa:bb:cc:dd:ee:03"]
+    assert [r.ssid for r in batch.filter(min_rssi=-60)] == ["Guest", "FunHouse"]
+    assert list(batch.filter(ssid="FunHouse", predicate=lambda r: r.channel == 1)) == [RESULTS[2]]
+
+
+def test_batch_sort_by_signal():
+    # WHEN
+    batch = ScanBatch(RESULTS).sorted_by_signal()
+
+    # THEN
+    assert [r.rssi for r in batch] == [-40, -55, -70, -90]
+    assert [r.rssi for r in ScanBatch(RESULTS).sorted_by_signal(strongest_first=False)] == [-90, -70, -55, -40]
+
+
+def test_batch_dedupe_by_ssid_keeps_strongest():
+    # WHEN
+    batch = ScanBatch(RESULTS).dedupe_by_ssid()
+
+    # THEN
+    assert list(batch) == [RESULTS[1], RESULTS[2], RESULTS[3]]
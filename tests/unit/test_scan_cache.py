@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from pywificli.components.scan_cache import ScanCache, ScanCacheStats
+from pywificli.domain.scan import ScanResult
+
+
+class Scanner:
+    def __init__(self, delay: float = 0.05) -> None:
+        self.delay = delay
+        self.scans = 0
+
+    async def __call__(self) -> list[ScanResult]:
+        self.scans += 1
+        await asyncio.sleep(self.delay)
+        return [ScanResult(f"Network{self.scans}", -50 - i) for i in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_recent_results_are_reused_within_max_age():
+    # GIVEN
+    cache = ScanCache()
+    scanner = Scanner()
+
+    # WHEN
+    first = await cache.get("wlan0", scanner, max_age=10)
+    second = await cache.get("wlan0", scanner, max_age=10)
+    fresh = await cache.get("wlan0", scanner)
+
+    # THEN
+    assert first == second
+    assert fresh[0].ssid == "Network2"
+    assert scanner.scans == 2
+    assert cache.stats == ScanCacheStats(hits=1, misses=2)
+
+
+@pytest.mark.asyncio
+async def test_expired_results_trigger_a_scan():
+    # GIVEN
+    cache = ScanCache()
+    scanner = Scanner()
+    await cache.get("wlan0", scanner)
+
+    # WHEN
+    await asyncio.sleep(0.05)
+    await cache.get("wlan0", scanner, max_age=0.01)
+
+    # THEN
+    assert scanner.scans == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_scans_join_one_in_flight_scan_per_interface():
+    # GIVEN
+    cache = ScanCache()
+    scanner = Scanner()
+
+    # WHEN
+    results = await asyncio.gather(
+        *[cache.get("wlan0", scanner) for _ in range(4)], cache.get("wlan1", scanner, max_age=1)
+    )
+
+    # THEN
+    assert scanner.scans == 2
+    assert all(result == results[0] for result in results[:4])
+    assert cache.stats == ScanCacheStats(misses=2, joins=3)
+
+
+@pytest.mark.asyncio
+async def test_memory_is_bounded():
+    # GIVEN
+    cache = ScanCache(max_interfaces=2, max_results=2)
+    scanner = Scanner(delay=0)
+
+    # WHEN
+    for interface in ["wlan0", "wlan1", "wlan2"]:
+        results = await cache.get(interface, scanner)
+
+    # THEN strongest results are kept and the least recently used interface is evicted
+    assert [result.rssi for result in results] == [-50, -51]
+    assert cache.stats.evictions == 1
+    await cache.get("wlan0", scanner, max_age=10)
+    assert cache.stats.hits == 0
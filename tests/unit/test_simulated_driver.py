@@ -0,0 +1,151 @@
+import time
+
+import pytest
+
+from pywificli.components.driver_factory import WifiDriverFactory
+from pywificli.components.interface_manager import WifiInterfaceManager
+from pywificli.components.scan_cache import ScanCache
+from pywificli.domain.driver import ConnectionState, ScanState
+from pywificli.domain.metadata import DriverType
+from pywificli.domain.retry import RetryPolicy
+from pywificli.drivers.simulated import Latency, SimulatedFailure, SimulatedWifiDriver, SimulationConfig
+from pywificli.exceptions import CommandTimeoutError
+
+
+@pytest.mark.asyncio
+async def test_factory_selects_simulated_driver():
+    # GIVEN
+    config = SimulationConfig(interfaces=3, networks=5)
+    factory = WifiDriverFactory(
+        use_detection_cache=False, driver_type=DriverType.SIMULATED, driver_options={"config": config}
+    )
+
+    # WHEN
+    driver = await factory.get_wifi_driver()
+
+    # THEN
+    assert isinstance(driver, SimulatedWifiDriver)
+    assert driver.config is config
+    assert await driver.get_available_interfaces() == {"wlan0", "wlan1", "wlan2"}
+
+
+@pytest.mark.asyncio
+async def test_scans_hundreds_of_interfaces_concurrently():
+    # GIVEN
+    driver = SimulatedWifiDriver(
+        SimulationConfig(interfaces=200, networks=100, scan_latency=Latency(0.2, 0.05), seed=1)
+    )
+    manager = WifiInterfaceManager(driver)
+
+    # WHEN
+    start = time.perf_counter()
+    scans = await manager.scan_all(5)
+
+    # THEN all interfaces scan at the same time (sequentially this would take 40 seconds)
+    assert time.perf_counter() - start < 2
+    assert len(scans) == 200
+    assert all(len(results) == 100 for results in scans.values())
+    assert driver.operations["scan"] == 200
+
+
+@pytest.mark.asyncio
+async def test_scan_cache_absorbs_repeated_scans():
+    # GIVEN
+    driver = SimulatedWifiDriver(SimulationConfig(interfaces=10, scan_latency=Latency(0.05)))
+    manager = WifiInterfaceManager(driver, ScanCache())
+
+    # WHEN
+    for _ in range(5):
+        await manager.scan_all(5, max_age=10)
+
+    # THEN
+    assert driver.operations["scan"] == 10
+    assert manager.scan_cache and manager.scan_cache.stats.hits == 40
+
+
+@pytest.mark.asyncio
+async def test_rssi_drifts_between_scans():
+    # GIVEN
+    driver = SimulatedWifiDriver(SimulationConfig(networks=50, rssi_drift=3, seed=7))
+    still = SimulatedWifiDriver(SimulationConfig(networks=50, seed=7))
+
+    # WHEN
+    first = await driver.scan("wlan0", 5)
+    second = await driver.scan("wlan0", 5)
+
+    # THEN
+    assert [result.bssid for result in first] == [result.bssid for result in second]
+    assert [result.rssi for result in first] != [result.rssi for result in second]
+    assert all(-100 <= result.rssi <= -20 for result in second)
+    assert await still.scan("wlan0", 5) == await still.scan("wlan0", 5)
+
+
+@pytest.mark.asyncio
+async def test_scan_failures_and_scan_state():
+    # GIVEN
+    driver = SimulatedWifiDriver(SimulationConfig(scan_failure_rate=1))
+
+    # WHEN / THEN
+    with pytest.raises(SimulatedFailure):
+        await driver.scan("wlan0", 5)
+    assert await driver.get_scan_state("wlan0") is ScanState.IDLE
+
+
+@pytest.mark.asyncio
+async def test_connect_failures_are_retried():
+    # GIVEN half of all attempts fail
+    driver = SimulatedWifiDriver(SimulationConfig(networks=5, connect_failure_rate=0.5, seed=3))
+    driver.retry_policy = RetryPolicy(max_attempts=10, initial_backoff=0, jitter=0)
+
+    # WHEN
+    results = [await driver.connect("wlan0", "SimNet1", "", 5) for _ in range(20)]
+
+    # THEN
+    assert all(results)
+    assert driver.operations["connect"] > 20
+    assert await driver.get_connection_state("wlan0") == (ConnectionState.CONNECTED, "SimNet1")
+
+
+@pytest.mark.asyncio
+async def test_connect_checks_ssid_and_password():
+    # GIVEN
+    driver = SimulatedWifiDriver(SimulationConfig(networks=5, passwords={"SimNet2": "secret"}))
+    driver.retry_policy = RetryPolicy(max_attempts=1)
+
+    # WHEN / THEN
+    assert not await driver.connect("wlan0", "Elsewhere", "", 5)
+    assert not await driver.connect("wlan0", "SimNet2", "wrong", 5)
+    assert await driver.get_connection_state("wlan0") == (ConnectionState.DISCONNECTED, "")
+    assert await driver.connect("wlan0", "SimNet2", "secret", 5)
+    assert await driver.disconnect("wlan0")
+    assert await driver.get_connection_state("wlan0") == (ConnectionState.DISCONNECTED, "")
+
+
+@pytest.mark.asyncio
+async def test_slow_scan_times_out():
+    # GIVEN
+    driver = SimulatedWifiDriver(SimulationConfig(scan_latency=Latency(5)))
+
+    # WHEN
+    start = time.perf_counter()
+    with pytest.raises(CommandTimeoutError):
+        await driver.scan("wlan0", 0.2)
+
+    # THEN
+    assert time.perf_counter() - start < 1
+    assert await driver.get_scan_state("wlan0") == ScanState.IDLE
+
+
+@pytest.mark.asyncio
+async def test_slow_connect_is_cut_off_at_the_deadline():
+    # GIVEN
+    driver = SimulatedWifiDriver(SimulationConfig(connect_latency=Latency(5)))
+
+    # WHEN
+    start = time.perf_counter()
+    connected = await driver.connect("wlan0", "SimNet0", "", 0.2)
+
+    # THEN
+    assert not connected
+    assert time.perf_counter() - start < 1
+    assert await driver.get_connection_state("wlan0") == (ConnectionState.DISCONNECTED, "")
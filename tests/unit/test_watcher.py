@@ -0,0 +1,183 @@
+import asyncio
+import os
+import stat
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+
+from pywificli.domain.driver import ConnectionState, IWifiDriver, ScanResult, ScanState
+from pywificli.domain.metadata import DriverType, SystemLanguage
+from pywificli.drivers.watch import watch_with_monitor
+from pywificli.exceptions import CommandProcessError
+
+
+class FakeDriver(IWifiDriver):
+    """Driver whose connection state is read from a file written by a fake monitor"""
+
+    def __init__(self, state_file: Path, monitor: list[str] | None = None) -> None:
+        self.state_file = state_file
+        self.monitor = monitor
+        self.queries = 0
+
+    @property
+    def _driver_type(self) -> DriverType:
+        return DriverType.WINDOWS
+
+    @property
+    def _system_language(self) -> SystemLanguage:
+        return SystemLanguage.ENGLISH
+
+    async def get_available_interfaces(self) -> set[str]:
+        return {"wlan0"}
+
+    async def is_enabled(self, interface: str) -> bool:
+        return True
+
+    async def scan_stream(self, interface: str, timeout: float):
+        for _ in []:
+            yield ScanResult("", 0)
+
+    async def connect(self, interface: str, ssid: str, password: str, timeout: float) -> bool:
+        return False
+
+    async def disconnect(self, interface: str) -> bool:
+        return False
+
+    async def get_connection_state(self, interface: str) -> tuple[ConnectionState, str]:
+        self.queries += 1
+        state, _, ssid = self.state_file.read_text().strip().partition(" ")
+        return ConnectionState[state], ssid
+
+    async def watch_connection_state(self, interface: str, min_interval: float = 0.1, max_interval: float = 1.0):
+        if self.monitor is None:
+            async for state in super().watch_connection_state(interface, min_interval, max_interval):
+                yield state
+        else:
+            async for state in watch_with_monitor(self, interface, self.monitor):
+                yield state
+
+    async def get_scan_state(self, interface: str) -> ScanState:
+        return ScanState.IDLE
+
+    async def enable(self, interface: str, enable: bool) -> bool:
+        return True
+
+
+@pytest.fixture
+def state_file(tmp_path: Path) -> Path:
+    path = tmp_path / "state"
+    path.write_text("DISCONNECTED ")
+    return path
+
+
+def fake_monitor(tmp_path: Path, state_file: Path, script: str) -> list[str]:
+    """Create a fake monitor binary that updates the state file and reports events on stdout"""
+    path = tmp_path / "fake_monitor"
+    path.write_text(f"#!{sys.executable}\n" + textwrap.dedent(f"""
+            import sys, time
+            def event(line, state):
+                open({str(state_file)!r}, "w").write(state)
+                print(line, flush=True)
+            """) + textwrap.dedent(script))
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return [str(path)]
+
+
+@pytest.mark.asyncio
+async def test_wait_resolves_on_monitor_event(tmp_path: Path, state_file: Path):
+    # GIVEN
+    monitor = fake_monitor(
+        tmp_path,
+        state_file,
+        """
+        time.sleep(0.2)
+        print("unrelated: noise", flush=True)
+        event("wlan0: connecting", "CONNECTING FunHouse")
+        time.sleep(0.1)
+        event("wlan0: connected", "CONNECTED FunHouse")
+        time.sleep(5)
+        """,
+    )
+    driver = FakeDriver(state_file, monitor)
+
+    # WHEN
+    start = time.perf_counter()
+    reached = await driver.wait_for_connection_state("wlan0", ConnectionState.CONNECTED, "FunHouse", 3)
+
+    # THEN
+    assert reached
+    assert time.perf_counter() - start < 1.5
+    # Initial query and one per relevant event only
+    assert driver.queries == 3
+
+
+@pytest.mark.asyncio
+async def test_wait_times_out(tmp_path: Path, state_file: Path):
+    # GIVEN
+    driver = FakeDriver(state_file, fake_monitor(tmp_path, state_file, "time.sleep(5)"))
+
+    # WHEN
+    reached = await driver.wait_for_connection_state("wlan0", ConnectionState.CONNECTED, "FunHouse", 0.3)
+
+    # THEN
+    assert not reached
+
+
+@pytest.mark.asyncio
+async def test_missing_monitor_falls_back_to_polling(state_file: Path):
+    # GIVEN
+    driver = FakeDriver(state_file, ["pywificli-missing-monitor"])
+
+    async def connect_later() -> None:
+        await asyncio.sleep(0.2)
+        state_file.write_text("CONNECTED FunHouse")
+
+    # WHEN
+    task = asyncio.create_task(connect_later())
+    reached = await driver.wait_for_connection_state("wlan0", ConnectionState.CONNECTED, "FunHouse", 3)
+    await task
+
+    # THEN
+    assert reached
+
+
+@pytest.mark.asyncio
+async def test_query_errors_are_not_mistaken_for_a_missing_monitor(
+    tmp_path: Path, state_file: Path, monkeypatch: pytest.MonkeyPatch
+):
+    # GIVEN
+    driver = FakeDriver(state_file, fake_monitor(tmp_path, state_file, "time.sleep(5)"))
+    get_connection_state = driver.get_connection_state
+
+    async def failing_once(interface: str) -> tuple[ConnectionState, str]:
+        monkeypatch.setattr(driver, "get_connection_state", get_connection_state)
+        raise CommandProcessError("nmcli device status", "exited with return code 8")
+
+    monkeypatch.setattr(driver, "get_connection_state", failing_once)
+
+    # WHEN / THEN the failure is raised instead of falling back to polling (which would query successfully)
+    with pytest.raises(CommandProcessError, match="return code 8"):
+        await driver.wait_for_connection_state("wlan0", ConnectionState.CONNECTED, "FunHouse", 1)
+
+
+@pytest.mark.asyncio
+async def test_adaptive_polling_reacts_faster_than_one_second(state_file: Path):
+    # GIVEN
+    driver = FakeDriver(state_file)
+
+    async def connect_later() -> None:
+        await asyncio.sleep(0.15)
+        state_file.write_text("CONNECTED FunHouse")
+
+    # WHEN
+    start = time.perf_counter()
+    task = asyncio.create_task(connect_later())
+    reached = await driver.wait_for_connection_state("wlan0", ConnectionState.CONNECTED, None, 3)
+    await task
+
+    # THEN
+    assert reached
+    assert time.perf_counter() - start < 0.6
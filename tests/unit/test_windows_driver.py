@@ -0,0 +1,247 @@
+import contextlib
+import time
+from pathlib import Path
+
+import pytest
+from vectors.english import netsh
+
+from pywificli.components.interface_controller import WifiInterfaceController
+from pywificli.domain.driver import ConnectionState, ScanResult
+from pywificli.drivers.english import EnglishLinuxWindows
+from pywificli.exceptions import CommandTimeoutError
+
+BLOCKS = netsh.SHOW_NETWORKS_BSSID.split("\r\nSSID ")
+NETSH = f"""
+import sys, time
+if "interfaces" in sys.argv:
+    sys.stdout.write({netsh.SHOW_INTERFACES!r})
+    sys.exit()
+for i, block in enumerate({BLOCKS!r}):
+    sys.stdout.write(("\\r\\nSSID " if i else "") + block)
+    sys.stdout.flush()
+    if i == 2:
+        time.sleep(float(open(sys.argv[0] + ".delay").read()))
+"""
+
+
+@pytest.fixture
+def fake_netsh(fake_binary) -> Path:
+    netsh = fake_binary("netsh", NETSH)
+    Path(str(netsh) + ".delay").write_text("0")
+    return netsh
+
+
+@pytest.mark.asyncio
+async def test_scan_finds_more_than_nine_ssids(fake_netsh: Path):
+    # WHEN
+    results = await EnglishLinuxWindows().scan("Wi-Fi", 10)
+
+    # THEN
+    assert list(dict.fromkeys(result.ssid for result in results)) == [f"Network{i}" for i in range(1, 13)]
+    # One result per BSSID
+    assert len(results) == 24
+    assert results[2] == ScanResult(
+        ssid="Network2",
+        rssi=(2 * 7 + 1) // 2 - 100,
+        bssid="aa:bb:cc:02:ee:01",
+        channel=40,
+        frequency=5200,
+        security="WPA2-Personal",
+    )
+
+
+@pytest.mark.asyncio
+async def test_scan_stream_stops_scan_when_consumer_breaks(fake_netsh: Path):
+    # GIVEN
+    Path(str(fake_netsh) + ".delay").write_text("5")
+    controller = WifiInterfaceController(EnglishLinuxWindows(), "Wi-Fi")
+
+    # WHEN
+    start = time.perf_counter()
+    async with contextlib.aclosing(controller.scan_stream(10)) as results:
+        async for result in results:
+            break
+
+    # THEN first result arrives before the scan completes and the scan is not awaited
+    assert result.ssid == "Network1"
+    assert time.perf_counter() - start < 2
+
+
+@pytest.mark.asyncio
+async def test_scan_is_cut_off_at_its_timeout(fake_netsh: Path):
+    # GIVEN
+    Path(str(fake_netsh) + ".delay").write_text("5")
+
+    # WHEN
+    start = time.perf_counter()
+    with pytest.raises(CommandTimeoutError):
+        await EnglishLinuxWindows().scan("Wi-Fi", 0.5)
+
+    # THEN
+    assert time.perf_counter() - start < 2
+
+
+@pytest.mark.asyncio
+async def test_interfaces_and_connection_state_are_parsed(fake_netsh: Path):
+    # GIVEN
+    driver = EnglishLinuxWindows()
+
+    # WHEN
+    interfaces = await driver.get_available_interfaces()
+    connected = await driver.get_connection_state("Wi-Fi")
+    disconnected = await driver.get_connection_state("Wi-Fi 2")
+
+    # THEN
+    assert interfaces == {"Wi-Fi", "Wi-Fi 2"}
+    assert connected == (ConnectionState.CONNECTED, "Fun: House")
+    assert disconnected == (ConnectionState.DISCONNECTED, "")
+
+
+CONNECTING_NETSH = f"""
+import os, re, shlex, sys
+base = sys.argv[0]
+
+def read(name):
+    return open(base + name).read().splitlines() if os.path.exists(base + name) else []
+
+def write(name, lines):
+    open(base + name, "w").write("\\n".join(lines))
+
+def run(args):
+    with open(base + ".calls", "a") as calls:
+        calls.write(" ".join(args[:3]) + "\\n")
+    profiles = read(".profiles")
+    if "interfaces" in args:
+        ssid = read(".ssid")
+        output = {netsh.SHOW_INTERFACES!r}
+        if ssid:
+            output = output.replace("State                  : disconnected", "State                  : connected\\r\\n    SSID                   : " + ssid[0])
+        sys.stdout.write(output)
+    elif args[:3] == ["wlan", "add", "profile"]:
+        name = re.search("<name>(.*)</name>", open(args[3][len("filename="):]).read()).group(1)
+        write(".profiles", profiles + [name])
+        print(f"Profile {{name}} is added on interface Wi-Fi 2.")
+    elif args[:3] == ["wlan", "delete", "profile"]:
+        name = args[3][len("name="):]
+        if name not in profiles:
+            print(f'Profile "{{name}}" is not found on any interface.')
+            return 1
+        write(".profiles", [profile for profile in profiles if profile != name])
+        print(f'Profile "{{name}}" is deleted from interface "Wi-Fi 2".')
+    elif args[:2] == ["wlan", "connect"]:
+        name = args[3][len("name="):]
+        if name not in profiles:
+            print(f'There is no profile "{{name}}" assigned to the specified interface.')
+            return 1
+        write(".ssid", [name])
+        print("Connection request was completed successfully.")
+    elif args[:2] == ["wlan", "disconnect"]:
+        write(".ssid", [])
+        print('Disconnection request was completed successfully for interface "Wi-Fi 2".')
+    else:
+        print("The following command was not found: " + " ".join(args) + ".")
+        return 1
+    return 0
+
+if sys.argv[1] == "-f":
+    with open(base + ".spawns", "a") as spawns:
+        spawns.write("script\\n")
+    # Like netsh, carry on after failing lines
+    codes = [run(shlex.split(line)) for line in open(sys.argv[2]).read().splitlines()]
+    sys.exit(max(codes))
+sys.exit(run(sys.argv[1:]))
+"""
+
+
+@pytest.fixture
+def connecting_netsh(fake_binary) -> Path:
+    return fake_binary("netsh", CONNECTING_NETSH)
+
+
+def take_calls(netsh: Path) -> list[str]:
+    """Get (and reset) the netsh calls other than (cacheable) queries and batch markers"""
+    calls_file = Path(str(netsh) + ".calls")
+    if not calls_file.exists():
+        return []
+    calls = calls_file.read_text().splitlines()
+    calls_file.unlink()
+    return [call for call in calls if call != "wlan show interfaces" and not call.startswith("pywificli-batch-")]
+
+
+def take_scripts(netsh: Path) -> int:
+    """Get (and reset) how many scripts netsh ran"""
+    spawns_file = Path(str(netsh) + ".spawns")
+    if not spawns_file.exists():
+        return 0
+    scripts = len(spawns_file.read_text().splitlines())
+    spawns_file.unlink()
+    return scripts
+
+
+@pytest.mark.asyncio
+async def test_reconnect_reuses_profile(connecting_netsh: Path):
+    # GIVEN
+    driver = EnglishLinuxWindows()
+    assert await driver.connect("Wi-Fi 2", "Home", "password", 5)
+    assert "wlan add profile" in take_calls(connecting_netsh)
+    await driver.disconnect("Wi-Fi 2")
+    take_calls(connecting_netsh)
+
+    # WHEN
+    connected = await driver.connect("Wi-Fi 2", "Home", "password", 5)
+
+    # THEN no profile is deleted / written
+    assert connected
+    assert take_calls(connecting_netsh) == ["wlan connect ssid=Home"]
+
+
+@pytest.mark.asyncio
+async def test_connect_short_circuits_when_connected(connecting_netsh: Path):
+    # GIVEN
+    driver = EnglishLinuxWindows()
+    await driver.connect("Wi-Fi 2", "Home", "password", 5)
+    take_calls(connecting_netsh)
+
+    # WHEN
+    connected = await driver.connect("Wi-Fi 2", "Home", "password", 5)
+
+    # THEN
+    assert connected
+    assert take_calls(connecting_netsh) == []
+
+
+@pytest.mark.asyncio
+async def test_changed_password_replaces_profile(connecting_netsh: Path):
+    # GIVEN
+    driver = EnglishLinuxWindows()
+    await driver.connect("Wi-Fi 2", "Home", "password", 5)
+    take_calls(connecting_netsh)
+    take_scripts(connecting_netsh)
+
+    # WHEN
+    connected = await driver.connect("Wi-Fi 2", "Home", "new password", 5)
+
+    # THEN the profile is replaced and connected to in a single netsh invocation
+    assert connected
+    assert take_calls(connecting_netsh) == [
+        "wlan disconnect interface=Wi-Fi 2",
+        "wlan delete profile",
+        "wlan add profile",
+        "wlan connect ssid=Home",
+    ]
+    assert take_scripts(connecting_netsh) == 1
+
+
+@pytest.mark.asyncio
+async def test_externally_removed_profile_is_reinstalled(connecting_netsh: Path):
+    # GIVEN
+    driver = EnglishLinuxWindows()
+    await driver.connect("Wi-Fi 2", "Home", "password", 5)
+    await driver.disconnect("Wi-Fi 2")
+    Path(str(connecting_netsh) + ".profiles").write_text("")
+
+    # WHEN
+    connected = await driver.connect("Wi-Fi 2", "Home", "password", 5)
+
+    # THEN
+    assert connected
@@ -0,0 +1,205 @@
+import asyncio
+import contextlib
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import AsyncIterator, Iterator
+
+import pytest
+from fakes.wpa_supplicant import FakeWpaSupplicant
+
+from pywificli.domain.driver import ConnectionState, ScanResult
+from pywificli.domain.retry import RetryPolicy
+from pywificli.domain.scan import frequency_to_channel
+from pywificli.drivers.english import EnglishLinuxWpa
+from pywificli.drivers.english.wpa_parser import security_from_flags, unescape
+from pywificli.drivers.wpa_ctrl import WpaCtrl
+from pywificli.exceptions import WpaCtrlError
+
+
+@pytest.fixture
+def ctrl_dir() -> Iterator[Path]:
+    # UNIX socket paths are limited to ~100 characters, which pytest's tmp_path may exceed
+    path = Path(tempfile.mkdtemp(prefix="wpa"))
+    yield path
+    shutil.rmtree(path)
+
+
+@pytest.fixture
+async def supplicant(ctrl_dir: Path) -> AsyncIterator[FakeWpaSupplicant]:
+    server = FakeWpaSupplicant(str(ctrl_dir / "wlan0"), {"Home": "password", "Open": ""})
+    await server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+async def driver(ctrl_dir: Path, supplicant: FakeWpaSupplicant) -> AsyncIterator[EnglishLinuxWpa]:
+    driver = EnglishLinuxWpa(ctrl_dir)
+    yield driver
+    driver.close()
+
+
+@pytest.mark.parametrize(
+    "escaped, value",
+    [("Home", "Home"), ("Caf\\xc3\\xa9", "Café"), ('\\"quoted\\" \\\\', '"quoted" \\'), ("tab\\there", "tab\there")],
+)
+def test_unescape(escaped: str, value: str):
+    assert unescape(escaped) == value
+
+
+def test_scan_result_fields():
+    assert security_from_flags("[WPA2-PSK-CCMP][WPS][ESS]") == "WPA2-PSK-CCMP"
+    assert security_from_flags("[ESS]") is None
+    assert [frequency_to_channel(f) for f in (2412, 2484, 5180, 5955, 1000)] == [1, 14, 36, 1, None]
+
+
+@pytest.mark.asyncio
+async def test_interfaces(driver: EnglishLinuxWpa, ctrl_dir: Path):
+    (ctrl_dir / "not-a-socket").touch()
+    assert await driver.get_available_interfaces() == {"wlan0"}
+    assert await EnglishLinuxWpa(ctrl_dir / "missing").get_available_interfaces() == set()
+
+
+@pytest.mark.asyncio
+async def test_scan_completes_on_event(driver: EnglishLinuxWpa, supplicant: FakeWpaSupplicant):
+    # WHEN
+    start = time.perf_counter()
+    results = await driver.scan("wlan0", 5)
+
+    # THEN
+    assert time.perf_counter() - start < 1
+    assert results == [
+        ScanResult("Home", -45, "aa:bb:cc:dd:ee:01", 6, 2437, "WPA2-PSK-CCMP"),
+        ScanResult("Home", -60, "aa:bb:cc:dd:ee:02", 36, 5180, "WPA2-PSK-CCMP"),
+        ScanResult('Café "Free"', -71, "aa:bb:cc:dd:ee:03", 1, 2412, None),
+        ScanResult("", -80, "aa:bb:cc:dd:ee:04", 1, 5955, "RSN-SAE-CCMP"),
+    ]
+    # No polling: the scan is finished by CTRL-EVENT-SCAN-RESULTS
+    assert supplicant.commands == {"ATTACH": 1, "SCAN": 1, "SCAN_RESULTS": 1}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_scans_share_one(driver: EnglishLinuxWpa, supplicant: FakeWpaSupplicant):
+    results = await asyncio.gather(driver.scan("wlan0", 5), driver.scan("wlan0", 5))
+
+    assert results[0] == results[1]
+    assert supplicant.commands["SCAN"] == 2
+
+
+@pytest.mark.asyncio
+async def test_connect(driver: EnglishLinuxWpa, supplicant: FakeWpaSupplicant):
+    # WHEN
+    connected = await driver.connect("wlan0", "Home", "password", 5)
+
+    # THEN
+    assert connected
+    assert await driver.get_connection_state("wlan0") == (ConnectionState.CONNECTED, "Home")
+    assert supplicant.configured["1"] == {"ssid": "486f6d65", "key_mgmt": "WPA-PSK", "psk": '"password"'}
+    # Only the final confirmation queries the status
+    assert supplicant.commands["STATUS"] == 2
+
+
+@pytest.mark.asyncio
+async def test_connect_open_network(driver: EnglishLinuxWpa, supplicant: FakeWpaSupplicant):
+    assert await driver.connect("wlan0", "Open", "", 5)
+    assert supplicant.configured["1"]["key_mgmt"] == "NONE"
+
+
+@pytest.mark.asyncio
+async def test_failed_connect_returns_early_and_cleans_up(driver: EnglishLinuxWpa, supplicant: FakeWpaSupplicant):
+    # GIVEN
+    driver.retry_policy = RetryPolicy(max_attempts=1)
+
+    # WHEN
+    start = time.perf_counter()
+    connected = await driver.connect("wlan0", "Home", "wrong password", 5)
+
+    # THEN
+    assert not connected
+    assert time.perf_counter() - start < 1
+    assert supplicant.configured == {}
+
+
+@pytest.mark.asyncio
+async def test_repeated_connects_reuse_one_network(driver: EnglishLinuxWpa, supplicant: FakeWpaSupplicant):
+    # GIVEN
+    driver.retry_policy = RetryPolicy(max_attempts=1)
+    assert await driver.connect("wlan0", "Home", "password", 5)
+
+    # WHEN
+    failed = await driver.connect("wlan0", "Home", "wrong password", 5)
+    connected = await driver.connect("wlan0", "Home", "password", 5)
+
+    # THEN
+    assert (failed, connected) == (False, True)
+    # The failed attempt did not remove the network it had not added either
+    assert list(supplicant.configured) == ["1"]
+    assert supplicant.commands["ADD_NETWORK"] == 1
+
+
+@pytest.mark.asyncio
+async def test_watch_follows_events(driver: EnglishLinuxWpa):
+    # GIVEN
+    states = []
+
+    async def watch() -> None:
+        async with contextlib.aclosing(driver.watch_connection_state("wlan0")) as watcher:
+            async for state in watcher:
+                states.append(state)
+                if len(states) == 3:
+                    return
+
+    watching = asyncio.create_task(watch())
+    await asyncio.sleep(0.05)
+
+    # WHEN
+    await driver.connect("wlan0", "Home", "password", 5)
+    await driver.disconnect("wlan0")
+    await asyncio.wait_for(watching, 1)
+
+    # THEN
+    assert states == [
+        (ConnectionState.DISCONNECTED, ""),
+        (ConnectionState.CONNECTED, "Home"),
+        (ConnectionState.DISCONNECTED, ""),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_missing_socket_raises(ctrl_dir: Path):
+    with pytest.raises(WpaCtrlError):
+        await EnglishLinuxWpa(ctrl_dir).get_connection_state("wlan9")
+
+
+@pytest.mark.asyncio
+async def test_request_timeout(supplicant: FakeWpaSupplicant):
+    async with WpaCtrl(supplicant.path, timeout=0.1) as ctrl:
+        assert await ctrl.request("PING") == "PONG\n"
+        # DETACH is never answered
+        with pytest.raises(WpaCtrlError, match="No reply to DETACH"):
+            await ctrl.request("DETACH")
+
+
+@pytest.mark.asyncio
+async def test_enable_sets_the_link(fake_binary, ctrl_dir: Path):
+    # GIVEN
+    ip = fake_binary(
+        "ip",
+        """
+        import sys
+        open(sys.argv[0] + ".calls", "a").write(" ".join(sys.argv[1:]) + "\\n")
+        sys.exit(2 if "wlan9" in sys.argv else 0)
+        """,
+    )
+    driver = EnglishLinuxWpa(ctrl_dir)
+
+    # WHEN
+    disabled = await driver.enable("wlan0", False)
+    enabled = await driver.enable("wlan0", True)
+    missing = await driver.enable("wlan9", True)
+
+    # THEN
+    assert (disabled, enabled, missing) == (True, True, False)
+    assert Path(str(ip) + ".calls").read_text().splitlines()[:2] == ["link set dev wlan0 down", "link set dev wlan0 up"]
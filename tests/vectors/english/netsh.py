@@ -0,0 +1,80 @@
+"""Recorded netsh outputs (English)"""
+
+SHOW_INTERFACES = (
+    "\r\n"
+    "There are 2 interfaces on the system:\r\n"
+    "\r\n"
+    "    Name                   : Wi-Fi\r\n"
+    "    Description            : Intel(R) Wi-Fi 6 AX201 160MHz\r\n"
+    "    GUID                   : 0c1a2e3f-0000-4a7b-9c2d-1e2f3a4b5c6d\r\n"
+    "    Physical address       : 98:48:27:88:cb:18\r\n"
+    "    Interface type         : Primary\r\n"
+    "    State                  : connected\r\n"
+    "    SSID                   : Fun: House\r\n"
+    "    AP BSSID               : aa:bb:cc:dd:ee:01\r\n"
+    "    Band                   : 5 GHz\r\n"
+    "    Channel                : 36\r\n"
+    "    Network type           : Infrastructure\r\n"
+    "    Radio type             : 802.11ac\r\n"
+    "    Authentication         : WPA2-Personal\r\n"
+    "    Cipher                 : CCMP\r\n"
+    "    Connection mode        : Profile\r\n"
+    "    Receive rate (Mbps)    : 866.7\r\n"
+    "    Transmit rate (Mbps)   : 866.7\r\n"
+    "    Signal                 : 96%\r\n"
+    "    Profile                : Fun: House\r\n"
+    "\r\n"
+    "    Name                   : Wi-Fi 2\r\n"
+    "    Description            : TP-Link Wireless USB Adapter\r\n"
+    "    GUID                   : 093d8022-33cb-4400-8362-275eaf24cb86\r\n"
+    "    Physical address       : 98:48:27:88:cb:19\r\n"
+    "    Interface type         : Primary\r\n"
+    "    State                  : disconnected\r\n"
+    "    Radio status           : Hardware On\r\n"
+    "                             Software On\r\n"
+    "\r\n"
+    "    Hosted network status  : Not available\r\n"
+    "\r\n"
+)
+
+SHOW_NO_INTERFACES = "There is no wireless interface on the system.\r\n"
+
+NETWORK_TEMPLATE = (
+    "SSID {index} : {ssid}\r\n"
+    "    Network type            : Infrastructure\r\n"
+    "    Authentication          : WPA2-Personal\r\n"
+    "    Encryption              : CCMP\r\n"
+)
+
+BSSID_TEMPLATE = (
+    "    BSSID {index}                 : aa:bb:cc:{octet:02x}:ee:{index:02x}\r\n"
+    "         Signal             : {signal}%\r\n"
+    "         Radio type         : 802.11ax\r\n"
+    "         Band               : 5 GHz\r\n"
+    "         Channel            : {channel}\r\n"
+    "         Basic rates (Mbps) : 6 12 24\r\n"
+    "         Other rates (Mbps) : 9 18 36 48 54\r\n"
+)
+
+
+def show_networks_bssid(networks: int, bssids: int = 2, interface: str = "Wi-Fi") -> str:
+    """Build "netsh wlan show networks mode=bssid" output
+
+    Args:
+        networks (int): amount of SSIDs
+        bssids (int): amount of BSSIDs per SSID. Defaults to 2.
+        interface (str): interface name. Defaults to "Wi-Fi".
+
+    Returns:
+        str: CRLF separated output
+    """
+    output = [f"\r\nInterface name : {interface}\r\nThere are {networks} networks currently visible.\r\n\r\n"]
+    for n in range(1, networks + 1):
+        output.append(NETWORK_TEMPLATE.format(index=n, ssid=f"Network{n}"))
+        for b in range(1, bssids + 1):
+            output.append(BSSID_TEMPLATE.format(index=b, octet=n % 256, signal=(n * 7 + b) % 100, channel=36 + b * 4))
+        output.append("\r\n")
+    return "".join(output)
+
+
+SHOW_NETWORKS_BSSID = show_networks_bssid(12)
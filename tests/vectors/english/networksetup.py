@@ -0,0 +1,19 @@
+"""Recorded networksetup outputs (English)"""
+
+LIST_ALL_HARDWARE_PORTS = (
+    "\n"
+    "Hardware Port: Ethernet\n"
+    "Device: en0\n"
+    "Ethernet Address: 98:48:27:88:cb:17\n"
+    "\n"
+    "Hardware Port: Wi-Fi\n"
+    "Device: en1\n"
+    "Ethernet Address: 98:48:27:88:cb:18\n"
+    "\n"
+    "VLAN Configurations\n"
+    "===================\n"
+)
+
+GET_AIRPORT_NETWORK = "Current Wi-Fi Network: {ssid}\n"
+
+GET_AIRPORT_NETWORK_DISCONNECTED = "You are not associated with an AirPort network.\n"
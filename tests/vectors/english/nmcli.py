@@ -0,0 +1,37 @@
+"""Recorded nmcli terse outputs"""
+
+DEVICE_STATUS = (
+    "wlan0:wifi:connected:Fun\\: House\n"
+    "wlan1:wifi:disconnected:\n"
+    "wlan2:wifi:connecting (configuring):Guest\n"
+    "eth0:ethernet:connected:Wired connection 1\n"
+    "p2p-dev-wlan0:wifi-p2p:disconnected:\n"
+    "lo:loopback:connected (externally):lo\n"
+)
+
+WIFI_LIST_LINE = "{ssid}:AA\\:BB\\:CC\\:{a:02X}\\:{b:02X}\\:01:{channel}:{frequency} MHz:{signal}:WPA2\n"
+
+
+def wifi_list(networks: int) -> str:
+    """Build "nmcli -t -f SSID,BSSID,CHAN,FREQ,SIGNAL,SECURITY device wifi list" output
+
+    Args:
+        networks (int): amount of access points
+
+    Returns:
+        str: output
+    """
+    return "".join(
+        WIFI_LIST_LINE.format(
+            ssid=f"Network{n}" if n % 10 else f"Net\\:work{n}",
+            a=n >> 8 & 0xFF,
+            b=n & 0xFF,
+            channel=6 if n % 2 else 36,
+            frequency=2437 if n % 2 else 5180,
+            signal=n % 100,
+        )
+        for n in range(1, networks + 1)
+    )
+
+
+WIFI_LIST = wifi_list(12) + "::11:2462 MHz:20:\n"
@@ -0,0 +1,32 @@
+"""Recorded wpa_supplicant control interface replies"""
+
+SCAN_RESULTS = (
+    "bssid / frequency / signal level / flags / ssid\n"
+    "aa:bb:cc:dd:ee:01\t2437\t-45\t[WPA2-PSK-CCMP][WPS][ESS]\tHome\n"
+    "aa:bb:cc:dd:ee:02\t5180\t-60\t[WPA2-PSK-CCMP][ESS]\tHome\n"
+    'aa:bb:cc:dd:ee:03\t2412\t-71\t[ESS]\tCaf\\xc3\\xa9 \\"Free\\"\n'
+    "aa:bb:cc:dd:ee:04\t5955\t-80\t[RSN-SAE-CCMP][ESS]\t\n"
+)
+
+SCAN_RESULTS_LINE = "aa:bb:cc:{a:02x}:{b:02x}:01\t{frequency}\t{signal}\t[WPA2-PSK-CCMP][ESS]\tNetwork{n}\n"
+
+
+def scan_results(networks: int) -> str:
+    """Build a SCAN_RESULTS reply
+
+    Args:
+        networks (int): amount of access points
+
+    Returns:
+        str: reply
+    """
+    return SCAN_RESULTS.splitlines(keepends=True)[0] + "".join(
+        SCAN_RESULTS_LINE.format(
+            a=n >> 8 & 0xFF,
+            b=n & 0xFF,
+            frequency=2437 if n % 2 else 5180,
+            signal=-30 - n % 60,
+            n=n,
+        )
+        for n in range(1, networks + 1)
+    )